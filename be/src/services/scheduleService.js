@@ -22,6 +22,9 @@ const CONFIG = {
 
   INPUT_DATA_FILENAME: "input_data.json",
   PYTHON_SCRIPT: "main.py",
+
+  // Thời gian chờ Python hoàn tất thế hệ hiện tại và xuất kết quả trước khi buộc dừng
+  STOP_GRACE_PERIOD_MS: 60000,
 };
 
 // Định nghĩa các giai đoạn tiến độ của thuật toán
@@ -59,6 +62,7 @@ let currentProgress = 0;
 let currentResolve = null;
 let currentReject = null;
 let currentSemesterInfo = null;
+let stopRequested = false;
 const {
   Account,
   Semester,
@@ -259,7 +263,10 @@ const cleanupAndResolve = (io, code, killedByUser = false) => {
     pythonProcess = null;
   }
 
-  if (killedByUser) {
+  if (killedByUser && code === 0) {
+    // Dừng mềm: Python đã chạy xong thế hệ hiện tại và xuất lịch tốt nhất tìm được
+    handlePartialSuccess(io);
+  } else if (killedByUser) {
     logger.info("Thuật toán Python đã bị dừng bởi người dùng.");
     emitStatus(io, "ABORTED", PROGRESS_STAGES.ABORTED.message, 0);
     if (currentResolve) {
@@ -279,6 +286,7 @@ const cleanupAndResolve = (io, code, killedByUser = false) => {
   currentResolve = null;
   currentReject = null;
   currentSemesterInfo = null;
+  stopRequested = false;
 };
 
 /**
@@ -290,6 +298,32 @@ const handleSuccess = (io) => {
   // This now calls the async version which includes saving to the DB
 };
 
+/**
+ * Xử lý khi thuật toán được dừng mềm và thoát bình thường: kết quả đã xuất là lịch tốt nhất
+ * tìm được đến lúc dừng, nên được trả về như một kết quả một phần
+ */
+const handlePartialSuccess = (io) => {
+  logger.info("Thuật toán Python đã dừng theo yêu cầu và xuất lịch tốt nhất hiện có.");
+  emitStatus(io, "COMPLETED", "Đã dừng và xuất lịch tốt nhất hiện có.", 100);
+  if (currentResolve) {
+    const files = fs.existsSync(getResultsDir())
+      ? fs.readdirSync(getResultsDir())
+      : [];
+    const excelFiles = files.filter((file) => file.endsWith(".xlsx"));
+    const jsonFiles = files.filter((file) => file.endsWith(".json"));
+    currentResolve({
+      message: "Thuật toán đã dừng theo yêu cầu; đã xuất lịch tốt nhất hiện có.",
+      partial: true,
+      stopped: true,
+      excelFiles,
+      jsonFiles,
+      pythonConsoleOutput: outputBuffer,
+      totalFiles: excelFiles.length + jsonFiles.length,
+      timestamp: new Date().toISOString(),
+    });
+  }
+};
+
 /**
  * Xử lý khi thuật toán thất bại
  */
@@ -566,8 +600,11 @@ const startPythonProcess = (io) => {
   // Thiết lập event listeners
   pythonProcess.stdout.on("data", (data) => handlePythonOutput(data, io));
   pythonProcess.stderr.on("data", (data) => handlePythonError(data, io));
+  pythonProcess.stdin.on("error", (err) =>
+    logger.warn("Lỗi ghi stdin của tiến trình Python:", err)
+  );
   pythonProcess.on("close", (code) =>
-    cleanupAndResolve(io, code, currentStage === "STOPPING")
+    cleanupAndResolve(io, code, stopRequested)
   );
   pythonProcess.on("error", (err) => handleProcessError(err, io));
 };
@@ -586,6 +623,7 @@ export const runGeneticAlgorithm = (inputData, io) => {
   return new Promise((resolve, reject) => {
     currentResolve = resolve;
     currentReject = reject;
+    stopRequested = false;
     outputBuffer = "";
     errorBuffer = "";
 
@@ -639,19 +677,27 @@ export const runGeneticAlgorithm = (inputData, io) => {
 export const stopGeneticAlgorithm = (io) => {
   if (pythonProcess && !pythonProcess.killed) {
     logger.info("Đang dừng thuật toán Python...");
+    // Các sự kiện tiến độ còn lại vẫn cập nhật currentStage, nên yêu cầu dừng được ghi nhận riêng
+    stopRequested = true;
     emitStatus(
       io,
       "STOPPING",
       PROGRESS_STAGES.STOPPING.message,
       currentProgress
     );
-    pythonProcess.kill("SIGTERM");
+    // Yêu cầu dừng mềm qua stdin: Python chạy xong thế hệ hiện tại và xuất lịch tốt nhất
+    pythonProcess.stdin.write("stop\n", (error) => {
+      if (error && pythonProcess && !pythonProcess.killed) {
+        logger.warn("Không gửi được lệnh stop qua stdin, dùng SIGTERM.", error);
+        pythonProcess.kill("SIGTERM");
+      }
+    });
 
     setTimeout(() => {
       if (pythonProcess && !pythonProcess.killed) {
         pythonProcess.kill("SIGKILL");
       }
-    }, 3000);
+    }, CONFIG.STOP_GRACE_PERIOD_MS);
   } else {
     logger.warn("Không có thuật toán nào đang chạy để dừng.");
     emitStatus(
@@ -5,6 +5,9 @@ POPULATION_SIZE = 1500  # Kích thước quần thể
 MAX_GENERATIONS = 5
 MUTATION_RATE = 0.1
 CROSSOVER_RATE = 0.8
+# Kiểu lai ghép khi không dùng chọn toán tử thích nghi: "lesson_based" (từng tiết),
+# "group_based" (giữ nguyên nhóm học phần) hoặc "class_based" (giữ nguyên lịch tuần của lớp)
+CROSSOVER_MODE = "group_based"
 ELITISM_COUNT = 10      # Giữ lại N cá thể tốt nhất cho thế hệ sau
 
 # Fitness Penalties
@@ -19,6 +22,7 @@ PENALTY_LECTURER_BUSY = 1000
 PENALTY_LECTURER_UNQUALIFIED = 1000  # Giảng viên không dạy được môn
 PENALTY_WEEKEND_CLASH = 1000
 PENALTY_UNASSIGNED_GEN = 2000        # MỚI: Phạt rất nặng cho gen chưa được gán tài nguyên
+PENALTY_BLOCK_SPLIT = 1000           # Khối tiết ghép không nằm trọn trong một buổi (xem BUNDLE_LESSONS)
 
 # Soft constraints
 PENALTY_CONSECUTIVE_HOURS_LECTURER = 20 # Phạt cho mỗi giờ dạy liên tục vượt quá giới hạn
@@ -29,4 +33,132 @@ PENALTY_GAPS_IN_SCHEDULE = 5            # Phạt cho mỗi tiết trống xen k
 
 HOURS_PER_SLOT = 2 # Số giờ mỗi tiết học căn cứ vào time_slots (ví dụ 7h-9h là 2 giờ)
 
-MAX_ASSIGNMENT_ATTEMPTS = 100
\ No newline at end of file
+# Ghép tiết: các tiết hàng tuần cùng group_id được ghép thành khối BUNDLE_SIZE slot liên tiếp trong
+# cùng buổi (ví dụ S1+S2), mỗi khối là một gen; phần lẻ còn lại thành khối ngắn hơn
+BUNDLE_LESSONS = False
+BUNDLE_LESSON_TYPES = ["practice", "theory"]  # Loại tiết được ghép
+BUNDLE_SIZE = 2
+
+MAX_ASSIGNMENT_ATTEMPTS = 100
+
+# Khởi tạo tham lam (kiểu DSatur): xếp tiết khó trước vào slot còn nhiều tài nguyên trống
+GREEDY_INIT_RATE = 1.0        # Tỷ lệ cá thể ban đầu tạo bằng khởi tạo tham lam (còn lại: ngẫu nhiên)
+GREEDY_INIT_CANDIDATES = 8    # Số slot hợp lệ được so sánh cho mỗi tiết học
+
+# Số cá thể được tính fitness trong một lô numpy (giới hạn bộ nhớ tạm)
+FITNESS_BATCH_SIZE = 256
+
+# Tính lại fitness theo gia số (chỉ các gen thay đổi) sau đột biến/lai ghép
+INCREMENTAL_FITNESS = True
+DEBUG_INCREMENTAL_FITNESS = False  # So sánh với cách tính đầy đủ sau mỗi lần đánh giá (chậm)
+
+# Bộ nhớ đệm fitness (LRU) theo khóa cấu trúc của nhiễm sắc thể
+FITNESS_CACHE_SIZE = 20000
+DEDUPLICATE_POPULATION = True  # Thay các cá thể trùng lặp bằng cá thể ngẫu nhiên mới
+
+# Phá đối xứng: các tiết cùng group_id (và cùng độ dài khối) hoán đổi được cho nhau, nên gen của
+# mỗi nhóm được sắp theo (day, slot) sau mỗi lần lai ghép/đột biến và khóa cấu trúc không phụ
+# thuộc thứ tự trong nhóm
+CANONICAL_GROUP_ORDER = True
+
+# Song song hóa: số tiến trình cho mỗi thế hệ (1 = chạy tuần tự) và seed để tái lập kết quả
+GA_WORKERS = 1
+GA_RANDOM_SEED = None
+
+# Chế độ chạy GA: "generational" (một quần thể), "islands" (mô hình đảo)
+# hoặc "steady_state" (mỗi lần tạo vài cá thể con, thay cá thể kém nhất)
+GA_MODE = "generational"
+STEADY_STATE_BATCH_SIZE = 2       # Số cá thể con được tạo và đánh giá mỗi bước ở chế độ steady_state
+
+# Mô hình đảo: mỗi đảo có POPULATION_SIZE // NUM_ISLANDS cá thể
+NUM_ISLANDS = 4
+MIGRATION_INTERVAL = 10           # Số thế hệ giữa hai lần di cư
+MIGRATION_SIZE = 5                # Số cá thể tốt nhất được gửi đi mỗi lần
+MIGRATION_TOPOLOGY = "ring"       # "ring" | "fully_connected" | "star"
+ISLAND_TRANSPORT = "queue"        # "queue" (cùng máy) | "tcp" (có thể nhiều máy)
+ISLAND_HOSTS = []                 # ["host:port", ...] theo thứ tự đảo; rỗng = 127.0.0.1:ISLAND_BASE_PORT + i
+ISLAND_BASE_PORT = 50700
+ISLAND_ID = None                  # Đặt trên từng máy khi các đảo chạy trên nhiều máy (cần ISLAND_TRANSPORT = "tcp")
+ISLAND_FINAL_TIMEOUT = 60         # Số giây đảo 0 chờ kết quả cuối của các đảo khác
+
+# Điều kiện dừng sớm (chế độ anytime), áp dụng cho từng học kỳ
+TIME_BUDGET_SECONDS = None        # Giới hạn thời gian chạy GA (giây); None = không giới hạn
+STAGNATION_GENERATIONS = None     # Dừng nếu fitness tốt nhất không cải thiện sau N thế hệ; None = tắt
+STAGNATION_EPSILON = 1e-4         # Cải thiện tương đối nhỏ hơn ngưỡng này được coi là không cải thiện
+STOP_ON_FEASIBLE = False          # Dừng ngay khi có lời giải không vi phạm ràng buộc cứng
+
+# Dừng chủ động: hoàn tất thế hệ hiện tại rồi xuất lịch tốt nhất đã tìm được
+STOP_FILE_NAME = "STOP"           # Tạo file này trong thư mục results để yêu cầu dừng
+WATCH_STDIN_FOR_STOP = True       # Đọc lệnh "stop" từ stdin (backend giữ stdin dạng pipe)
+
+# Checkpoint: lưu quần thể mỗi CHECKPOINT_INTERVAL thế hệ (0 = tắt) vào CHECKPOINT_DIR/<học kỳ>/
+CHECKPOINT_INTERVAL = 10
+CHECKPOINT_DIR = "results"
+
+# Tự điều chỉnh tỷ lệ đột biến/lai ghép theo độ đa dạng quần thể và tốc độ cải thiện
+ADAPTIVE_RATES = True
+MUTATION_RATE_BOUNDS = (0.02, 0.3)
+CROSSOVER_RATE_BOUNDS = (0.6, 0.95)
+DIVERSITY_LOW = 0.1                # Độ đa dạng dưới ngưỡng này: tăng đột biến (quần thể đã hội tụ)
+DIVERSITY_HIGH = 0.5               # Trên ngưỡng này: giảm đột biến, tăng lai ghép (khai thác)
+RATE_STALL_GENERATIONS = 5         # Số thế hệ không cải thiện trước khi tăng đột biến, giảm lai ghép; 0 = tắt
+PARTIAL_RESTART_GENERATIONS = 15   # Số thế hệ không cải thiện trước khi thay một phần quần thể; 0 = tắt
+PARTIAL_RESTART_FRACTION = 0.2     # Tỷ lệ cá thể con được thay bằng cá thể ngẫu nhiên mới
+
+# Chọn toán tử đột biến/lai ghép thích nghi (Adaptive Pursuit) theo mức cải thiện trên thời gian CPU
+ADAPTIVE_OPERATORS = True
+OPERATOR_MIN_PROBABILITY = 0.05   # Xác suất tối thiểu của mỗi toán tử
+OPERATOR_ADAPTATION_RATE = 0.3    # Tốc độ kéo xác suất về toán tử tốt nhất
+
+# Đột biến có định hướng: ưu tiên các gen đang vi phạm ràng buộc cứng
+TARGETED_MUTATION = True
+TARGETED_CONFLICT_RATE = 0.5      # Xác suất đột biến mỗi gen đang xung đột
+TARGETED_BACKGROUND_SCALE = 0.1   # Hệ số nhân tỷ lệ đột biến cho các gen không xung đột
+
+# Tìm kiếm cục bộ (memetic): min-conflicts trên các cá thể tốt nhất sau mỗi thế hệ
+LOCAL_SEARCH = True
+LOCAL_SEARCH_ELITES = 2              # Số cá thể tốt nhất được tìm kiếm cục bộ mỗi thế hệ
+LOCAL_SEARCH_PROBABILITY = 0.0       # Xác suất tìm kiếm cục bộ cho mỗi cá thể còn lại
+LOCAL_SEARCH_MAX_EVALUATIONS = 200   # Số lần đánh giá tối đa cho mỗi cá thể
+LOCAL_SEARCH_CANDIDATES = 4          # Số phương án thử cho mỗi tiết học bị xung đột
+
+# Bộ giải cho mỗi học kỳ: "ga" (thuật toán di truyền, xem GA_MODE), "simulated_annealing", "tabu_search"
+# hoặc "csp" (quay lui tìm lịch không vi phạm ràng buộc cứng, rồi tối ưu ràng buộc mềm bằng CSP_SOFT_SOLVER)
+SOLVER = "ga"
+
+# Simulated annealing (một lời giải, dùng các bước đột biến của GA)
+SA_MAX_ITERATIONS = 200000
+SA_ITERATIONS_PER_TEMPERATURE = 1000  # Số bước ở mỗi mức nhiệt (một "thế hệ" trong tiến trình)
+SA_INITIAL_TEMPERATURE = None         # None: ước lượng từ một mẫu bước đi ngẫu nhiên
+SA_FINAL_TEMPERATURE = 0.01
+SA_COOLING_SCHEDULE = "geometric"     # "geometric", "linear" hoặc "lundy_mees"
+SA_CONFLICT_BIAS = 0.8                # Xác suất chọn tiết đang vi phạm ràng buộc cứng để di chuyển
+
+# Tabu search
+TABU_MAX_ITERATIONS = 20000
+TABU_ITERATIONS_PER_REPORT = 200      # Số vòng lặp cho mỗi "thế hệ" trong tiến trình
+TABU_CANDIDATES = 20                  # Số bước đi được thử ở mỗi vòng lặp
+TABU_TENURE = (10, 20)                # Số vòng lặp (ngẫu nhiên trong khoảng) một phép gán bị cấm quay lại
+TABU_CONFLICT_BIAS = 0.8              # Xác suất chọn tiết đang vi phạm ràng buộc cứng để di chuyển
+
+# Bộ giải ràng buộc (SOLVER = "csp")
+CSP_TIME_LIMIT = 30                   # Giới hạn thời gian tìm kiếm quay lui (giây); None = không giới hạn
+# Tối ưu ràng buộc mềm sau CSP: "ga" (lịch của CSP được đưa vào quần thể ban đầu), "simulated_annealing",
+# "tabu_search" hoặc None (dùng luôn lịch của CSP)
+CSP_SOFT_SOLVER = "simulated_annealing"
+
+# Portfolio (python main.py --portfolio): mỗi học kỳ chạy song song các cấu hình dưới đây trong các
+# tiến trình riêng, chung một giới hạn thời gian; lượt chạy bị bỏ xa được dừng sớm, lịch tốt nhất được xuất
+PORTFOLIO = False
+PORTFOLIO_CONFIGS = [                 # Mỗi cấu hình ghi đè một số hằng số trong file này cho một lượt chạy
+    {"GA_RANDOM_SEED": 1},
+    {"GA_RANDOM_SEED": 2, "CROSSOVER_MODE": "class_based", "ADAPTIVE_OPERATORS": False},
+    {"GA_RANDOM_SEED": 3, "GA_MODE": "steady_state"},
+    {"SOLVER": "simulated_annealing"},
+    {"SOLVER": "tabu_search"},
+    {"SOLVER": "csp"}
+]
+PORTFOLIO_WORKERS = None              # Số tiến trình; None = mỗi cấu hình một tiến trình (cùng xuất phát)
+PORTFOLIO_TIME_BUDGET = 300           # Giới hạn thời gian chung cho mỗi học kỳ (giây); None = không giới hạn
+PORTFOLIO_GRACE_SECONDS = 30          # Không dừng sớm lượt chạy nào trước mốc này
+PORTFOLIO_DOMINANCE_MARGIN = 0.5      # Dừng lượt chạy có fitness kém hơn lượt dẫn đầu quá tỷ lệ này của |fitness dẫn đầu|
@@ -1,7 +1,7 @@
 import math
 import copy
 from collections import defaultdict
-from config import HOURS_PER_SLOT
+from config import HOURS_PER_SLOT, BUNDLE_LESSONS, BUNDLE_LESSON_TYPES, BUNDLE_SIZE
 
 class DataProcessor:
     """
@@ -23,6 +23,8 @@ class DataProcessor:
                 self.program_semester_map[program['program_id']].append(semester['semester_id'])
                 
         self.slot_order_map = {slot['slot_id']: i for i, slot in enumerate(data['time_slots'])}
+        # (slot_id bắt đầu, số slot) -> các slot liên tiếp trong cùng buổi mà khối tiết chiếm
+        self.slot_blocks = self._build_slot_blocks()
         
         # Hàm tính toán tổng số tiết học cho toàn học kỳ đã được sửa
         self.total_semester_slots_needed = self._calculate_total_semester_slots()
@@ -30,6 +32,35 @@ class DataProcessor:
         # Hàm tạo danh sách tiết học hàng tuần đã được sửa
         self.required_lessons_weekly = self._generate_required_lessons_weekly()
 
+    def _build_slot_blocks(self):
+        time_slots = self.data['time_slots']
+        blocks = {}
+        for count in range(2, BUNDLE_SIZE + 1):
+            for i, slot in enumerate(time_slots):
+                run = time_slots[i:i + count]
+                # Khối phải nằm trọn trong một buổi (cùng 'type': sáng/chiều/tối)
+                if len(run) == count and all(s.get('type') == slot.get('type') for s in run):
+                    blocks[(slot['slot_id'], count)] = tuple(s['slot_id'] for s in run)
+        return blocks
+
+    def covered_slots(self, slot_id, count=1):
+        """
+        Các slot_id mà một khối `count` tiết bắt đầu ở slot_id chiếm, theo thứ tự;
+        None nếu khối không nằm trọn trong buổi. Khối 1 tiết chỉ chiếm chính slot_id.
+        """
+        if count <= 1:
+            return (slot_id,)
+        return self.slot_blocks.get((slot_id, count))
+
+    def _weekly_blocks(self, weekly_slots, lesson_type):
+        """Độ dài (số slot) các khối tiết trong tuần của một nhóm; mỗi khối là một gen."""
+        if not BUNDLE_LESSONS or lesson_type not in BUNDLE_LESSON_TYPES or BUNDLE_SIZE <= 1:
+            return [1] * weekly_slots
+        blocks = [BUNDLE_SIZE] * (weekly_slots // BUNDLE_SIZE)
+        if weekly_slots % BUNDLE_SIZE:
+            blocks.append(weekly_slots % BUNDLE_SIZE)
+        return blocks
+
     def _calculate_total_semester_slots(self):
         total_slots = {}
         for cls in self.data['classes']:
@@ -80,7 +111,8 @@ class DataProcessor:
                         base_weekly_theory = total_theory_slots_semester // program_duration_weeks
                         extra_theory_slots = total_theory_slots_semester % program_duration_weeks
                         
-                        for _ in range(base_weekly_theory + 1 if extra_theory_slots > 0 else base_weekly_theory):
+                        weekly_theory = base_weekly_theory + 1 if extra_theory_slots > 0 else base_weekly_theory
+                        for block in self._weekly_blocks(weekly_theory, 'theory'):
                             weekly_lessons.append({
                                 "lesson_id": f"L{lesson_id_counter}",
                                 "class_id": cls['class_id'],
@@ -89,7 +121,7 @@ class DataProcessor:
                                 "program_id": program_id,
                                 "semester_id": semester['semester_id'],
                                 "group_id": f"{cls['class_id']}_{subject_id}_theory_{semester['semester_id']}",
-                                "count": 1 # Số tiết này dùng để tạo một "gen" trong chromosome
+                                "count": block # Số slot liên tiếp của gen này (1, hoặc nhiều hơn khi ghép tiết)
                             })
                             lesson_id_counter += 1
 
@@ -98,7 +130,8 @@ class DataProcessor:
                         base_weekly_practice = total_practice_slots_semester // program_duration_weeks
                         extra_practice_slots = total_practice_slots_semester % program_duration_weeks
 
-                        for _ in range(base_weekly_practice + 1 if extra_practice_slots > 0 else base_weekly_practice):
+                        weekly_practice = base_weekly_practice + 1 if extra_practice_slots > 0 else base_weekly_practice
+                        for block in self._weekly_blocks(weekly_practice, 'practice'):
                             weekly_lessons.append({
                                 "lesson_id": f"L{lesson_id_counter}",
                                 "class_id": cls['class_id'],
@@ -107,7 +140,7 @@ class DataProcessor:
                                 "program_id": program_id,
                                 "semester_id": semester['semester_id'],
                                 "group_id": f"{cls['class_id']}_{subject_id}_practice_{semester['semester_id']}",
-                                "count": 1
+                                "count": block
                             })
                             lesson_id_counter += 1
         return weekly_lessons
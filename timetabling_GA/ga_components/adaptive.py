@@ -0,0 +1,128 @@
+# timetable_ga/ga_components/adaptive.py
+import random
+import numpy as np
+
+from .array_chromosome import ArrayChromosome
+
+GENE_FIELDS = ('day', 'slot_id', 'room_id', 'lecturer_id')
+
+
+def _gene_distance(chrom1, chrom2):
+    """Tỷ lệ tiết học được xếp khác nhau (ngày, slot, phòng hoặc giảng viên) giữa hai cá thể."""
+    if isinstance(chrom1, ArrayChromosome) and isinstance(chrom2, ArrayChromosome):
+        return float(np.any(chrom1.assignment != chrom2.assignment, axis=0).mean())
+
+    genes1, genes2 = chrom1.genes, chrom2.genes
+    if not genes1:
+        return 0.0
+    # Gen dùng chung (copy-on-write) được so sánh bằng `is` mà không cần đọc các trường
+    different = sum(
+        1 for g1, g2 in zip(genes1, genes2)
+        if g1 is not g2 and any(g1.get(field) != g2.get(field) for field in GENE_FIELDS)
+    )
+    return different / len(genes1)
+
+
+def population_diversity(population, sample_pairs=32):
+    """Độ đa dạng kiểu gen: khoảng cách trung bình trên một mẫu ngẫu nhiên các cặp cá thể (0..1)."""
+    if len(population) < 2:
+        return 0.0
+    distances = [_gene_distance(*random.sample(population, 2)) for _ in range(sample_pairs)]
+    return sum(distances) / len(distances)
+
+
+class AdaptiveRateController:
+    """
+    Điều chỉnh tỷ lệ đột biến/lai ghép sau mỗi thế hệ theo độ đa dạng quần thể và tốc độ
+    cải thiện. Khi quần thể hội tụ (độ đa dạng dưới diversity_low) hoặc fitness tốt nhất không
+    tăng sau stall_generations thế hệ, tỷ lệ đột biến tăng và tỷ lệ lai ghép giảm; khi quần thể
+    quá phân tán (trên diversity_high) thì ngược lại; còn lại tỷ lệ dần quay về giá trị cấu hình.
+    Khi fitness đứng yên quá restart_generations thế hệ, báo cần thay một phần quần thể
+    (restart_fraction) bằng cá thể ngẫu nhiên mới.
+    """
+    def __init__(self, mutation_rate, crossover_rate, mutation_bounds, crossover_bounds,
+                 diversity_low, diversity_high, restart_generations, restart_fraction, stall_generations=0,
+                 increase_factor=1.25, decrease_factor=0.8, relax_factor=0.5):
+        self.base_mutation_rate = mutation_rate
+        self.base_crossover_rate = crossover_rate
+        self.mutation_rate = mutation_rate
+        self.crossover_rate = crossover_rate
+        self.mutation_bounds = mutation_bounds
+        self.crossover_bounds = crossover_bounds
+        self.diversity_low = diversity_low
+        self.diversity_high = diversity_high
+        self.restart_generations = restart_generations
+        self.restart_fraction = restart_fraction
+        self.stall_generations = stall_generations
+        self.increase_factor = increase_factor
+        self.decrease_factor = decrease_factor
+        self.relax_factor = relax_factor
+
+        self.diversity = None
+        self.restarts = 0
+        self._best_fitness = None
+        self._generations_without_improvement = 0
+
+    def update(self, population, best_fitness):
+        """
+        Cập nhật tỷ lệ từ quần thể vừa đánh giá và fitness tốt nhất từ trước đến nay.
+        Trả về số cá thể con cần thay bằng cá thể ngẫu nhiên mới (0 nếu không khởi động lại).
+        """
+        improved = self._best_fitness is None or best_fitness > self._best_fitness
+        if improved:
+            self._best_fitness = best_fitness
+            self._generations_without_improvement = 0
+        else:
+            self._generations_without_improvement += 1
+
+        self.diversity = population_diversity(population)
+        stalled = bool(self.stall_generations) and self._generations_without_improvement >= self.stall_generations
+        if stalled or self.diversity < self.diversity_low:
+            self.mutation_rate *= self.increase_factor
+            self.crossover_rate *= self.decrease_factor
+        elif self.diversity > self.diversity_high:
+            self.mutation_rate *= self.decrease_factor
+            self.crossover_rate *= self.increase_factor
+        else:
+            # Trong vùng mục tiêu: dần quay về giá trị cấu hình
+            self.mutation_rate += (self.base_mutation_rate - self.mutation_rate) * self.relax_factor
+            self.crossover_rate += (self.base_crossover_rate - self.crossover_rate) * self.relax_factor
+        self.mutation_rate = min(max(self.mutation_rate, self.mutation_bounds[0]), self.mutation_bounds[1])
+        self.crossover_rate = min(max(self.crossover_rate, self.crossover_bounds[0]), self.crossover_bounds[1])
+
+        if self.restart_generations and self._generations_without_improvement >= self.restart_generations:
+            self._generations_without_improvement = 0
+            self.mutation_rate = self.base_mutation_rate
+            self.crossover_rate = self.base_crossover_rate
+            self.restarts += 1
+            return int(len(population) * self.restart_fraction)
+        return 0
+
+    def stats(self):
+        return {
+            "mutation_rate": round(self.mutation_rate, 4),
+            "crossover_rate": round(self.crossover_rate, 4),
+            "diversity": round(self.diversity, 4) if self.diversity is not None else None,
+            "generations_without_improvement": self._generations_without_improvement,
+            "restarts": self.restarts
+        }
+
+    def state(self):
+        """Trạng thái cần lưu vào checkpoint để tiếp tục với cùng tỷ lệ."""
+        return {
+            "mutation_rate": self.mutation_rate,
+            "crossover_rate": self.crossover_rate,
+            "restarts": self.restarts,
+            "best_fitness": self._best_fitness,
+            "generations_without_improvement": self._generations_without_improvement
+        }
+
+    def restore(self, state):
+        """Khôi phục từ state(); các khóa thiếu (vd. checkpoint lưu khi ADAPTIVE_RATES tắt) giữ giá trị hiện tại."""
+        self.mutation_rate = state.get("mutation_rate", self.mutation_rate)
+        self.crossover_rate = state.get("crossover_rate", self.crossover_rate)
+        self.restarts = state.get("restarts", self.restarts)
+        self._best_fitness = state.get("best_fitness", self._best_fitness)
+        self._generations_without_improvement = state.get(
+            "generations_without_improvement", self._generations_without_improvement
+        )
@@ -0,0 +1,179 @@
+# timetable_ga/ga_components/array_chromosome.py
+import numpy as np
+from .chromosome import Chromosome
+from .symmetry import get_interchangeable_groups
+
+# Chỉ số hàng trong ma trận gán (4, số tiết học)
+DAY, SLOT, ROOM, LECTURER = 0, 1, 2, 3
+UNASSIGNED = -1  # Giá trị cho gen chưa được gán tài nguyên (tương ứng None)
+
+
+class GeneEncoder:
+    """
+    Biên dịch dữ liệu đã xử lý thành các bảng chỉ số nguyên để mã hóa/giải mã
+    nhiễm sắc thể. Thứ tự tiết học trùng với processed_data.required_lessons_weekly.
+    """
+    def __init__(self, processed_data):
+        self.processed_data = processed_data
+        self.lessons = processed_data.required_lessons_weekly
+
+        self.days = list(processed_data.data['days_of_week'])
+        self.slots = [slot['slot_id'] for slot in processed_data.data['time_slots']]
+        self.rooms = [room['room_id'] for room in processed_data.data['rooms']]
+        self.lecturers = [lect['lecturer_id'] for lect in processed_data.data['lecturers']]
+        self.classes = list(processed_data.class_map.keys())
+
+        self.day_index = {day: i for i, day in enumerate(self.days)}
+        self.slot_index = {slot_id: i for i, slot_id in enumerate(self.slots)}
+        self.room_index = {room_id: i for i, room_id in enumerate(self.rooms)}
+        self.lecturer_index = {lect_id: i for i, lect_id in enumerate(self.lecturers)}
+        self.class_index = {class_id: i for i, class_id in enumerate(self.classes)}
+        self.lesson_index = {lesson['lesson_id']: i for i, lesson in enumerate(self.lessons)}
+
+        # Bảng tra theo vị trí tiết học
+        self.lesson_class = np.array(
+            [self.class_index.get(lesson['class_id'], UNASSIGNED) for lesson in self.lessons], dtype=np.int32
+        )
+        self.lesson_size = np.array(
+            [processed_data.class_map.get(lesson['class_id'], {}).get('size', 0) for lesson in self.lessons],
+            dtype=np.int32
+        )
+
+        # Khối tiết ghép: block_fits[b, slot] cho biết khối thứ b (vị trí block_positions[b]) bắt đầu
+        # ở slot có nằm trọn trong buổi không; mỗi slot thứ k >= 1 của khối là một cột phụ
+        # (extra_positions) với extra_slot[cột phụ, slot bắt đầu] là chỉ số slot đó (UNASSIGNED nếu tách buổi)
+        counts = [lesson.get('count', 1) for lesson in self.lessons]
+        self.block_positions = np.array([p for p, count in enumerate(counts) if count > 1], dtype=np.intp)
+        self.block_fits = np.zeros((len(self.block_positions), len(self.slots)), dtype=bool)
+        extra_positions, extra_slot = [], []
+        for b, position in enumerate(self.block_positions):
+            count = counts[position]
+            covered = [processed_data.covered_slots(slot_id, count) for slot_id in self.slots]
+            self.block_fits[b] = [slots is not None for slots in covered]
+            for k in range(1, count):
+                extra_positions.append(position)
+                extra_slot.append([self.slot_index[slots[k]] if slots else UNASSIGNED for slots in covered])
+        self.extra_positions = np.array(extra_positions, dtype=np.intp)
+        self.extra_slot = np.array(extra_slot, dtype=np.int64).reshape(len(extra_positions), len(self.slots))
+
+        # Các nhóm tiết hoán đổi được, nối liền nhau: vị trí và số thứ tự nhóm của từng vị trí
+        group_positions = get_interchangeable_groups(processed_data).positions
+        self.group_positions = np.array([p for positions in group_positions for p in positions], dtype=np.intp)
+        self.group_index = np.repeat(np.arange(len(group_positions)), [len(p) for p in group_positions])
+
+        # Chỉ số -> giá trị gốc (phần tử cuối là None cho UNASSIGNED = -1)
+        self._decode_tables = (
+            self.days + [None], self.slots + [None], self.rooms + [None], self.lecturers + [None]
+        )
+
+    @property
+    def num_lessons(self):
+        return len(self.lessons)
+
+    def encode_genes(self, genes):
+        """Chuyển danh sách gen dạng dict thành ma trận (4, số tiết học) kiểu int16."""
+        assignment = np.full((4, self.num_lessons), UNASSIGNED, dtype=np.int16)
+        for gene in genes:
+            position = self.lesson_index.get(gene['lesson_id'])
+            if position is None:
+                continue
+            # Giá trị không có trong bảng (hoặc None) được coi là chưa gán
+            assignment[DAY, position] = self.day_index.get(gene.get('day'), UNASSIGNED)
+            assignment[SLOT, position] = self.slot_index.get(gene.get('slot_id'), UNASSIGNED)
+            assignment[ROOM, position] = self.room_index.get(gene.get('room_id'), UNASSIGNED)
+            assignment[LECTURER, position] = self.lecturer_index.get(gene.get('lecturer_id'), UNASSIGNED)
+        return assignment
+
+    def canonical_assignment(self, assignment):
+        """
+        Bản sao của ma trận gán ở dạng chuẩn (xem symmetry.canonicalize): trong mỗi nhóm tiết
+        hoán đổi được, các cột được sắp theo (day, slot, phòng, giảng viên), cột chưa gán đứng cuối.
+        """
+        if not len(self.group_positions):
+            return assignment
+        columns = assignment[:, self.group_positions].astype(np.int64)
+        # UNASSIGNED (-1) được đổi thành giá trị lớn nhất để đứng cuối nhóm
+        columns[columns == UNASSIGNED] = np.iinfo(np.int16).max
+        order = np.lexsort((columns[LECTURER], columns[ROOM], columns[SLOT], columns[DAY], self.group_index))
+        canonical = assignment.copy()
+        canonical[:, self.group_positions] = assignment[:, self.group_positions[order]]
+        return canonical
+
+    def decode_gene(self, assignment, position):
+        """Tạo lại gen dạng dict (cùng cấu trúc với create_random_chromosome) cho một tiết học."""
+        lesson = self.lessons[position]
+        days, slots, rooms, lecturers = self._decode_tables
+        return {
+            "lesson_id": lesson['lesson_id'],
+            "class_id": lesson['class_id'],
+            "subject_id": lesson['subject_id'],
+            "lesson_type": lesson['lesson_type'],
+            "program_id": lesson['program_id'],
+            "group_id": lesson['group_id'],
+            "day": days[assignment[DAY, position]],
+            "slot_id": slots[assignment[SLOT, position]],
+            "room_id": rooms[assignment[ROOM, position]],
+            "lecturer_id": lecturers[assignment[LECTURER, position]],
+            "semester_id": lesson['semester_id'],
+            "size": int(self.lesson_size[position]),
+            "count": lesson.get('count', 1)
+        }
+
+    def decode_genes(self, assignment):
+        return [self.decode_gene(assignment, i) for i in range(self.num_lessons)]
+
+
+class ArrayChromosome:
+    """
+    Nhiễm sắc thể dạng mảng số nguyên: mỗi cột là một tiết học (theo thứ tự
+    required_lessons_weekly), 4 hàng là chỉ số ngày, slot, phòng và giảng viên.
+    Thuộc tính `genes` giải mã về dạng dict nên các hàm xuất kết quả vẫn dùng được.
+    """
+    def __init__(self, encoder, assignment=None, fitness=float('-inf')):
+        self.encoder = encoder
+        if assignment is None:
+            assignment = np.full((4, encoder.num_lessons), UNASSIGNED, dtype=np.int16)
+        self.assignment = assignment
+        self.fitness = fitness
+
+    @classmethod
+    def from_chromosome(cls, chromosome, encoder):
+        return cls(encoder, encoder.encode_genes(chromosome.genes), chromosome.fitness)
+
+    def to_chromosome(self):
+        chromosome = Chromosome(self.encoder.decode_genes(self.assignment))
+        chromosome.fitness = self.fitness
+        return chromosome
+
+    @property
+    def genes(self):
+        return self.encoder.decode_genes(self.assignment)
+
+    @property
+    def day(self):
+        return self.assignment[DAY]
+
+    @property
+    def slot(self):
+        return self.assignment[SLOT]
+
+    @property
+    def room(self):
+        return self.assignment[ROOM]
+
+    @property
+    def lecturer(self):
+        return self.assignment[LECTURER]
+
+    def is_assigned(self):
+        """Mảng bool: tiết học nào đã được gán đủ ngày, slot, phòng và giảng viên."""
+        return np.all(self.assignment != UNASSIGNED, axis=0)
+
+    def copy(self):
+        return ArrayChromosome(self.encoder, self.assignment.copy(), self.fitness)
+
+    def __str__(self):
+        return f"Fitness: {self.fitness:.2f}, Genes: {self.encoder.num_lessons} scheduled"
+
+    def __lt__(self, other):
+        return self.fitness > other.fitness
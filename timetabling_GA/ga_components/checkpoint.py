@@ -0,0 +1,100 @@
+# timetable_ga/ga_components/checkpoint.py
+import hashlib
+import json
+import os
+import numpy as np
+
+from .array_chromosome import ArrayChromosome
+
+CHECKPOINT_FILE_NAME = "checkpoint.npz"
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_path(directory, semester_id):
+    """Checkpoint của mỗi học kỳ nằm trong thư mục kết quả riêng của học kỳ đó."""
+    return os.path.join(directory, str(semester_id), CHECKPOINT_FILE_NAME)
+
+
+def encoder_fingerprint(encoder):
+    """
+    Dấu vân tay của dữ liệu đầu vào (thứ tự tiết học và các bảng chỉ số).
+    Checkpoint chỉ được dùng lại khi ma trận gán được giải mã đúng như lúc lưu.
+    """
+    payload = json.dumps(
+        [[lesson['lesson_id'] for lesson in encoder.lessons],
+         encoder.days, encoder.slots, encoder.rooms, encoder.lecturers],
+        default=str
+    )
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _to_array(chromosome, encoder):
+    if isinstance(chromosome, ArrayChromosome):
+        return chromosome.assignment
+    return encoder.encode_genes(chromosome.genes)
+
+
+def save_checkpoint(path, encoder, population, generation, best, ga_log_data, rng_state,
+                    extra=None, completed=False):
+    """
+    Ghi checkpoint gọn: ma trận gán int16 và fitness của quần thể, cá thể tốt nhất,
+    cùng siêu dữ liệu JSON (thế hệ, trạng thái random, ga_log_data, ...).
+    Ghi vào file tạm rồi os.replace nên file checkpoint luôn là bản hoàn chỉnh.
+    """
+    metadata = {
+        "version": CHECKPOINT_VERSION,
+        "fingerprint": encoder_fingerprint(encoder),
+        "generation": generation,
+        "completed": completed,
+        "rng_state": [rng_state[0], list(rng_state[1]), rng_state[2]],
+        "ga_log_data": ga_log_data,
+        "extra": extra or {}
+    }
+
+    genes = np.empty((len(population), 4, encoder.num_lessons), dtype=np.int16)
+    for i, chromosome in enumerate(population):
+        genes[i] = _to_array(chromosome, encoder)
+    fitness = np.array([chromosome.fitness for chromosome in population], dtype=np.float64)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(
+            f, genes=genes, fitness=fitness,
+            best_genes=_to_array(best, encoder), best_fitness=np.float64(best.fitness),
+            metadata=np.array(json.dumps(metadata, default=str))
+        )
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path, encoder):
+    """
+    Đọc checkpoint; trả về None nếu không có file hoặc checkpoint được tạo từ dữ liệu khác.
+    Quần thể và cá thể tốt nhất được trả về dưới dạng ArrayChromosome (đã có fitness).
+    """
+    if not os.path.exists(path):
+        return None
+
+    with np.load(path, allow_pickle=False) as data:
+        metadata = json.loads(str(data['metadata']))
+        if metadata.get("version") != CHECKPOINT_VERSION or metadata.get("fingerprint") != encoder_fingerprint(encoder):
+            print(f"Warning: checkpoint {path} does not match the current input data; starting from scratch.")
+            return None
+        population = [
+            ArrayChromosome(encoder, genes.copy(), float(fitness))
+            for genes, fitness in zip(data['genes'], data['fitness'])
+        ]
+        best = ArrayChromosome(encoder, data['best_genes'].copy(), float(data['best_fitness']))
+
+    version, state, gauss = metadata["rng_state"]
+    return {
+        "generation": metadata["generation"],
+        "completed": metadata["completed"],
+        "population": population,
+        "best": best,
+        "ga_log_data": metadata["ga_log_data"],
+        "rng_state": (version, tuple(state), gauss),
+        "extra": metadata["extra"]
+    }
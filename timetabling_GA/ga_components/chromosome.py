@@ -1,13 +1,26 @@
 # timetable_ga/ga_components/chromosome.py
+import heapq
 import random
-import copy
-from collections import defaultdict
-from config import MAX_ASSIGNMENT_ATTEMPTS
+from config import MAX_ASSIGNMENT_ATTEMPTS, GREEDY_INIT_RATE, GREEDY_INIT_CANDIDATES
+from .domains import get_domains
+from .occupancy import ResourceOccupancy
+from .symmetry import canonicalize
 
 class Chromosome:
-    def __init__(self, genes=None):
+    def __init__(self, genes=None, fitness_state=None, occupancy=None):
+        # Các gen (dict) có thể được dùng chung giữa cha mẹ và con: không sửa trực tiếp,
+        # hãy thay bằng bản sao (xem mutate_chromosome)
         self.genes = genes if genes is not None else []
         self.fitness = float('-inf')
+        # FitnessState dùng để tính lại fitness theo gia số (có thể None)
+        self.fitness_state = fitness_state
+        # ResourceOccupancy: các slot đã dùng theo giảng viên/phòng/lớp (có thể None)
+        self.occupancy = occupancy
+        # Khóa cấu trúc dùng cho bộ nhớ đệm fitness (tính khi cần, xem fitness_cache.py)
+        self.structure_key = None
+        # Toán tử đã tạo ra cá thể và fitness của cha/mẹ tốt hơn (chọn toán tử thích nghi)
+        self.operators = []
+        self.parent_fitness = None
 
     def __str__(self):
         return f"Fitness: {self.fitness:.2f}, Genes: {len(self.genes)} scheduled"
@@ -18,46 +31,34 @@ class Chromosome:
 def find_available_time_slot_and_resources(processed_data, required_lesson, used_slots_per_lecturer, used_slots_per_room, used_slots_per_class):
     """
     Tìm kiếm ngẫu nhiên một tổ hợp hợp lệ (day, slot, lecturer, room)
-    cho một tiết học, có giới hạn số lần thử.
+    cho một tiết học trong miền của nó (xem domains.py). Các slot được thử theo thứ tự
+    ngẫu nhiên, mỗi slot một lần, tối đa MAX_ASSIGNMENT_ATTEMPTS slot. Với khối tiết ghép,
+    lớp, giảng viên và phòng phải trống ở mọi slot mà khối chiếm.
     """
     class_id = required_lesson['class_id']
-    subject_id = required_lesson['subject_id']
-    lesson_type = required_lesson['lesson_type']
-    class_size = processed_data.class_map.get(class_id, {}).get('size', 0)
+    domain = get_domains(processed_data)[required_lesson['lesson_id']]
 
-    # Lấy danh sách tất cả các tài nguyên hợp lệ
-    valid_lecturers = processed_data.get_lecturers_for_subject(subject_id)
-    if not valid_lecturers:
-        return None, None, None, None
-
-    # Hàm get_rooms_for_type_and_capacity đã có class_size
-    valid_rooms = processed_data.get_rooms_for_type_and_capacity(lesson_type, class_size)
-    if not valid_rooms:
-        return None, None, None, None
-
-    all_time_slots = [(d, s['slot_id']) for d in processed_data.data['days_of_week'] for s in processed_data.data['time_slots']]
-    random.shuffle(all_time_slots)
-
-    for _ in range(MAX_ASSIGNMENT_ATTEMPTS):
-        day, slot_id = random.choice(all_time_slots)
-        
+    for day, slot_id in domain.sample_times(MAX_ASSIGNMENT_ATTEMPTS):
+        covered = domain.covers[(day, slot_id)]
         # Kiểm tra xung đột với các gen đã gán
-        if (day, slot_id) in used_slots_per_class[class_id]:
+        class_slots = used_slots_per_class[class_id]
+        if any(time_slot in class_slots for time_slot in covered):
             continue
 
         # Tìm giảng viên và phòng trống ngẫu nhiên
         available_lecturers = [
-            l for l in valid_lecturers 
-            if (day, slot_id) not in processed_data.lecturer_map.get(l, {}).get('busy_slots', set())
-            and (day, slot_id) not in used_slots_per_lecturer[l]
+            l for l in domain.lecturers_at[(day, slot_id)]
+            if not any(time_slot in used_slots_per_lecturer[l] for time_slot in covered)
         ]
-        
+        if not available_lecturers:
+            continue
+
         available_rooms = [
-            r for r in valid_rooms 
-            if (day, slot_id) not in used_slots_per_room[r]
+            r for r in domain.rooms
+            if not any(time_slot in used_slots_per_room[r] for time_slot in covered)
         ]
 
-        if available_lecturers and available_rooms:
+        if available_rooms:
             selected_lecturer = random.choice(available_lecturers)
             selected_room = random.choice(available_rooms)
             return day, slot_id, selected_lecturer, selected_room
@@ -65,43 +66,149 @@ def find_available_time_slot_and_resources(processed_data, required_lesson, used
     return None, None, None, None # Không tìm thấy sau số lần thử tối đa
 
 
+def make_gene(processed_data, required_lesson, day, slot_id, lecturer_id, room_id):
+    """Gen (dict) của một tiết học với phép gán (day, slot, giảng viên, phòng) cho trước."""
+    return {
+        "lesson_id": required_lesson['lesson_id'],
+        "class_id": required_lesson['class_id'],
+        "subject_id": required_lesson['subject_id'],
+        "lesson_type": required_lesson['lesson_type'],
+        "program_id": required_lesson['program_id'],
+        "group_id": required_lesson['group_id'],
+        "day": day,
+        "slot_id": slot_id,
+        "room_id": room_id,
+        "lecturer_id": lecturer_id,
+        "semester_id": required_lesson['semester_id'],
+        "size": processed_data.class_map.get(required_lesson['class_id'], {}).get('size', 0), # Đã thêm trường này
+        "count": required_lesson.get('count', 1)  # Số slot liên tiếp (khối tiết ghép, xem BUNDLE_LESSONS)
+    }
+
+
 def create_random_chromosome(processed_data):
     """
     Tạo một cá thể ban đầu bằng cách gán ngẫu nhiên các tiết học hàng tuần
     vào các tài nguyên hợp lệ, có giới hạn số lần thử.
+    Các tiết được xếp theo thứ tự ngẫu nhiên nhưng gen được lưu theo đúng thứ tự
+    required_lessons_weekly để lai ghép có thể ghép cặp theo vị trí.
     """
-    genes = []
-    used_slots_per_lecturer = defaultdict(set)
-    used_slots_per_room = defaultdict(set)
-    used_slots_per_class = defaultdict(set)
+    required_lessons = processed_data.required_lessons_weekly
+    genes = [None] * len(required_lessons)
+    occupancy = ResourceOccupancy(processed_data=processed_data)
 
-    required_lessons_to_schedule = copy.deepcopy(processed_data.required_lessons_weekly)
-    random.shuffle(required_lessons_to_schedule)
+    positions = list(range(len(required_lessons)))
+    random.shuffle(positions)
 
-    for required_lesson in required_lessons_to_schedule:
+    for position in positions:
+        required_lesson = required_lessons[position]
         day, slot_id, lecturer_id, room_id = find_available_time_slot_and_resources(
-            processed_data, required_lesson, used_slots_per_lecturer, used_slots_per_room, used_slots_per_class
+            processed_data, required_lesson, occupancy.lecturers, occupancy.rooms, occupancy.classes
         )
         
-        # Cập nhật các tài nguyên đã sử dụng nếu tìm thấy
-        if all([day, slot_id, lecturer_id, room_id]):
-            used_slots_per_lecturer[lecturer_id].add((day, slot_id))
-            used_slots_per_room[room_id].add((day, slot_id))
-            used_slots_per_class[required_lesson['class_id']].add((day, slot_id))
         # Thêm gen vào nhiễm sắc thể, kể cả khi không tìm thấy slot hợp lệ (giá trị là None)
-        genes.append({
-            "lesson_id": required_lesson['lesson_id'],
-            "class_id": required_lesson['class_id'],
-            "subject_id": required_lesson['subject_id'],
-            "lesson_type": required_lesson['lesson_type'],
-            "program_id": required_lesson['program_id'],
-            "group_id": required_lesson['group_id'],
-            "day": day,
-            "slot_id": slot_id,
-            "room_id": room_id,
-            "lecturer_id": lecturer_id,
-            "semester_id": required_lesson['semester_id'],
-            "size": processed_data.class_map.get(required_lesson['class_id'], {}).get('size', 0) # Đã thêm trường này
-        })
+        genes[position] = make_gene(processed_data, required_lesson, day, slot_id, lecturer_id, room_id)
+        # Cập nhật các tài nguyên đã sử dụng nếu tìm thấy
+        occupancy.add_gene(genes[position])
     
-    return Chromosome(genes)
\ No newline at end of file
+    return Chromosome(genes, occupancy=occupancy)
+
+
+def create_greedy_chromosome(processed_data, candidates=GREEDY_INIT_CANDIDATES):
+    """
+    Khởi tạo tham lam kiểu DSatur: luôn xếp tiếp tiết học "khó" nhất. Độ bão hòa là số slot
+    lớp của tiết đã dùng (tăng dần khi xếp); hòa thì xét khối tiết ghép dài hơn, tiết có ít
+    giảng viên dạy được hơn, ít phòng phù hợp (đúng loại, đủ chỗ) hơn, lớp có nhiều tiết hơn,
+    cuối cùng là ngẫu nhiên.
+    Mỗi tiết được gán vào slot (trong miền của tiết, lớp còn trống) còn nhiều giảng viên và phòng
+    trống nhất trong tối đa `candidates` slot hợp lệ đầu tiên theo thứ tự ngẫu nhiên, với giảng
+    viên đang dạy ít tiết nhất và phòng nhỏ nhất đủ chỗ. Tiết không còn slot hợp lệ nào thì
+    để trống như create_random_chromosome.
+    """
+    required_lessons = processed_data.required_lessons_weekly
+    genes = [None] * len(required_lessons)
+    occupancy = ResourceOccupancy(processed_data=processed_data)
+    store = get_domains(processed_data)
+    domains = [store[lesson['lesson_id']] for lesson in required_lessons]
+
+    class_lessons = {}
+    for position, lesson in enumerate(required_lessons):
+        class_lessons.setdefault(lesson['class_id'], []).append(position)
+
+    static_key = [
+        (-domains[position].count, len(domains[position].lecturers), len(domains[position].rooms),
+         -len(class_lessons[lesson['class_id']]), random.random())
+        for position, lesson in enumerate(required_lessons)
+    ]
+    # Hàng đợi ưu tiên có cập nhật trễ: mục cũ (độ bão hòa đã thay đổi) bị bỏ qua khi lấy ra
+    saturation = {class_id: 0 for class_id in class_lessons}
+    queue = [(0, static_key[position], position) for position in range(len(required_lessons))]
+    heapq.heapify(queue)
+    lecturer_load = {}
+    # Tra cứu nhanh trong lúc xếp: giảng viên/phòng đã dùng theo slot, slot đã dùng theo lớp
+    used_at = {time_slot: (set(), set()) for time_slot in store.time_slots}
+    class_used = {class_id: set() for class_id in class_lessons}
+
+    while queue:
+        negative_saturation, _, position = heapq.heappop(queue)
+        lesson = required_lessons[position]
+        class_id = lesson['class_id']
+        if genes[position] is not None or -negative_saturation != saturation[class_id]:
+            continue
+
+        domain = domains[position]
+        best = None
+        found = 0
+        for time_slot in domain.sample_times():
+            covered = domain.covers[time_slot]
+            if any(t in class_used[class_id] for t in covered):
+                continue
+            free_lecturers = [
+                l for l in domain.lecturers_at[time_slot] if not any(l in used_at[t][0] for t in covered)
+            ]
+            if not free_lecturers:
+                continue
+            free_rooms = [r for r in domain.rooms if not any(r in used_at[t][1] for t in covered)]
+            if not free_rooms:
+                continue
+            # Slot còn nhiều tài nguyên trống nhất ít ảnh hưởng đến các tiết xếp sau
+            score = len(free_lecturers) + len(free_rooms)
+            if best is None or score > best[0]:
+                best = (score, time_slot, free_lecturers, free_rooms)
+            found += 1
+            if found >= candidates:
+                break
+
+        if best is None:
+            day = slot_id = lecturer_id = room_id = None
+        else:
+            _, (day, slot_id), free_lecturers, free_rooms = best
+            lowest_load = min(lecturer_load.get(l, 0) for l in free_lecturers)
+            lecturer_id = random.choice([l for l in free_lecturers if lecturer_load.get(l, 0) == lowest_load])
+            room_id = free_rooms[0]
+            lecturer_load[lecturer_id] = lowest_load + 1
+            for time_slot in domain.covers[(day, slot_id)]:
+                used_at[time_slot][0].add(lecturer_id)
+                used_at[time_slot][1].add(room_id)
+                class_used[class_id].add(time_slot)
+
+        genes[position] = make_gene(processed_data, lesson, day, slot_id, lecturer_id, room_id)
+        occupancy.add_gene(genes[position])
+
+        if best is not None:
+            # Các tiết còn lại của lớp bị ràng buộc thêm: đưa lại vào hàng đợi với độ bão hòa mới
+            saturation[class_id] = len(class_used[class_id])
+            for other in class_lessons[class_id]:
+                if genes[other] is None:
+                    heapq.heappush(queue, (-saturation[class_id], static_key[other], other))
+
+    return Chromosome(genes, occupancy=occupancy)
+
+
+def create_initial_chromosome(processed_data, greedy_rate=GREEDY_INIT_RATE):
+    """
+    Cá thể ban đầu: khởi tạo tham lam với xác suất greedy_rate, còn lại ngẫu nhiên.
+    Cá thể được đưa về dạng chuẩn theo nhóm (xem symmetry.canonicalize).
+    """
+    if random.random() < greedy_rate:
+        return canonicalize(create_greedy_chromosome(processed_data), processed_data)
+    return canonicalize(create_random_chromosome(processed_data), processed_data)
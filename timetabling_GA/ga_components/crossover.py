@@ -1,34 +1,144 @@
 # timetable_ga/ga_components/crossover.py
 import random
-from .chromosome import Chromosome
+from .chromosome import Chromosome, find_available_time_slot_and_resources
+from .occupancy import get_occupancy
 
-def lesson_based_crossover(parent1, parent2, processed_data):
+
+def _paired_genes(parent1, parent2, processed_data):
     """
-    Lai ghép dựa trên tiết học. Mỗi gene (tiết học) được chọn từ một trong hai bố mẹ.
+    Ghép cặp gen của hai cha mẹ theo tiết học. Gen được lưu theo thứ tự
+    required_lessons_weekly nên thường ghép được theo vị trí mà không cần dựng dict.
+    """
+    lessons = processed_data.required_lessons_weekly
+    genes1, genes2 = parent1.genes, parent2.genes
+    if len(genes1) == len(genes2) == len(lessons) and all(
+        g1['lesson_id'] == g2['lesson_id'] == lesson['lesson_id']
+        for g1, g2, lesson in zip(genes1, genes2, lessons)
+    ):
+        return zip(genes1, genes2)
+
+    parent1_map = {gene['lesson_id']: gene for gene in genes1}
+    parent2_map = {gene['lesson_id']: gene for gene in genes2}
+    return ((parent1_map.get(lesson['lesson_id']), parent2_map.get(lesson['lesson_id'])) for lesson in lessons)
+
+
+def _inherit_crossover(parent1, parent2, processed_data, from_parent1):
+    """
+    Khung chung cho lai ghép đồng nhất: from_parent1(gene1) cho biết con 1 nhận gen của
+    cha 1 (con 2 nhận gen còn lại). Gen được dùng chung (không sao chép) với bố mẹ; bảng
+    chiếm dụng và trạng thái fitness của con được cập nhật chỉ cho các gen lấy từ bên còn lại.
+    Trả về hai con và vị trí các gen đã hoán đổi (đường nối giữa hai cha mẹ).
     """
     child1_genes, child2_genes = [], []
-    
-    parent1_map = {gene['lesson_id']: gene for gene in parent1.genes}
-    parent2_map = {gene['lesson_id']: gene for gene in parent2.genes}
-    
-    for lesson in processed_data.required_lessons_weekly:
-        lesson_id = lesson['lesson_id']
-        gene1 = parent1_map.get(lesson_id)
-        gene2 = parent2_map.get(lesson_id)
-        
+    child1_occupancy = get_occupancy(parent1, processed_data).copy()
+    child2_occupancy = get_occupancy(parent2, processed_data).copy()
+    # Con bắt đầu từ trạng thái fitness của cha/mẹ tương ứng, chỉ cập nhật các gen được hoán đổi
+    track_state = parent1.fitness_state is not None and parent2.fitness_state is not None
+    child1_state = parent1.fitness_state.copy() if track_state else None
+    child2_state = parent2.fitness_state.copy() if track_state else None
+    swapped = []
+
+    for gene1, gene2 in _paired_genes(parent1, parent2, processed_data):
         if gene1 and gene2:
-            if random.random() < 0.5:
-                child1_genes.append(gene1.copy())
-                child2_genes.append(gene2.copy())
+            if gene1 is gene2 or from_parent1(gene1):
+                child1_genes.append(gene1)
+                child2_genes.append(gene2)
             else:
-                child1_genes.append(gene2.copy())
-                child2_genes.append(gene1.copy())
+                # Vị trí trong danh sách gen của con (tiết thiếu ở cả hai cha mẹ bị bỏ qua)
+                swapped.append(len(child1_genes))
+                child1_genes.append(gene2)
+                child2_genes.append(gene1)
+                child1_occupancy.replace_gene(gene1, gene2)
+                child2_occupancy.replace_gene(gene2, gene1)
+                if track_state:
+                    child1_state.replace_gene(gene1, gene2)
+                    child2_state.replace_gene(gene2, gene1)
         else:
             if gene1:
-                child1_genes.append(gene1.copy())
-                child2_genes.append(gene1.copy())
+                child1_genes.append(gene1)
+                child2_genes.append(gene1)
+                child2_occupancy.add_gene(gene1)
+                if track_state:
+                    child2_state.add_gene(gene1)
             elif gene2:
-                child1_genes.append(gene2.copy())
-                child2_genes.append(gene2.copy())
-    
-    return Chromosome(child1_genes), Chromosome(child2_genes)
\ No newline at end of file
+                child1_genes.append(gene2)
+                child2_genes.append(gene2)
+                child1_occupancy.add_gene(gene2)
+                if track_state:
+                    child1_state.add_gene(gene2)
+
+    return (Chromosome(child1_genes, child1_state, child1_occupancy),
+            Chromosome(child2_genes, child2_state, child2_occupancy),
+            swapped)
+
+
+def repair_seams(chromosome, positions, processed_data):
+    """
+    Sửa nhanh các trùng lịch ở đường nối: mỗi gen tại positions đang trùng giảng viên,
+    phòng hoặc lớp được chuyển sang một tổ hợp (day, slot, giảng viên, phòng) còn trống;
+    gen bên kia của xung đột giữ nguyên. Sửa trực tiếp trên cá thể con (gen mới được sao chép).
+    """
+    occupancy = chromosome.occupancy
+    genes = chromosome.genes
+    for position in positions:
+        gene = genes[position]
+        if not occupancy.is_placed(gene):
+            continue
+        if all(occupancy.lecturers[gene['lecturer_id']].get(day_slot, 0) <= 1
+               and occupancy.rooms[gene['room_id']].get(day_slot, 0) <= 1
+               and occupancy.classes[gene['class_id']].get(day_slot, 0) <= 1
+               for day_slot in occupancy.day_slots(gene)):
+            continue
+
+        occupancy.remove_gene(gene)
+        day, slot_id, lecturer_id, room_id = find_available_time_slot_and_resources(
+            processed_data, gene, occupancy.lecturers, occupancy.rooms, occupancy.classes
+        )
+        if day is None:
+            occupancy.add_gene(gene)
+            continue
+        repaired = dict(gene, day=day, slot_id=slot_id, lecturer_id=lecturer_id, room_id=room_id)
+        genes[position] = repaired
+        occupancy.add_gene(repaired)
+        if chromosome.fitness_state is not None:
+            chromosome.fitness_state.replace_gene(gene, repaired)
+
+
+def lesson_based_crossover(parent1, parent2, processed_data):
+    """
+    Lai ghép dựa trên tiết học. Mỗi gene (tiết học) được chọn từ một trong hai bố mẹ.
+    """
+    child1, child2, _ = _inherit_crossover(parent1, parent2, processed_data, lambda gene: random.random() < 0.5)
+    return child1, child2
+
+
+def _unit_crossover(parent1, parent2, processed_data, unit_field):
+    # Mỗi đơn vị (nhóm học phần hoặc lớp) được lấy nguyên vẹn từ một cha/mẹ
+    decisions = {}
+
+    def from_parent1(gene):
+        unit = gene.get(unit_field)
+        if unit not in decisions:
+            decisions[unit] = random.random() < 0.5
+        return decisions[unit]
+
+    child1, child2, swapped = _inherit_crossover(parent1, parent2, processed_data, from_parent1)
+    repair_seams(child1, swapped, processed_data)
+    repair_seams(child2, swapped, processed_data)
+    return child1, child2
+
+
+def group_based_crossover(parent1, parent2, processed_data):
+    """
+    Lai ghép giữ nguyên nhóm: mọi tiết cùng group_id (lớp + môn + loại tiết + học kỳ) được lấy
+    từ cùng một cha/mẹ, sau đó sửa các trùng lịch ở đường nối giữa các nhóm.
+    """
+    return _unit_crossover(parent1, parent2, processed_data, 'group_id')
+
+
+def class_based_crossover(parent1, parent2, processed_data):
+    """
+    Lai ghép theo lớp: thời khóa biểu cả tuần của mỗi lớp được lấy từ một cha/mẹ (không thể
+    trùng lịch lớp), sau đó sửa các trùng lịch giảng viên/phòng giữa các lớp.
+    """
+    return _unit_crossover(parent1, parent2, processed_data, 'class_id')
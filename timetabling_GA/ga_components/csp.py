@@ -0,0 +1,321 @@
+# timetable_ga/ga_components/csp.py
+import random
+import sys
+import time
+
+from .chromosome import Chromosome, make_gene
+from .domains import get_domains
+
+# Kết quả của BacktrackingSolver.solve()
+CSP_FEASIBLE = "feasible"
+CSP_INFEASIBLE = "infeasible"
+CSP_TIMEOUT = "timeout"
+# Duyệt hết mà không có lời giải nhưng có khối tiết ghép, nên không chứng minh được vô nghiệm
+CSP_UNKNOWN = "unknown"
+
+# Số nút tìm kiếm giữa hai lần kiểm tra thời gian / yêu cầu dừng
+_CHECK_INTERVAL = 64
+
+
+class _Interrupted(Exception):
+    pass
+
+
+def _augment(match, lesson, candidates, visited):
+    """Đường tăng (Kuhn) cho ghép cặp tài nguyên -> tiết học; chỉ sửa match khi thành công."""
+    for resource_id in candidates:
+        if resource_id in visited:
+            continue
+        visited.add(resource_id)
+        other = match.get(resource_id)
+        if other is None or _augment(match, other[0], other[1], visited):
+            match[resource_id] = (lesson, candidates)
+            return True
+    return False
+
+
+def _unmatch(match, lesson):
+    for resource_id, (owner, _) in list(match.items()):
+        if owner == lesson:
+            del match[resource_id]
+            return
+
+
+def _pin(matches, lesson, covered, candidates):
+    """
+    Ghép tiết với cùng một tài nguyên ở mọi thời điểm trong covered; tài nguyên được cố định
+    (ứng viên duy nhất) nên đường tăng của tiết khác không đổi được nó. Trả về tài nguyên hoặc None.
+    """
+    for resource_id in candidates:
+        placed = []
+        for time_slot in covered:
+            if not _augment(matches[time_slot], lesson, (resource_id,), set()):
+                break
+            placed.append(time_slot)
+        if len(placed) == len(covered):
+            return resource_id
+        for time_slot in placed:
+            _unmatch(matches[time_slot], lesson)
+    return None
+
+
+class BacktrackingSolver:
+    """
+    Bộ giải thỏa mãn ràng buộc cho các ràng buộc cứng: mỗi tiết trong required_lessons_weekly
+    là một biến với miền các bộ (day, slot, giảng viên, phòng) hợp lệ lấy từ DomainStore
+    (không Chủ nhật, giảng viên dạy được môn và không bận, phòng đúng loại và đủ chỗ).
+
+    Miền được phân tách theo thời điểm: biến tìm kiếm là (day, slot) của mỗi tiết, còn giảng
+    viên và phòng tại mỗi thời điểm được xếp bằng ghép cặp hai phía (các tiết cùng thời điểm
+    phải có giảng viên khác nhau và phòng khác nhau). Một thời điểm còn trong miền của tiết j
+    khi thêm j vào đó vẫn ghép cặp được, nên không phải thử lần lượt từng tổ hợp giảng viên/phòng
+    tương đương nhau mà phép tìm kiếm vẫn đầy đủ.
+
+    Tìm kiếm quay lui với kiểm tra tiến (forward checking), chọn biến theo MRV (ít thời điểm
+    còn lại nhất) rồi theo bậc (số tiết dùng chung lớp hoặc giảng viên), và nhảy lùi theo
+    xung đột (conflict-directed backjumping, FC-CBJ). Nếu cây tìm kiếm được duyệt hết mà không
+    có lời giải thì bài toán chắc chắn vô nghiệm.
+
+    Khối tiết ghép (count > 1) chiếm nhiều thời điểm liên tiếp với cùng một giảng viên và một
+    phòng: tài nguyên của khối được cố định khi xếp (giảng viên/phòng đầu tiên còn ghép cặp được
+    ở mọi thời điểm của khối) và không được thử lại khi quay lui, nên khi có khối mà duyệt hết
+    không có lời giải thì kết quả là CSP_UNKNOWN thay vì CSP_INFEASIBLE.
+    """
+    def __init__(self, processed_data, time_limit=None, should_stop=None):
+        self.processed_data = processed_data
+        self.time_limit = time_limit
+        self.should_stop = should_stop
+        self.lessons = processed_data.required_lessons_weekly
+        self.nodes = 0
+        self.backjumps = 0
+        self._start = None
+
+        store = get_domains(processed_data)
+        self.times = store.time_slots
+
+        # domains[i]: các thời điểm còn dùng được; lecturer_candidates[i][t]: giảng viên không bận tại t
+        self.domains = []
+        self.lecturer_candidates = []
+        self.room_candidates = []
+        # covers[i][t]: các thời điểm tiết i chiếm khi bắt đầu tại t; starts_at[i][a]: các t chiếm a
+        self.covers = []
+        self.starts_at = []
+        shared_starts = {}
+        self.class_lessons = {}
+        lecturer_lessons = {}
+        for i, lesson in enumerate(self.lessons):
+            domain = store[lesson['lesson_id']]
+            self.domains.append(set(domain.times))
+            self.lecturer_candidates.append(domain.lecturers_at)
+            # Phòng nhỏ nhất đủ chỗ được thử trước để giữ phòng lớn cho lớp đông
+            self.room_candidates.append(domain.rooms)
+            self.covers.append(domain.covers)
+            if id(domain.covers) not in shared_starts:
+                starts_at = {}
+                for start, covered in domain.covers.items():
+                    for time_slot in covered:
+                        starts_at.setdefault(time_slot, []).append(start)
+                shared_starts[id(domain.covers)] = starts_at
+            self.starts_at.append(shared_starts[id(domain.covers)])
+
+            self.class_lessons.setdefault(lesson['class_id'], []).append(i)
+            for lecturer_id in domain.lecturers:
+                lecturer_lessons.setdefault(lecturer_id, set()).add(i)
+
+        # Bậc tĩnh: số tiết khác cùng lớp hoặc có thể cùng giảng viên
+        self.degree = []
+        for i, lesson in enumerate(self.lessons):
+            neighbours = set(self.class_lessons[lesson['class_id']])
+            for lecturer_id in store[lesson['lesson_id']].lecturers:
+                neighbours |= lecturer_lessons[lecturer_id]
+            neighbours.discard(i)
+            self.degree.append(len(neighbours))
+
+        self.has_blocks = any(lesson.get('count', 1) > 1 for lesson in self.lessons)
+        self.assignment = [None] * len(self.lessons)
+        self.unassigned = set(range(len(self.lessons)))
+        # Các tiết đang xếp ở mỗi thời điểm và ghép cặp giảng viên/phòng của chúng
+        self.lessons_at = {time_slot: [] for time_slot in self.times}
+        self.lecturer_match = {time_slot: {} for time_slot in self.times}
+        self.room_match = {time_slot: {} for time_slot in self.times}
+        # pruned_by[j]: các biến đã gán đang cắt bớt miền của j (tập xung đột của FC-CBJ)
+        self.pruned_by = [set() for _ in self.lessons]
+
+    @property
+    def elapsed_seconds(self):
+        return time.time() - self._start if self._start is not None else 0.0
+
+    def solve(self):
+        """
+        Chạy tìm kiếm. Trả về (trạng thái, Chromosome hoặc None) với trạng thái là
+        CSP_FEASIBLE, CSP_INFEASIBLE hoặc CSP_TIMEOUT (hết thời gian hoặc có yêu cầu dừng).
+        """
+        self._start = time.time()
+        if any(not domain for domain in self.domains):
+            return CSP_INFEASIBLE, None
+        # Nguyên lý chuồng bồ câu: một lớp không thể cần nhiều slot hơn số thời điểm nó dùng được
+        for lessons in self.class_lessons.values():
+            usable = set()
+            for i in lessons:
+                for time_slot in self.domains[i]:
+                    usable.update(self.covers[i][time_slot])
+            if sum(self.lessons[i].get('count', 1) for i in lessons) > len(usable):
+                return CSP_INFEASIBLE, None
+
+        # Độ sâu đệ quy bằng số tiết học
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(recursion_limit, len(self.lessons) + 200))
+        try:
+            conflict = self._search()
+        except _Interrupted:
+            return CSP_TIMEOUT, None
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+
+        if conflict is not None:
+            return (CSP_UNKNOWN if self.has_blocks else CSP_INFEASIBLE), None
+        return CSP_FEASIBLE, Chromosome(self._genes())
+
+    def _genes(self):
+        lecturer_of, room_of = {}, {}
+        for time_slot in self.times:
+            for lecturer_id, (lesson, _) in self.lecturer_match[time_slot].items():
+                lecturer_of[lesson] = lecturer_id
+            for room_id, (lesson, _) in self.room_match[time_slot].items():
+                room_of[lesson] = room_id
+        return [
+            make_gene(self.processed_data, lesson, day, slot_id, lecturer_of[i], room_of[i])
+            for i, (lesson, (day, slot_id)) in enumerate(zip(self.lessons, self.assignment))
+        ]
+
+    def _check_interrupt(self):
+        self.nodes += 1
+        if self.nodes % _CHECK_INTERVAL:
+            return
+        if self.time_limit is not None and self.elapsed_seconds >= self.time_limit:
+            raise _Interrupted()
+        if self.should_stop is not None and self.should_stop():
+            raise _Interrupted()
+
+    def _select_variable(self):
+        # MRV, rồi bậc lớn nhất
+        return min(self.unassigned, key=lambda i: (len(self.domains[i]), -self.degree[i]))
+
+    def _place(self, i, time_slot):
+        """Thêm tiết i vào thời điểm nếu vẫn ghép cặp được giảng viên và phòng; trả về True nếu được."""
+        covered = self.covers[i][time_slot]
+        if len(covered) > 1:
+            return self._place_block(i, covered, self.lecturer_candidates[i][time_slot])
+        if not _augment(self.lecturer_match[time_slot], i, self.lecturer_candidates[i][time_slot], set()):
+            return False
+        if not _augment(self.room_match[time_slot], i, self.room_candidates[i], set()):
+            _unmatch(self.lecturer_match[time_slot], i)
+            return False
+        return True
+
+    def _place_block(self, i, covered, lecturer_candidates):
+        # Khối tiết ghép giữ cùng giảng viên và phòng ở mọi thời điểm nó chiếm
+        if _pin(self.lecturer_match, i, covered, lecturer_candidates) is None:
+            return False
+        if _pin(self.room_match, i, covered, self.room_candidates[i]) is None:
+            for time_slot in covered:
+                _unmatch(self.lecturer_match[time_slot], i)
+            return False
+        return True
+
+    def _remove(self, i, time_slot):
+        for covered in self.covers[i][time_slot]:
+            _unmatch(self.lecturer_match[covered], i)
+            _unmatch(self.room_match[covered], i)
+
+    def _lessons_at(self, i, time_slot):
+        """Các tiết đang ở những thời điểm mà tiết i chiếm khi bắt đầu tại time_slot."""
+        covered = self.covers[i][time_slot]
+        if len(covered) == 1:
+            return self.lessons_at[time_slot]
+        return list({j for t in covered for j in self.lessons_at[t]})
+
+    def _search(self):
+        """Trả về None khi đã gán hết, ngược lại trả về tập xung đột để nhảy lùi."""
+        if not self.unassigned:
+            return None
+        self._check_interrupt()
+
+        i = self._select_variable()
+        self.unassigned.discard(i)
+        conflict = set()
+
+        time_slots = list(self.domains[i])
+        random.shuffle(time_slots)
+        for time_slot in time_slots:
+            # Miền của i chỉ do kiểm tra tiến đảm bảo: thời điểm vẫn phải ghép cặp được
+            if not self._place(i, time_slot):
+                conflict |= set(self._lessons_at(i, time_slot))
+                continue
+            self.assignment[i] = time_slot
+            for covered in self.covers[i][time_slot]:
+                self.lessons_at[covered].append(i)
+
+            trail, wiped = self._forward_check(i, time_slot)
+            if wiped is None:
+                result = self._search()
+                if result is None:
+                    return None
+                if i not in result:
+                    # Biến này không liên quan đến xung đột: nhảy lùi qua nó
+                    self._undo(i, time_slot, trail)
+                    self.unassigned.add(i)
+                    self.backjumps += 1
+                    return result
+                conflict |= result
+            else:
+                conflict |= self.pruned_by[wiped]
+            self._undo(i, time_slot, trail)
+
+        self.unassigned.add(i)
+        conflict |= self.pruned_by[i]
+        conflict.discard(i)
+        return conflict
+
+    def _forward_check(self, i, time_slot):
+        """
+        Loại khỏi miền các biến chưa gán những thời điểm bắt đầu không còn xếp được sau khi gán i
+        vào time_slot (chỉ các thời điểm chiếm chung slot với i). Trả về (trail để hoàn tác,
+        biến đầu tiên bị rỗng miền hoặc None).
+        """
+        trail = []
+        class_id = self.lessons[i]['class_id']
+        affected = self.covers[i][time_slot]
+        for j in list(self.unassigned):
+            domain = self.domains[j]
+            if len(affected) == 1:
+                starts = self.starts_at[j].get(affected[0], ())
+            else:
+                starts = {start for t in affected for start in self.starts_at[j].get(t, ())}
+            for start in [start for start in starts if start in domain]:
+                if self.lessons[j]['class_id'] == class_id:
+                    # Cùng lớp: không được học cùng thời điểm
+                    causes = (i,)
+                elif self._place(j, start):
+                    self._remove(j, start)
+                    continue
+                else:
+                    # Hết giảng viên hoặc phòng: nguyên nhân là các tiết đang ở các thời điểm này
+                    causes = self._lessons_at(j, start)
+
+                domain.discard(start)
+                new_causes = [cause for cause in causes if cause not in self.pruned_by[j]]
+                self.pruned_by[j].update(new_causes)
+                trail.append((j, start, new_causes))
+            if not domain:
+                return trail, j
+        return trail, None
+
+    def _undo(self, i, time_slot, trail):
+        for j, start, new_causes in reversed(trail):
+            self.domains[j].add(start)
+            self.pruned_by[j].difference_update(new_causes)
+        for covered in self.covers[i][time_slot]:
+            self.lessons_at[covered].remove(i)
+        self._remove(i, time_slot)
+        self.assignment[i] = None
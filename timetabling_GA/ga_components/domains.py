@@ -0,0 +1,136 @@
+# timetable_ga/ga_components/domains.py
+import random
+
+SUNDAY_NAMES = ['sun', 'sunday', 'chủ nhật', 'cn']
+
+
+class LessonDomain:
+    """
+    Các giá trị (day, slot, giảng viên, phòng) được phép của một tiết học, lưu dạng phân tách:
+    times là các slot (bắt đầu) được phép, lecturers_at[time] là giảng viên dạy được môn và không
+    bận tại slot đó, rooms là các phòng đúng loại và đủ chỗ (phòng nhỏ nhất trước).
+    Với khối nhiều tiết (count > 1), covers[time] là các (day, slot) liên tiếp mà khối chiếm khi
+    bắt đầu tại time, và giảng viên phải rảnh ở tất cả các slot đó.
+    Mọi tổ hợp time x lecturers_at[time] x rooms đều hợp lệ khi xét riêng tiết này.
+    """
+    __slots__ = ("times", "lecturers", "lecturers_at", "rooms", "count", "covers")
+
+    def __init__(self, times, lecturers, lecturers_at, rooms, count=1, covers=None):
+        self.times = times
+        self.lecturers = lecturers
+        self.lecturers_at = lecturers_at
+        self.rooms = rooms
+        self.count = count
+        self.covers = covers if covers is not None else {time_slot: (time_slot,) for time_slot in times}
+
+    def __len__(self):
+        return sum(len(self.lecturers_at[time_slot]) for time_slot in self.times) * len(self.rooms)
+
+    def sample_times(self, limit=None):
+        """Các slot được phép theo thứ tự ngẫu nhiên, mỗi slot một lần (lấy mẫu không hoàn lại)."""
+        count = len(self.times) if limit is None else min(limit, len(self.times))
+        return random.sample(self.times, count)
+
+    def lecturers_for(self, time_slot):
+        """Giảng viên được phép tại time_slot; với slot ngoài miền thì là mọi giảng viên dạy được môn."""
+        return self.lecturers_at.get(time_slot, self.lecturers)
+
+
+class DomainStore:
+    """
+    Miền giá trị của mọi tiết trong required_lessons_weekly, tính một lần cho mỗi học kỳ (xem
+    get_domains). Miền đã loại Chủ nhật, lịch bận cố định của giảng viên, giảng viên không dạy
+    được môn, phòng sai loại hoặc thiếu chỗ và slot bắt đầu mà khối tiết ghép không nằm trọn
+    trong buổi, rồi được thu hẹp bằng lan truyền nhất quán cung (AC-3) giữa các tiết cùng lớp:
+    các tiết của một lớp không được chiếm chung slot, nên các slot mà tiết chỉ còn một vị trí
+    duy nhất chiếm bị loại khỏi miền các tiết khác trong lớp.
+    """
+    def __init__(self, processed_data):
+        self.time_slots = [
+            (day, slot['slot_id'])
+            for day in processed_data.data['days_of_week'] if day.lower() not in SUNDAY_NAMES
+            for slot in processed_data.data['time_slots']
+        ]
+        busy = {
+            lecturer_id: {(busy_slot.get('day'), busy_slot.get('slot_id')) for busy_slot in info.get('busy_slots', [])}
+            for lecturer_id, info in processed_data.lecturer_map.items()
+        }
+
+        self.domains = {}
+        self.lesson_class = {}
+        self.class_lessons = {}
+        # Các tiết cùng (lớp, môn, loại, độ dài khối) có cùng miền ban đầu
+        shared = {}
+        for lesson in processed_data.required_lessons_weekly:
+            count = lesson.get('count', 1)
+            key = (lesson['class_id'], lesson['subject_id'], lesson['lesson_type'], count)
+            if key not in shared:
+                class_size = processed_data.class_map.get(lesson['class_id'], {}).get('size', 0)
+                lecturers = tuple(processed_data.get_lecturers_for_subject(lesson['subject_id']))
+                rooms = tuple(sorted(
+                    processed_data.get_rooms_for_type_and_capacity(lesson['lesson_type'], class_size),
+                    key=lambda room_id: processed_data.room_map[room_id]['capacity']
+                ))
+                covers = {}
+                lecturers_at = {}
+                if rooms:
+                    for day, slot_id in self.time_slots:
+                        slots = processed_data.covered_slots(slot_id, count)
+                        if slots is None:
+                            continue
+                        covered = tuple((day, s) for s in slots)
+                        available = tuple(
+                            l for l in lecturers if not any(time_slot in busy.get(l, ()) for time_slot in covered)
+                        )
+                        if available:
+                            covers[(day, slot_id)] = covered
+                            lecturers_at[(day, slot_id)] = available
+                shared[key] = (lecturers, lecturers_at, rooms, covers)
+            lecturers, lecturers_at, rooms, covers = shared[key]
+            self.domains[lesson['lesson_id']] = LessonDomain(
+                list(lecturers_at), lecturers, dict(lecturers_at), rooms, count, covers
+            )
+            self.lesson_class[lesson['lesson_id']] = lesson['class_id']
+            self.class_lessons.setdefault(lesson['class_id'], []).append(lesson['lesson_id'])
+
+        self.pruned = self._propagate()
+        self.empty_lessons = [lesson_id for lesson_id, domain in self.domains.items() if not domain.times]
+
+    def __getitem__(self, lesson_id):
+        return self.domains[lesson_id]
+
+    def _remove_time(self, lesson_id, time_slot):
+        domain = self.domains[lesson_id]
+        domain.times.remove(time_slot)
+        del domain.lecturers_at[time_slot]
+
+    def _propagate(self):
+        """AC-3 cho ràng buộc không chiếm chung slot giữa các tiết cùng lớp. Trả về số slot đã loại."""
+        pruned = 0
+        queue = [lesson_id for lesson_id, domain in self.domains.items() if len(domain.times) == 1]
+        while queue:
+            lesson_id = queue.pop()
+            domain = self.domains[lesson_id]
+            if len(domain.times) != 1:
+                continue
+            occupied = set(domain.covers[domain.times[0]])
+            for other in self.class_lessons[self.lesson_class[lesson_id]]:
+                if other == lesson_id:
+                    continue
+                other_domain = self.domains[other]
+                removed = [t for t in other_domain.times if not occupied.isdisjoint(other_domain.covers[t])]
+                for time_slot in removed:
+                    self._remove_time(other, time_slot)
+                pruned += len(removed)
+                if removed and len(other_domain.times) == 1:
+                    queue.append(other)
+        return pruned
+
+
+def get_domains(processed_data):
+    """DomainStore của học kỳ, tạo ở lần gọi đầu và lưu lại trên processed_data."""
+    store = getattr(processed_data, '_lesson_domains', None)
+    if store is None:
+        store = DomainStore(processed_data)
+        processed_data._lesson_domains = store
+    return store
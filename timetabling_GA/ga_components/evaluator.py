@@ -0,0 +1,52 @@
+# timetable_ga/ga_components/evaluator.py
+from .fitness_cache import FitnessCache, chromosome_key
+from .incremental_fitness import evaluate_incremental
+
+
+class PopulationEvaluator:
+    """
+    Đánh giá fitness cho quần thể: dùng bộ nhớ đệm theo khóa cấu trúc, sau đó
+    tính theo gia số (FitnessState) hoặc theo lô numpy cho các cá thể chưa có.
+    """
+    def __init__(self, fitness_calculator, cache_size, incremental=True):
+        self.fitness_calculator = fitness_calculator
+        self.cache = FitnessCache(cache_size)
+        self.incremental = incremental
+
+    def evaluate(self, chromosomes):
+        """
+        Scores chromosomes either from their incremental fitness state (only the genes
+        changed by crossover/mutation are re-evaluated) or in one vectorized pass.
+        Assignments seen before (elites, unchanged children) are served from the cache;
+        chromosomes already scored elsewhere (e.g. by a worker process) are only cached.
+        """
+        pending = []
+        for chrom in chromosomes:
+            key = chromosome_key(chrom)
+            if chrom.fitness != float('-inf'):
+                self.cache.put(key, chrom.fitness)
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                chrom.fitness = cached[0]
+            else:
+                pending.append(chrom)
+
+        if self.incremental and all(hasattr(chrom, 'fitness_state') for chrom in pending):
+            for chrom in pending:
+                fitness, violations = evaluate_incremental(chrom, self.fitness_calculator)
+                self.cache.put(chromosome_key(chrom), fitness, violations)
+        else:
+            self.fitness_calculator.calculate_population_fitness(pending)
+            for chrom in pending:
+                self.cache.put(chromosome_key(chrom), chrom.fitness)
+
+    def violations(self, chrom):
+        """Returns the violation dict of a chromosome, computing it only on a cache miss."""
+        key = chromosome_key(chrom)
+        cached = self.cache.get(key)
+        if cached is not None and cached[1] is not None:
+            return cached[1]
+        fitness, violations = self.fitness_calculator.calculate_fitness(chrom)
+        self.cache.put(key, fitness, violations)
+        return violations
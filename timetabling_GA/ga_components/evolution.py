@@ -0,0 +1,81 @@
+# timetable_ga/ga_components/evolution.py
+import random
+import time
+from config import TARGETED_CONFLICT_RATE, TARGETED_BACKGROUND_SCALE, CROSSOVER_MODE
+from .selection import tournament_selection
+from .crossover import lesson_based_crossover, group_based_crossover, class_based_crossover
+from .mutation import mutate_chromosome, targeted_mutation, MUTATION_OPERATORS
+from .operator_selection import AdaptivePursuit
+from .symmetry import canonicalize
+
+# Các toán tử lai ghép theo tên (dùng cho chọn toán tử thích nghi và thống kê)
+CROSSOVER_OPERATORS = {
+    "lesson_based": lesson_based_crossover,
+    "group_based": group_based_crossover,
+    "class_based": class_based_crossover
+}
+
+
+def create_operator_selectors(min_probability, adaptation_rate):
+    """Bộ chọn toán tử thích nghi cho breed_offspring: {"mutation": ..., "crossover": ...}."""
+    return {
+        "mutation": AdaptivePursuit(MUTATION_OPERATORS, min_probability, beta=adaptation_rate),
+        "crossover": AdaptivePursuit(CROSSOVER_OPERATORS, min_probability, beta=adaptation_rate)
+    }
+
+
+def breed_offspring(population, count, processed_data, mutation_rate, crossover_rate, select_parent=None,
+                    mutation_selector=None, crossover_selector=None, conflict_finder=None):
+    """
+    Tạo `count` cá thể con bằng chọn lọc, lai ghép và đột biến.
+    select_parent: hàm chọn một cha/mẹ (mặc định là tournament_selection trên population).
+    mutation_selector/crossover_selector (AdaptivePursuit): chọn toán tử theo hiệu quả; mỗi
+    cá thể con ghi lại các toán tử đã dùng và fitness của cha/mẹ tốt hơn để chấm thưởng
+    sau khi được đánh giá (xem credit_offspring).
+    conflict_finder: nếu có, dùng đột biến có định hướng (targeted_mutation) tập trung vào
+    các gen đang vi phạm ràng buộc cứng thay cho đột biến ngẫu nhiên đều.
+    Cá thể con được đưa về dạng chuẩn theo nhóm (xem symmetry.canonicalize) sau đột biến.
+    """
+    if CROSSOVER_MODE not in CROSSOVER_OPERATORS:
+        raise ValueError(f"Unknown CROSSOVER_MODE '{CROSSOVER_MODE}', expected one of {sorted(CROSSOVER_OPERATORS)}.")
+    if select_parent is None:
+        select_parent = lambda: tournament_selection(population)
+
+    offspring = []
+    while len(offspring) < count:
+        # Select two parents
+        parent1 = select_parent()
+        parent2 = select_parent()
+
+        # Crossover
+        crossover_used = []
+        if random.random() < crossover_rate:
+            name = crossover_selector.select() if crossover_selector is not None else CROSSOVER_MODE
+            started = time.perf_counter()
+            child1, child2 = CROSSOVER_OPERATORS[name](parent1, parent2, processed_data)
+            if crossover_selector is not None:
+                crossover_selector.record_call(name, time.perf_counter() - started)
+            crossover_used.append(name)
+        else:
+            child1, child2 = parent1, parent2
+
+        # Mutation (returns a new chromosome, the parents are left untouched)
+        if conflict_finder is not None:
+            child1 = targeted_mutation(child1, processed_data, mutation_rate, conflict_finder,
+                                       TARGETED_CONFLICT_RATE, TARGETED_BACKGROUND_SCALE, mutation_selector)
+            child2 = targeted_mutation(child2, processed_data, mutation_rate, conflict_finder,
+                                       TARGETED_CONFLICT_RATE, TARGETED_BACKGROUND_SCALE, mutation_selector)
+        else:
+            child1 = mutate_chromosome(child1, processed_data, mutation_rate, mutation_selector)
+            child2 = mutate_chromosome(child2, processed_data, mutation_rate, mutation_selector)
+
+        parent_fitness = max(parent1.fitness, parent2.fitness) if crossover_used else None
+        for child, parent in ((child1, parent1), (child2, parent2)):
+            canonicalize(child, processed_data)
+            child.operators = crossover_used + child.operators
+            child.parent_fitness = parent_fitness if crossover_used else parent.fitness
+
+        offspring.append(child1)
+        if len(offspring) < count:
+            offspring.append(child2)
+    return offspring
@@ -6,8 +6,11 @@ from config import (
     PENALTY_LECTURER_UNQUALIFIED, PENALTY_CONSECUTIVE_HOURS_LECTURER, 
     PENALTY_CONSECUTIVE_HOURS_CLASS, PENALTY_UNASSIGNED_GEN,
     MAX_CONSECUTIVE_SLOTS, PENALTY_DISTRIBUTION_DAYS, PENALTY_GAPS_IN_SCHEDULE,
-    PENALTY_WEEKEND_CLASH
+    PENALTY_WEEKEND_CLASH, PENALTY_BLOCK_SPLIT, FITNESS_BATCH_SIZE
 )
+from .array_chromosome import GeneEncoder, ArrayChromosome, DAY, SLOT, ROOM, LECTURER, UNASSIGNED
+from .domains import SUNDAY_NAMES
+from .occupancy import get_occupancy, gene_day_slots
 
 class FitnessCalculator:
     def __init__(self, processed_data):
@@ -19,10 +22,61 @@ class FitnessCalculator:
         self.class_map = processed_data.class_map
         self.lecturer_map = processed_data.lecturer_map
 
-    def calculate_fitness(self, chromosome):
+        # (lecturer_id, day, slot_id) -> số lịch bận cố định trùng khớp
+        self.busy_slot_counts = defaultdict(int)
+        for lecturer_id, lecturer_info in self.lecturer_map.items():
+            for busy_slot in lecturer_info.get('busy_slots', []):
+                self.busy_slot_counts[(lecturer_id, busy_slot.get('day'), busy_slot.get('slot_id'))] += 1
+        self.busy_slot_counts = dict(self.busy_slot_counts)
+
+        # Bảng tra cứu dạng mảng cho việc tính fitness theo lô
+        self.encoder = GeneEncoder(processed_data)
+        self._build_lookup_tables()
+
+    def _build_lookup_tables(self):
+        """Tiền tính các bảng ràng buộc tĩnh theo chỉ số (tiết học, phòng, giảng viên, ngày, slot)."""
+        encoder = self.encoder
+        lesson_types = [lesson['lesson_type'] for lesson in encoder.lessons]
+        lesson_subjects = [lesson['subject_id'] for lesson in encoder.lessons]
+
+        self.sunday_days = np.array([day.lower() in SUNDAY_NAMES for day in encoder.days], dtype=bool)
+
+        room_types = [self.room_map[room_id]['type'] for room_id in encoder.rooms]
+        room_capacities = np.array([self.room_map[room_id]['capacity'] for room_id in encoder.rooms])
+        # (tiết học, phòng)
+        self.room_type_mismatch = np.array(
+            [[room_type != lesson_type for room_type in room_types] for lesson_type in lesson_types], dtype=bool
+        ).reshape(encoder.num_lessons, len(encoder.rooms))
+        self.room_too_small = room_capacities[None, :] < encoder.lesson_size[:, None]
+
+        # (tiết học, giảng viên)
+        lecturer_subjects = [set(self.lecturer_map[lect_id]['subjects']) for lect_id in encoder.lecturers]
+        self.lecturer_unqualified = np.array(
+            [[subject_id not in subjects for subjects in lecturer_subjects] for subject_id in lesson_subjects], dtype=bool
+        ).reshape(encoder.num_lessons, len(encoder.lecturers))
+
+        # (giảng viên, ngày, slot): số lịch bận cố định trùng khớp
+        self.lecturer_busy = np.zeros((len(encoder.lecturers), len(encoder.days), len(encoder.slots)), dtype=np.int32)
+        for l_idx, lect_id in enumerate(encoder.lecturers):
+            for busy_slot in self.lecturer_map[lect_id].get('busy_slots', []):
+                d_idx = encoder.day_index.get(busy_slot.get('day'))
+                s_idx = encoder.slot_index.get(busy_slot.get('slot_id'))
+                if d_idx is not None and s_idx is not None:
+                    self.lecturer_busy[l_idx, d_idx, s_idx] += 1
+
+    def calculate_fitness(self, chromosome, return_conflicts=False):
+        """
+        Tính fitness và số vi phạm theo loại. Với return_conflicts=True trả thêm dict
+        loại vi phạm -> danh sách vị trí gen tham gia (với xung đột trùng lịch là tất cả
+        các gen cùng giảng viên/phòng/lớp trong cùng (day, slot), không chỉ gen thứ hai).
+        Khối tiết ghép được kiểm tra trùng lịch, lịch bận và tính phạt mềm ở từng slot nó chiếm.
+        """
         penalty = 0
         violations = defaultdict(int)
         scheduled_events = chromosome.genes
+        conflicts = defaultdict(set) if return_conflicts else None
+        # (loại xung đột, thực thể, day, slot) -> vị trí các gen, chỉ dùng khi return_conflicts
+        clash_members = defaultdict(list)
 
         # Data structures for tracking
         slot_occupancy = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
@@ -34,7 +88,7 @@ class FitnessCalculator:
         class_map = self.class_map
         lecturer_map = self.lecturer_map
 
-        for gene in scheduled_events:
+        for position, gene in enumerate(scheduled_events):
             # Extract data once
             day = gene.get('day')
             slot_id = gene.get('slot_id')
@@ -48,29 +102,47 @@ class FitnessCalculator:
             if not all([day, slot_id, lecturer_id, room_id, class_id, subject_id, lesson_type]):
                 penalty += PENALTY_UNASSIGNED_GEN
                 violations['Class not scheduled yet'] += 1
+                if return_conflicts:
+                    conflicts['Class not scheduled yet'].add(position)
                 continue
 
             # Check Sunday constraint - optimized
-            if day and day.lower() in ['sun', 'sunday', 'chủ nhật', 'cn']:
+            if day and day.lower() in SUNDAY_NAMES:
                 penalty += PENALTY_WEEKEND_CLASH
                 violations['Classes fall on Sunday'] += 1
+                if return_conflicts:
+                    conflicts['Classes fall on Sunday'].add(position)
+
+            # Khối tiết ghép phải nằm trọn trong một buổi
+            if self.block_split(gene):
+                penalty += PENALTY_BLOCK_SPLIT
+                violations['Lesson block split across sessions'] += 1
+                if return_conflicts:
+                    conflicts['Lesson block split across sessions'].add(position)
+
+            covered = gene_day_slots(gene, self.processed_data)
+            for _, covered_slot in covered:
+                # Check hard constraints
+                current_slot = slot_occupancy[day][covered_slot]
+                if lecturer_id in current_slot['lecturers']:
+                    penalty += PENALTY_LECTURER_CLASH
+                    violations['Lecturer has overlapping schedule'] += 1
+                if room_id in current_slot['rooms']:
+                    penalty += PENALTY_ROOM_CLASH
+                    violations['Classroom schedule overlap'] += 1
+                if class_id in current_slot['classes']:
+                    penalty += PENALTY_CLASS_CLASH
+                    violations['Class schedule overlap'] += 1
+
+                if return_conflicts:
+                    clash_members[('Lecturer has overlapping schedule', lecturer_id, day, covered_slot)].append(position)
+                    clash_members[('Classroom schedule overlap', room_id, day, covered_slot)].append(position)
+                    clash_members[('Class schedule overlap', class_id, day, covered_slot)].append(position)
 
-            # Check hard constraints
-            current_slot = slot_occupancy[day][slot_id]
-            if lecturer_id in current_slot['lecturers']:
-                penalty += PENALTY_LECTURER_CLASH
-                violations['Lecturer has overlapping schedule'] += 1
-            if room_id in current_slot['rooms']:
-                penalty += PENALTY_ROOM_CLASH
-                violations['Classroom schedule overlap'] += 1
-            if class_id in current_slot['classes']:
-                penalty += PENALTY_CLASS_CLASH
-                violations['Class schedule overlap'] += 1
-
-            # Update occupancy
-            current_slot['lecturers'].append(lecturer_id)
-            current_slot['rooms'].append(room_id)
-            current_slot['classes'].append(class_id)
+                # Update occupancy
+                current_slot['lecturers'].append(lecturer_id)
+                current_slot['rooms'].append(room_id)
+                current_slot['classes'].append(class_id)
             
             # Check room and lecturer constraints
             room_info = room_map.get(room_id)
@@ -81,24 +153,34 @@ class FitnessCalculator:
                 if room_info['type'] != lesson_type:
                     penalty += PENALTY_ROOM_TYPE_MISMATCH
                     violations['Wrong type of classroom'] += 1
+                    if return_conflicts:
+                        conflicts['Wrong type of classroom'].add(position)
                 if class_info and room_info['capacity'] < class_info['size']:
                     penalty += PENALTY_ROOM_CAPACITY
                     violations['Room capacity if not enough'] += 1
+                    if return_conflicts:
+                        conflicts['Room capacity if not enough'].add(position)
 
             if lecturer_info:
                 if subject_id not in lecturer_info['subjects']:
                     penalty += PENALTY_LECTURER_UNQUALIFIED
                     violations['The lecturer cannot teach the subject'] += 1
+                    if return_conflicts:
+                        conflicts['The lecturer cannot teach the subject'].add(position)
                 
                 # Check busy slots
                 for busy_slot in lecturer_info.get('busy_slots', []):
-                    if busy_slot['day'] == day and busy_slot['slot_id'] == slot_id:
-                        penalty += PENALTY_LECTURER_BUSY
-                        violations['Lecturer busy with fixed schedule'] += 1
+                    for _, covered_slot in covered:
+                        if busy_slot['day'] == day and busy_slot['slot_id'] == covered_slot:
+                            penalty += PENALTY_LECTURER_BUSY
+                            violations['Lecturer busy with fixed schedule'] += 1
+                            if return_conflicts:
+                                conflicts['Lecturer busy with fixed schedule'].add(position)
 
             # Track for soft constraints
-            lecturer_slots_per_day[lecturer_id][day].append(slot_id)
-            class_slots_per_day[class_id][day].append(slot_id)
+            for _, covered_slot in covered:
+                lecturer_slots_per_day[lecturer_id][day].append(covered_slot)
+                class_slots_per_day[class_id][day].append(covered_slot)
 
         # Calculate soft constraints penalties
         penalty += self._calculate_consecutive_penalty(class_slots_per_day, MAX_CONSECUTIVE_SLOTS, 
@@ -110,8 +192,217 @@ class FitnessCalculator:
         penalty += self._calculate_gaps_penalty(lecturer_slots_per_day)
 
         chromosome.fitness = -penalty
+        if return_conflicts:
+            for (violation, _, _, _), members in clash_members.items():
+                if len(members) > 1:
+                    conflicts[violation].update(members)
+            return chromosome.fitness, violations, {key: sorted(members) for key, members in conflicts.items()}
         return chromosome.fitness, violations
 
+    def block_split(self, gene):
+        """True nếu gen là khối tiết ghép (count > 1) không nằm trọn trong một buổi."""
+        count = gene.get('count', 1)
+        return count > 1 and self.processed_data.covered_slots(gene.get('slot_id'), count) is None
+
+    def conflicting_positions(self, chromosome):
+        """
+        Đường nhanh cho đột biến có định hướng: vị trí các gen đang vi phạm ràng buộc cứng
+        (chưa gán, trùng lịch giảng viên/phòng/lớp, lịch bận, Chủ nhật, khối tiết ghép tách
+        buổi, sai loại/thiếu sức chứa phòng, giảng viên không dạy được môn). Xung đột trùng lịch được tra từ bảng
+        chiếm dụng của nhiễm sắc thể nên không cần tính lại fitness.
+        """
+        occupancy = get_occupancy(chromosome, self.processed_data)
+        room_map, class_map, lecturer_map = self.room_map, self.class_map, self.lecturer_map
+        positions = []
+        for position, gene in enumerate(chromosome.genes):
+            day = gene.get('day')
+            slot_id = gene.get('slot_id')
+            lecturer_id = gene.get('lecturer_id')
+            room_id = gene.get('room_id')
+            class_id = gene.get('class_id')
+            if not all([day, slot_id, lecturer_id, room_id, class_id, gene.get('subject_id'), gene.get('lesson_type')]):
+                positions.append(position)
+                continue
+
+            room_info = room_map.get(room_id)
+            lecturer_info = lecturer_map.get(lecturer_id)
+            if (any(occupancy.lecturers[lecturer_id].get(day_slot, 0) > 1
+                    or occupancy.rooms[room_id].get(day_slot, 0) > 1
+                    or occupancy.classes[class_id].get(day_slot, 0) > 1
+                    or (lecturer_id, *day_slot) in self.busy_slot_counts
+                    for day_slot in occupancy.day_slots(gene))
+                    or day.lower() in SUNDAY_NAMES
+                    or self.block_split(gene)
+                    or (room_info and (room_info['type'] != gene['lesson_type']
+                                       or room_info['capacity'] < class_map.get(class_id, {}).get('size', 0)))
+                    or (lecturer_info and gene['subject_id'] not in lecturer_info['subjects'])):
+                positions.append(position)
+        return positions
+
+    def calculate_population_fitness(self, population, return_violations=False):
+        """
+        Tính fitness cho cả quần thể bằng numpy, cho kết quả giống calculate_fitness.
+        Chấp nhận Chromosome (gen dạng dict) hoặc ArrayChromosome.
+        Nếu return_violations=False thì bỏ qua việc dựng dict vi phạm (đường nhanh).
+        """
+        if not population:
+            return (np.zeros(0), []) if return_violations else np.zeros(0)
+
+        assignments = np.stack([
+            chrom.assignment if isinstance(chrom, ArrayChromosome) else self.encoder.encode_genes(chrom.genes)
+            for chrom in population
+        ])
+
+        fitness_values = np.empty(len(population))
+        all_violations = []
+        for start in range(0, len(population), FITNESS_BATCH_SIZE):
+            batch = assignments[start:start + FITNESS_BATCH_SIZE]
+            penalties, violation_counts = self._score_batch(batch)
+            fitness_values[start:start + len(batch)] = -penalties
+            if return_violations:
+                for row in range(len(batch)):
+                    all_violations.append(defaultdict(int, {
+                        key: int(counts[row]) for key, counts in violation_counts.items() if counts[row] > 0
+                    }))
+
+        for chrom, fitness in zip(population, fitness_values):
+            chrom.fitness = float(fitness)
+
+        if return_violations:
+            return fitness_values, all_violations
+        return fitness_values
+
+    def _score_batch(self, assignments):
+        """Tính tổng điểm phạt và số vi phạm cứng cho một lô ma trận gán (P, 4, L)."""
+        encoder = self.encoder
+        num_individuals, _, num_lessons = assignments.shape
+        num_days, num_slots = len(encoder.days), len(encoder.slots)
+        num_times = num_days * num_slots
+
+        assigned = np.all(assignments != UNASSIGNED, axis=1)
+        # Thay chỉ số -1 bằng 0 để tra bảng; kết quả được che bởi `assigned`
+        day = np.where(assigned, assignments[:, DAY], 0).astype(np.int64)
+        slot = np.where(assigned, assignments[:, SLOT], 0).astype(np.int64)
+        room = np.where(assigned, assignments[:, ROOM], 0).astype(np.int64)
+        lecturer = np.where(assigned, assignments[:, LECTURER], 0).astype(np.int64)
+        class_idx = np.broadcast_to(encoder.lesson_class.astype(np.int64), day.shape)
+        lesson_pos = np.arange(num_lessons)[None, :]
+
+        violations = {
+            'Class not scheduled yet': (~assigned).sum(axis=1),
+            'Classes fall on Sunday': (self.sunday_days[day] & assigned).sum(axis=1),
+            'Wrong type of classroom': (self.room_type_mismatch[lesson_pos, room] & assigned).sum(axis=1),
+            'Room capacity if not enough': (self.room_too_small[lesson_pos, room] & assigned).sum(axis=1),
+            'The lecturer cannot teach the subject': (self.lecturer_unqualified[lesson_pos, lecturer] & assigned).sum(axis=1),
+            'Lesson block split across sessions': np.zeros(num_individuals, dtype=np.int64),
+        }
+
+        if len(encoder.block_positions):
+            # Khối tiết ghép: thêm một cột cho mỗi slot tiếp theo mà khối chiếm (khối tách buổi chỉ
+            # được tính ở slot bắt đầu, như gene_day_slots)
+            blocks = encoder.block_positions
+            block_index = np.arange(len(blocks))[None, :]
+            violations['Lesson block split across sessions'] = (
+                ~encoder.block_fits[block_index, slot[:, blocks]] & assigned[:, blocks]
+            ).sum(axis=1)
+
+            extras = encoder.extra_positions
+            extra_slot = encoder.extra_slot[np.arange(len(extras))[None, :], slot[:, extras]]
+            extra_assigned = assigned[:, extras] & (extra_slot != UNASSIGNED)
+            day = np.concatenate([day, day[:, extras]], axis=1)
+            slot = np.concatenate([slot, np.where(extra_assigned, extra_slot, 0)], axis=1)
+            room = np.concatenate([room, room[:, extras]], axis=1)
+            lecturer = np.concatenate([lecturer, lecturer[:, extras]], axis=1)
+            class_idx = np.concatenate([class_idx, class_idx[:, extras]], axis=1)
+            assigned = np.concatenate([assigned, extra_assigned], axis=1)
+
+        # Trùng lịch, lịch bận và ràng buộc mềm được tính theo từng slot bị chiếm
+        time = day * num_slots + slot
+        violations.update({
+            'Lecturer has overlapping schedule': self._count_clashes(lecturer * num_times + time, assigned),
+            'Classroom schedule overlap': self._count_clashes(room * num_times + time, assigned),
+            'Class schedule overlap': self._count_clashes(class_idx * num_times + time, assigned),
+            'Lecturer busy with fixed schedule': (self.lecturer_busy[lecturer, day, slot] * assigned).sum(axis=1),
+        })
+
+        penalties = (
+            violations['Class not scheduled yet'] * PENALTY_UNASSIGNED_GEN
+            + violations['Classes fall on Sunday'] * PENALTY_WEEKEND_CLASH
+            + violations['Lecturer has overlapping schedule'] * PENALTY_LECTURER_CLASH
+            + violations['Classroom schedule overlap'] * PENALTY_ROOM_CLASH
+            + violations['Class schedule overlap'] * PENALTY_CLASS_CLASH
+            + violations['Wrong type of classroom'] * PENALTY_ROOM_TYPE_MISMATCH
+            + violations['Room capacity if not enough'] * PENALTY_ROOM_CAPACITY
+            + violations['The lecturer cannot teach the subject'] * PENALTY_LECTURER_UNQUALIFIED
+            + violations['Lecturer busy with fixed schedule'] * PENALTY_LECTURER_BUSY
+            + violations['Lesson block split across sessions'] * PENALTY_BLOCK_SPLIT
+        ).astype(float)
+
+        # Ràng buộc mềm: đếm số tiết theo (cá thể, thực thể, ngày, slot)
+        individual = np.broadcast_to(np.arange(num_individuals)[:, None], day.shape)
+        class_counts = self._occupancy_counts(individual, class_idx, time, assigned, len(encoder.classes), num_times)
+        lecturer_counts = self._occupancy_counts(individual, lecturer, time, assigned, len(encoder.lecturers), num_times)
+        class_counts = class_counts.reshape(num_individuals, -1, num_days, num_slots)
+        lecturer_counts = lecturer_counts.reshape(num_individuals, -1, num_days, num_slots)
+
+        penalties += PENALTY_CONSECUTIVE_HOURS_CLASS * self._consecutive_excess(class_counts, MAX_CONSECUTIVE_SLOTS)
+        penalties += PENALTY_CONSECUTIVE_HOURS_LECTURER * self._consecutive_excess(lecturer_counts, MAX_CONSECUTIVE_SLOTS)
+        penalties += PENALTY_DISTRIBUTION_DAYS * self._day_count_variance(class_counts)
+        penalties += PENALTY_GAPS_IN_SCHEDULE * self._count_gaps(lecturer_counts)
+        return penalties, violations
+
+    @staticmethod
+    def _count_clashes(keys, assigned):
+        """Số lần trùng khóa (tài nguyên, thời gian) trong mỗi hàng: mỗi nhóm n phần tử tính n - 1."""
+        # Gen chưa gán nhận khóa âm riêng biệt để không bao giờ trùng
+        placeholder = -1 - np.arange(keys.shape[1])[None, :]
+        keys = np.sort(np.where(assigned, keys, placeholder), axis=1)
+        return (keys[:, 1:] == keys[:, :-1]).sum(axis=1)
+
+    @staticmethod
+    def _occupancy_counts(individual, entity, time, assigned, num_entities, num_times):
+        size = individual.shape[0] * num_entities * num_times
+        flat = ((individual * num_entities + entity) * num_times + time)[assigned]
+        return np.bincount(flat, minlength=size)
+
+    @staticmethod
+    def _consecutive_excess(counts, max_consecutive):
+        """
+        Tổng số slot vượt quá max_consecutive trong các chuỗi liên tiếp, theo đúng cách
+        _calculate_consecutive_penalty duyệt danh sách slot đã sắp xếp (slot trùng cắt chuỗi).
+        """
+        run = np.zeros(counts.shape[:-1], dtype=np.int64)
+        excess = np.zeros(counts.shape[:-1], dtype=np.int64)
+        for j in range(counts.shape[-1]):
+            count = counts[..., j]
+            extended = run + 1
+            excess += np.where(count == 0, np.maximum(run - max_consecutive, 0), 0)
+            excess += np.where(count >= 2, np.maximum(extended - max_consecutive, 0), 0)
+            run = np.where(count == 0, 0, np.where(count == 1, extended, 1))
+        excess += np.maximum(run - max_consecutive, 0)
+        return excess.reshape(counts.shape[0], -1).sum(axis=1)
+
+    @staticmethod
+    def _day_count_variance(class_counts):
+        """Tổng phương sai số tiết theo ngày của từng lớp (chỉ xét các ngày có tiết)."""
+        per_day = class_counts.sum(axis=-1).astype(float)
+        active_days = (per_day > 0).sum(axis=-1)
+        safe_days = np.maximum(active_days, 1)
+        mean = per_day.sum(axis=-1) / safe_days
+        variance = (per_day ** 2).sum(axis=-1) / safe_days - mean ** 2
+        return np.where(active_days > 1, np.maximum(variance, 0.0), 0.0).sum(axis=1)
+
+    @staticmethod
+    def _count_gaps(lecturer_counts):
+        """Tổng số tiết trống xen kẽ trong ngày của từng giảng viên."""
+        present = lecturer_counts > 0
+        num_slots = present.shape[-1]
+        distinct = present.sum(axis=-1)
+        first = np.argmax(present, axis=-1)
+        last = num_slots - 1 - np.argmax(present[..., ::-1], axis=-1)
+        gaps = np.where(distinct > 1, last - first + 1 - distinct, 0)
+        return gaps.reshape(gaps.shape[0], -1).sum(axis=1)
+
     def _calculate_consecutive_penalty(self, schedule, max_consecutive, penalty_value, entity_type):
         """Optimized consecutive penalty calculation"""
         total_penalty = 0
@@ -0,0 +1,85 @@
+# timetable_ga/ga_components/fitness_cache.py
+import hashlib
+from collections import OrderedDict
+from config import CANONICAL_GROUP_ORDER
+from .array_chromosome import ArrayChromosome
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def chromosome_key(chromosome):
+    """
+    Khóa cấu trúc của phương án xếp lịch: digest BLAKE2b 128 bit của các giá trị (day, slot,
+    room, lecturer) theo từng tiết học. Không dùng hash() 64 bit vì khi trùng khóa, bộ nhớ đệm
+    sẽ trả về fitness của lịch khác và loại trùng sẽ bỏ nhầm một cá thể khác. Chromosome (gen
+    dict) không bị sửa sau khi tạo nên khóa được lưu lại trên đối tượng; ArrayChromosome thì
+    được băm trực tiếp từ mảng.
+    Khi CANONICAL_GROUP_ORDER bật, các phép gán được băm theo nhóm (group_id, count) và không phụ
+    thuộc thứ tự trong nhóm (xem symmetry.py): mọi hoán vị của cùng một thời khóa biểu
+    có chung một khóa.
+    """
+    if isinstance(chromosome, ArrayChromosome):
+        assignment = chromosome.assignment
+        if CANONICAL_GROUP_ORDER:
+            assignment = chromosome.encoder.canonical_assignment(assignment)
+        return _digest(assignment.tobytes())
+
+    if chromosome.structure_key is None:
+        if CANONICAL_GROUP_ORDER:
+            groups = {}
+            for gene in chromosome.genes:
+                groups.setdefault((gene.get('group_id'), gene.get('count', 1)), []).append((
+                    gene.get('day') or '', gene.get('slot_id') or '',
+                    gene.get('room_id') or '', gene.get('lecturer_id') or ''
+                ))
+            chromosome.structure_key = _digest(repr(tuple(
+                (group, tuple(sorted(assignments))) for group, assignments in groups.items()
+            )).encode('utf-8'))
+        else:
+            chromosome.structure_key = _digest(repr(tuple(
+                (gene['lesson_id'], gene.get('day'), gene.get('slot_id'), gene.get('room_id'), gene.get('lecturer_id'))
+                for gene in chromosome.genes
+            )).encode('utf-8'))
+    return chromosome.structure_key
+
+
+class FitnessCache:
+    """Bộ nhớ đệm LRU có giới hạn: khóa cấu trúc -> (fitness, violations hoặc None)."""
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, fitness, violations=None):
+        if self.max_size <= 0:
+            return
+        if key in self._entries:
+            # Giữ lại dict vi phạm đã có nếu lần ghi này chỉ có fitness
+            if violations is None:
+                violations = self._entries[key][1]
+            self._entries.move_to_end(key)
+        self._entries[key] = (fitness, violations)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "size": len(self._entries),
+            "max_size": self.max_size
+        }
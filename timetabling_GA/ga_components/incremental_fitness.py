@@ -0,0 +1,269 @@
+# timetable_ga/ga_components/incremental_fitness.py
+from collections import defaultdict
+from config import (
+    PENALTY_LECTURER_CLASH, PENALTY_ROOM_CLASH, PENALTY_CLASS_CLASH,
+    PENALTY_ROOM_TYPE_MISMATCH, PENALTY_ROOM_CAPACITY, PENALTY_LECTURER_BUSY,
+    PENALTY_LECTURER_UNQUALIFIED, PENALTY_CONSECUTIVE_HOURS_LECTURER,
+    PENALTY_CONSECUTIVE_HOURS_CLASS, PENALTY_UNASSIGNED_GEN,
+    MAX_CONSECUTIVE_SLOTS, PENALTY_WEEKEND_CLASH, PENALTY_DISTRIBUTION_DAYS,
+    PENALTY_GAPS_IN_SCHEDULE, PENALTY_BLOCK_SPLIT, DEBUG_INCREMENTAL_FITNESS
+)
+from .chromosome import Chromosome
+from .fitness import SUNDAY_NAMES
+from .occupancy import gene_day_slots
+
+# Vi phạm phát sinh khi một tài nguyên bị dùng trùng (day, slot)
+CLASH_RULES = (
+    ('lecturer_id', 'lecturer_counts', 'Lecturer has overlapping schedule', PENALTY_LECTURER_CLASH),
+    ('room_id', 'room_counts', 'Classroom schedule overlap', PENALTY_ROOM_CLASH),
+    ('class_id', 'class_counts', 'Class schedule overlap', PENALTY_CLASS_CLASH),
+)
+
+
+class FitnessState:
+    """
+    Trạng thái fitness gắn với một nhiễm sắc thể: số lần chiếm dụng theo
+    (tài nguyên, day, slot) và phần phạt mềm đã tính cho từng (thực thể, ngày).
+    Khi một gen thay đổi, chỉ các lớp/giảng viên/phòng liên quan được tính lại.
+    Kết quả trùng với FitnessCalculator.calculate_fitness.
+    """
+    def __init__(self, fitness_calculator):
+        self.calculator = fitness_calculator
+        self.hard_penalty = 0
+        self.violations = defaultdict(int)
+
+        # (tài nguyên, day, slot) -> số tiết đang chiếm
+        self.lecturer_counts = {}
+        self.room_counts = {}
+        self.class_counts = {}
+
+        # (thực thể, day) -> tuple slot_id (giữ cả slot trùng như calculate_fitness)
+        self.class_day_slots = {}
+        self.lecturer_day_slots = {}
+
+        # Phần phạt mềm đã tính và tổng của chúng
+        self.class_day_penalty = {}
+        self.lecturer_day_penalty = {}
+        self.class_distribution_penalty = {}
+        self.soft_penalty = 0.0
+
+        # Các thực thể cần tính lại phạt mềm
+        self._dirty_class_days = set()
+        self._dirty_lecturer_days = set()
+        self._dirty_classes = set()
+
+    @classmethod
+    def from_genes(cls, fitness_calculator, genes):
+        state = cls(fitness_calculator)
+        for gene in genes:
+            state.add_gene(gene)
+        return state
+
+    def copy(self):
+        """Sao chép nông: các dict chỉ chứa số và tuple nên không cần deepcopy."""
+        self.refresh()
+        clone = FitnessState.__new__(FitnessState)
+        clone.calculator = self.calculator
+        clone.hard_penalty = self.hard_penalty
+        clone.violations = defaultdict(int, self.violations)
+        clone.lecturer_counts = self.lecturer_counts.copy()
+        clone.room_counts = self.room_counts.copy()
+        clone.class_counts = self.class_counts.copy()
+        clone.class_day_slots = self.class_day_slots.copy()
+        clone.lecturer_day_slots = self.lecturer_day_slots.copy()
+        clone.class_day_penalty = self.class_day_penalty.copy()
+        clone.lecturer_day_penalty = self.lecturer_day_penalty.copy()
+        clone.class_distribution_penalty = self.class_distribution_penalty.copy()
+        clone.soft_penalty = self.soft_penalty
+        clone._dirty_class_days = set()
+        clone._dirty_lecturer_days = set()
+        clone._dirty_classes = set()
+        return clone
+
+    @staticmethod
+    def is_assigned(gene):
+        return all([gene.get('day'), gene.get('slot_id'), gene.get('lecturer_id'), gene.get('room_id'),
+                    gene.get('class_id'), gene.get('subject_id'), gene.get('lesson_type')])
+
+    def add_gene(self, gene):
+        self._apply(gene, 1)
+
+    def remove_gene(self, gene):
+        self._apply(gene, -1)
+
+    def replace_gene(self, old_gene, new_gene):
+        self._apply(old_gene, -1)
+        self._apply(new_gene, 1)
+
+    def _apply(self, gene, sign):
+        """Thêm (sign=1) hoặc gỡ (sign=-1) đóng góp của một gen."""
+        if not self.is_assigned(gene):
+            self._add_violation('Class not scheduled yet', PENALTY_UNASSIGNED_GEN, sign)
+            return
+
+        day = gene['day']
+        lecturer_id, class_id = gene['lecturer_id'], gene['class_id']
+        calculator = self.calculator
+        # Khối tiết ghép được tính ở từng slot nó chiếm
+        covered = gene_day_slots(gene, calculator.processed_data)
+
+        if day.lower() in SUNDAY_NAMES:
+            self._add_violation('Classes fall on Sunday', PENALTY_WEEKEND_CLASH, sign)
+        if calculator.block_split(gene):
+            self._add_violation('Lesson block split across sessions', PENALTY_BLOCK_SPLIT, sign)
+
+        # Xung đột cứng: nhóm n tiết trùng nhau bị tính n - 1 lần
+        for _, slot_id in covered:
+            for field, counts_name, violation_key, penalty_value in CLASH_RULES:
+                counts = getattr(self, counts_name)
+                key = (gene[field], day, slot_id)
+                current = counts.get(key, 0)
+                if sign > 0:
+                    if current >= 1:
+                        self._add_violation(violation_key, penalty_value, 1)
+                    counts[key] = current + 1
+                else:
+                    if current >= 2:
+                        self._add_violation(violation_key, penalty_value, -1)
+                    if current <= 1:
+                        counts.pop(key, None)
+                    else:
+                        counts[key] = current - 1
+
+        room_info = calculator.room_map.get(gene['room_id'])
+        class_info = calculator.class_map.get(class_id)
+        lecturer_info = calculator.lecturer_map.get(lecturer_id)
+        if room_info:
+            if room_info['type'] != gene['lesson_type']:
+                self._add_violation('Wrong type of classroom', PENALTY_ROOM_TYPE_MISMATCH, sign)
+            if class_info and room_info['capacity'] < class_info['size']:
+                self._add_violation('Room capacity if not enough', PENALTY_ROOM_CAPACITY, sign)
+        if lecturer_info:
+            if gene['subject_id'] not in lecturer_info['subjects']:
+                self._add_violation('The lecturer cannot teach the subject', PENALTY_LECTURER_UNQUALIFIED, sign)
+            for _, slot_id in covered:
+                busy_count = calculator.busy_slot_counts.get((lecturer_id, day, slot_id), 0)
+                if busy_count:
+                    self._add_violation('Lecturer busy with fixed schedule', PENALTY_LECTURER_BUSY, sign, busy_count)
+
+        # Ràng buộc mềm: cập nhật danh sách slot và đánh dấu cần tính lại
+        for _, slot_id in covered:
+            self._update_day_slots(self.class_day_slots, (class_id, day), slot_id, sign)
+            self._update_day_slots(self.lecturer_day_slots, (lecturer_id, day), slot_id, sign)
+        self._dirty_class_days.add((class_id, day))
+        self._dirty_lecturer_days.add((lecturer_id, day))
+        self._dirty_classes.add(class_id)
+
+    def _add_violation(self, key, penalty_value, sign, count=1):
+        self.hard_penalty += sign * penalty_value * count
+        self.violations[key] += sign * count
+        if self.violations[key] == 0:
+            del self.violations[key]
+
+    @staticmethod
+    def _update_day_slots(day_slots, key, slot_id, sign):
+        slots = day_slots.get(key, ())
+        if sign > 0:
+            day_slots[key] = slots + (slot_id,)
+            return
+        slots = list(slots)
+        slots.remove(slot_id)
+        if slots:
+            day_slots[key] = tuple(slots)
+        else:
+            day_slots.pop(key, None)
+
+    def refresh(self):
+        """Tính lại phạt mềm cho các thực thể đã bị thay đổi."""
+        slot_order_map = self.calculator.slot_order_map
+        for key in self._dirty_class_days:
+            orders = sorted(slot_order_map[s] for s in self.class_day_slots.get(key, ()) if s in slot_order_map)
+            self._set_soft(self.class_day_penalty, key,
+                           PENALTY_CONSECUTIVE_HOURS_CLASS * _consecutive_excess(orders))
+
+        for key in self._dirty_lecturer_days:
+            orders = sorted(slot_order_map[s] for s in self.lecturer_day_slots.get(key, ()) if s in slot_order_map)
+            self._set_soft(self.lecturer_day_penalty, key,
+                           PENALTY_CONSECUTIVE_HOURS_LECTURER * _consecutive_excess(orders)
+                           + PENALTY_GAPS_IN_SCHEDULE * _gap_count(orders))
+
+        days = self.calculator.processed_data.data['days_of_week']
+        for class_id in self._dirty_classes:
+            day_counts = [
+                len(self.class_day_slots[(class_id, day)]) for day in days if (class_id, day) in self.class_day_slots
+            ]
+            self._set_soft(self.class_distribution_penalty, class_id,
+                           PENALTY_DISTRIBUTION_DAYS * _variance(day_counts) if len(day_counts) > 1 else 0)
+
+        self._dirty_class_days.clear()
+        self._dirty_lecturer_days.clear()
+        self._dirty_classes.clear()
+
+    def _set_soft(self, contributions, key, penalty):
+        self.soft_penalty += penalty - contributions.get(key, 0)
+        if penalty:
+            contributions[key] = penalty
+        else:
+            contributions.pop(key, None)
+
+    @property
+    def penalty(self):
+        self.refresh()
+        return self.hard_penalty + self.soft_penalty
+
+    @property
+    def fitness(self):
+        return -self.penalty
+
+
+def _consecutive_excess(orders):
+    """
+    Số slot vượt MAX_CONSECUTIVE_SLOTS trong danh sách thứ tự slot đã sắp xếp,
+    cùng quy tắc với FitnessCalculator._calculate_consecutive_penalty.
+    """
+    if len(orders) <= MAX_CONSECUTIVE_SLOTS:
+        return 0
+    excess = 0
+    consecutive_count = 1
+    for i in range(1, len(orders)):
+        if orders[i] == orders[i - 1] + 1:
+            consecutive_count += 1
+        else:
+            if consecutive_count > MAX_CONSECUTIVE_SLOTS:
+                excess += consecutive_count - MAX_CONSECUTIVE_SLOTS
+            consecutive_count = 1
+    if consecutive_count > MAX_CONSECUTIVE_SLOTS:
+        excess += consecutive_count - MAX_CONSECUTIVE_SLOTS
+    return excess
+
+
+def _gap_count(orders):
+    """Số tiết trống xen kẽ trong danh sách thứ tự slot đã sắp xếp."""
+    return sum(orders[i] - orders[i - 1] - 1 for i in range(1, len(orders)) if orders[i] > orders[i - 1] + 1)
+
+
+def _variance(values):
+    mean = sum(values) / len(values)
+    return sum((v - mean) ** 2 for v in values) / len(values)
+
+
+def evaluate_incremental(chromosome, fitness_calculator):
+    """
+    Trả về (fitness, violations) từ FitnessState của nhiễm sắc thể, tạo state
+    mới nếu chưa có. Khi DEBUG_INCREMENTAL_FITNESS bật, so sánh với cách tính đầy đủ.
+    """
+    if chromosome.fitness_state is None:
+        chromosome.fitness_state = FitnessState.from_genes(fitness_calculator, chromosome.genes)
+
+    state = chromosome.fitness_state
+    chromosome.fitness = state.fitness
+
+    if DEBUG_INCREMENTAL_FITNESS:
+        expected_fitness, expected_violations = fitness_calculator.calculate_fitness(Chromosome(chromosome.genes))
+        if abs(expected_fitness - chromosome.fitness) > 1e-6 or dict(expected_violations) != dict(state.violations):
+            raise AssertionError(
+                f"Incremental fitness mismatch: {chromosome.fitness} != {expected_fitness} "
+                f"({dict(state.violations)} != {dict(expected_violations)})"
+            )
+
+    return chromosome.fitness, defaultdict(int, state.violations)
@@ -0,0 +1,88 @@
+# timetable_ga/ga_components/local_search.py
+import random
+
+from .array_chromosome import ArrayChromosome
+from .chromosome import Chromosome, find_available_time_slot_and_resources
+from .incremental_fitness import FitnessState
+from .occupancy import get_occupancy
+
+
+def _with_gene(chromosome, position, occupancy, new_gene):
+    """Cá thể mới chỉ khác chromosome ở gen tại position (occupancy đã bỏ gen cũ, là bản riêng)."""
+    genes = list(chromosome.genes)
+    old_gene = genes[position]
+    genes[position] = new_gene
+    occupancy.add_gene(new_gene)
+    state = None
+    if chromosome.fitness_state is not None:
+        state = chromosome.fitness_state.copy()
+        state.replace_gene(old_gene, new_gene)
+    return Chromosome(genes, state, occupancy)
+
+
+def min_conflicts_search(chromosome, processed_data, evaluator, max_evaluations, candidates_per_move=4):
+    """
+    Tìm kiếm cục bộ min-conflicts: lặp lại việc chọn ngẫu nhiên một gen đang vi phạm ràng
+    buộc cứng, thử tối đa candidates_per_move tổ hợp (day, slot, giảng viên, phòng) không
+    trùng lịch cho nó và giữ phương án tốt nhất nếu không làm fitness giảm.
+    Dừng khi hết xung đột hoặc đã dùng max_evaluations lần đánh giá.
+    Trả về (cá thể tốt nhất tìm được, số lần đánh giá đã dùng).
+    """
+    current = chromosome.to_chromosome() if isinstance(chromosome, ArrayChromosome) else chromosome
+    if current.fitness_state is None and evaluator.incremental:
+        current.fitness_state = FitnessState.from_genes(evaluator.fitness_calculator, current.genes)
+    conflict_finder = evaluator.fitness_calculator.conflicting_positions
+
+    evaluations = 0
+    while evaluations < max_evaluations:
+        conflicts = conflict_finder(current)
+        if not conflicts:
+            break
+        position = random.choice(conflicts)
+        gene = current.genes[position]
+
+        best_candidate = None
+        for _ in range(min(candidates_per_move, max_evaluations - evaluations)):
+            occupancy = get_occupancy(current, processed_data).copy()
+            occupancy.remove_gene(gene)
+            day, slot_id, lecturer_id, room_id = find_available_time_slot_and_resources(
+                processed_data, gene, occupancy.lecturers, occupancy.rooms, occupancy.classes
+            )
+            evaluations += 1
+            if day is None:
+                continue
+            candidate = _with_gene(
+                current, position, occupancy,
+                dict(gene, day=day, slot_id=slot_id, lecturer_id=lecturer_id, room_id=room_id)
+            )
+            evaluator.evaluate([candidate])
+            if best_candidate is None or candidate.fitness > best_candidate.fitness:
+                best_candidate = candidate
+
+        if best_candidate is not None and best_candidate.fitness >= current.fitness:
+            current = best_candidate
+
+    return current, evaluations
+
+
+def apply_local_search(population, processed_data, evaluator, elite_count, probability, max_evaluations,
+                       candidates_per_move=4):
+    """
+    Giai đoạn memetic: chạy min_conflicts_search cho elite_count cá thể tốt nhất và cho mỗi cá thể
+    còn lại với xác suất probability. Cá thể cải thiện được thay trực tiếp trong population.
+    Trả về thống kê {"searched", "improved", "evaluations"}.
+    """
+    ranked = sorted(range(len(population)), key=lambda i: population[i].fitness, reverse=True)
+    selected = ranked[:elite_count] + [i for i in ranked[elite_count:] if random.random() < probability]
+
+    stats = {"searched": 0, "improved": 0, "evaluations": 0}
+    for i in selected:
+        improved, evaluations = min_conflicts_search(
+            population[i], processed_data, evaluator, max_evaluations, candidates_per_move
+        )
+        stats["searched"] += 1
+        stats["evaluations"] += evaluations
+        if improved.fitness > population[i].fitness:
+            population[i] = improved
+            stats["improved"] += 1
+    return stats
@@ -0,0 +1,169 @@
+# timetable_ga/ga_components/migration.py
+import json
+import queue
+import socket
+import struct
+import threading
+import time
+import numpy as np
+
+from config import MIGRATION_TOPOLOGY, ISLAND_HOSTS, ISLAND_BASE_PORT
+
+
+def migration_targets(island_index, num_islands, topology=MIGRATION_TOPOLOGY):
+    """Các đảo nhận cá thể di cư từ island_index theo cấu trúc liên kết."""
+    if num_islands <= 1:
+        return []
+    if topology == "ring":
+        return [(island_index + 1) % num_islands]
+    if topology == "fully_connected":
+        return [i for i in range(num_islands) if i != island_index]
+    if topology == "star":
+        # Đảo 0 là trung tâm: trao đổi với mọi đảo, các đảo khác chỉ gửi về trung tâm
+        return [i for i in range(1, num_islands)] if island_index == 0 else [0]
+    raise ValueError(f"Unknown migration topology: {topology}")
+
+
+def island_addresses(num_islands):
+    """Địa chỉ (host, port) của từng đảo; mặc định là các cổng liên tiếp trên localhost."""
+    if ISLAND_HOSTS:
+        addresses = []
+        for host_port in ISLAND_HOSTS:
+            host, port = host_port.rsplit(':', 1)
+            addresses.append((host, int(port)))
+        return addresses
+    return [('127.0.0.1', ISLAND_BASE_PORT + i) for i in range(num_islands)]
+
+
+class QueueMigrationTransport:
+    """Trao đổi cá thể giữa các đảo chạy trên cùng máy qua multiprocessing queue."""
+    def __init__(self, island_index, inboxes):
+        self.island_index = island_index
+        self.inboxes = inboxes
+
+    def send(self, target, message):
+        self.inboxes[target].put(message)
+
+    def receive(self):
+        messages = []
+        while True:
+            try:
+                messages.append(self.inboxes[self.island_index].get_nowait())
+            except queue.Empty:
+                return messages
+
+    def close(self):
+        pass
+
+
+class SocketMigrationTransport:
+    """
+    Cùng giao thức di cư qua TCP để các đảo có thể nằm trên nhiều máy.
+    Mỗi thông điệp: 4 byte độ dài phần đầu JSON, phần đầu JSON, rồi mảng gen int16 thô.
+    """
+    def __init__(self, island_index, addresses, connect_timeout=5.0):
+        self.island_index = island_index
+        self.addresses = addresses
+        self.connect_timeout = connect_timeout
+        self._inbox = queue.Queue()
+        host, port = addresses[island_index]
+        self._server = socket.create_server((host, port))
+        self._server.settimeout(0.5)
+        self._closed = threading.Event()
+        self._listener = threading.Thread(target=self._accept_loop, daemon=True)
+        self._listener.start()
+
+    @staticmethod
+    def encode_message(message):
+        genes = np.ascontiguousarray(message['genes'], dtype=np.int16)
+        header = json.dumps({
+            'source': message['source'],
+            'kind': message['kind'],
+            'fitness': [float(f) for f in message['fitness']],
+            'shape': list(genes.shape)
+        }).encode('utf-8')
+        payload = genes.tobytes()
+        return struct.pack('!II', len(header), len(payload)) + header + payload
+
+    @staticmethod
+    def _read_exact(conn, size):
+        data = bytearray()
+        while len(data) < size:
+            chunk = conn.recv(size - len(data))
+            if not chunk:
+                return None
+            data.extend(chunk)
+        return bytes(data)
+
+    def _accept_loop(self):
+        while not self._closed.is_set():
+            try:
+                conn, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            with conn:
+                conn.settimeout(self.connect_timeout)
+                try:
+                    while True:
+                        lengths = self._read_exact(conn, 8)
+                        if lengths is None:
+                            break
+                        header_len, payload_len = struct.unpack('!II', lengths)
+                        header = json.loads(self._read_exact(conn, header_len).decode('utf-8'))
+                        payload = self._read_exact(conn, payload_len)
+                        genes = np.frombuffer(payload, dtype=np.int16).reshape(header['shape'])
+                        self._inbox.put({
+                            'source': header['source'], 'kind': header['kind'],
+                            'fitness': header['fitness'], 'genes': genes.copy()
+                        })
+                except (OSError, ValueError, AttributeError) as e:
+                    print(f"Warning: island {self.island_index} dropped a malformed migration message: {e}")
+
+    def send(self, target, message):
+        try:
+            with socket.create_connection(self.addresses[target], timeout=self.connect_timeout) as conn:
+                conn.sendall(self.encode_message(message))
+        except OSError as e:
+            # Đảo đích chưa sẵn sàng hoặc đã dừng: bỏ qua lượt di cư này
+            print(f"Warning: island {self.island_index} could not send migrants to island {target}: {e}")
+
+    def receive(self):
+        messages = []
+        while True:
+            try:
+                messages.append(self._inbox.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def wait_for(self, kind, count, timeout):
+        """Chờ tối đa `timeout` giây để nhận `count` thông điệp loại `kind`."""
+        received, others = [], []
+        deadline = time.time() + timeout
+        while len(received) < count and time.time() < deadline:
+            try:
+                message = self._inbox.get(timeout=max(0.0, deadline - time.time()))
+            except queue.Empty:
+                break
+            (received if message['kind'] == kind else others).append(message)
+        for message in others:
+            self._inbox.put(message)
+        return received
+
+    def close(self):
+        self._closed.set()
+        self._server.close()
+
+
+def make_transport(transport_type, island_index, num_islands, inboxes=None):
+    """Tạo kênh di cư: "tcp" (nhiều máy) hoặc "queue" (các tiến trình trên cùng máy)."""
+    if transport_type == "tcp":
+        return SocketMigrationTransport(island_index, island_addresses(num_islands))
+    if transport_type != "queue":
+        raise ValueError(f"Unknown island transport '{transport_type}', expected 'queue' or 'tcp'.")
+    if inboxes is None:
+        # Hàng đợi chỉ dùng được giữa các tiến trình do run_island_model tạo ra trên cùng máy
+        raise ValueError("The 'queue' island transport needs the inboxes created by run_island_model; "
+                         "use ISLAND_TRANSPORT = \"tcp\" when ISLAND_ID is set.")
+    return QueueMigrationTransport(island_index, inboxes)
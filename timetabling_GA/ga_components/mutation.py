@@ -1,79 +1,251 @@
 # timetable_ga/ga_components/mutation.py
-from collections import defaultdict
+import math
 import random
-import copy
+import time
 from .chromosome import Chromosome, find_available_time_slot_and_resources
-from config import MAX_ASSIGNMENT_ATTEMPTS
+from .domains import get_domains
+from .occupancy import get_occupancy
 
-def mutate_chromosome(chromosome, processed_data, mutation_rate):
+# Các kiểu đột biến (tên dùng cho chọn toán tử thích nghi và thống kê):
+# ba kiểu đầu lấy mẫu lại một trường của một gen, "swap" và "kempe" là các bước lân cận
+# dời nhiều gen cùng lúc (xem swap_time_slots, kempe_chain_move)
+MUTATION_OPERATORS = ("day_slot", "room", "lecturer", "swap", "kempe")
+
+
+def select_mutation_positions(num_genes, mutation_rate):
+    """
+    Chọn các vị trí gen bị đột biến, tương đương việc tung đồng xu với xác suất
+    mutation_rate cho từng gen nhưng chỉ tốn công cho các gen được chọn
+    (bước nhảy giữa hai vị trí liên tiếp có phân phối hình học).
+    """
+    if mutation_rate <= 0 or num_genes == 0:
+        return []
+    if mutation_rate >= 1:
+        return list(range(num_genes))
+
+    positions = []
+    log_keep = math.log(1.0 - mutation_rate)
+    position = -1
+    while True:
+        position += int(math.log(1.0 - random.random()) / log_keep) + 1
+        if position >= num_genes:
+            return positions
+        positions.append(position)
+
+
+def _time_slot(gene):
+    if gene.get('day') and gene.get('slot_id'):
+        return (gene['day'], gene['slot_id'])
+    return None
+
+
+def swap_time_slots(genes, position, processed_data):
+    """
+    Bước hoán đổi: đổi (day, slot_id) của gen tại position với một gen khác có cùng độ dài
+    khối, ưu tiên gen cùng lớp (lịch của lớp vẫn không trùng). Trả về danh sách
+    (vị trí, day, slot_id) cần gán.
+    """
+    time_slot = _time_slot(genes[position])
+    if time_slot is None:
+        return []
+    class_id = genes[position]['class_id']
+    count = genes[position].get('count', 1)
+    candidates = [
+        j for j, gene in enumerate(genes)
+        if gene['class_id'] == class_id and gene.get('count', 1) == count and _time_slot(gene) not in (None, time_slot)
+    ]
+    if not candidates:
+        candidates = [
+            j for j, gene in enumerate(genes)
+            if gene.get('count', 1) == count and _time_slot(gene) not in (None, time_slot)
+        ]
+    if not candidates:
+        return []
+    other = random.choice(candidates)
+    other_slot = _time_slot(genes[other])
+    return [(position, *other_slot), (other, *time_slot)]
+
+
+def kempe_chain_move(genes, position, processed_data):
+    """
+    Bước chuỗi Kempe: chọn ngẫu nhiên slot đích t2 cho gen tại position (đang ở t1), lấy
+    thành phần liên thông chứa gen đó trong đồ thị các gen ở t1 và t2 (nối nhau khi cùng
+    giảng viên, phòng hoặc lớp) rồi đổi t1 <-> t2 cho cả chuỗi. Nếu t1 và t2 không có
+    trùng lịch thì sau khi đổi vẫn không có, vì mọi gen xung đột đều đi cùng chuỗi (với khối
+    tiết ghép, chuỗi chỉ xét slot bắt đầu nên điều này không còn được bảo đảm). t2 là slot
+    mà khối của gen tại position nằm trọn trong buổi.
+    Trả về danh sách (vị trí, day, slot_id) cần gán.
+    """
+    source = _time_slot(genes[position])
+    if source is None:
+        return []
+    count = genes[position].get('count', 1)
+    targets = [
+        time_slot for time_slot in get_domains(processed_data).time_slots
+        if time_slot != source and processed_data.covered_slots(time_slot[1], count) is not None
+    ]
+    if not targets:
+        return []
+    target = random.choice(targets)
+
+    members = {source: [], target: []}
+    for j, gene in enumerate(genes):
+        time_slot = _time_slot(gene)
+        if time_slot in members:
+            members[time_slot].append(j)
+
+    def resources(gene):
+        return {('lecturer', gene['lecturer_id']), ('room', gene['room_id']), ('class', gene['class_id'])}
+
+    chain = {position}
+    frontier = [position]
+    while frontier:
+        j = frontier.pop()
+        other_side = target if _time_slot(genes[j]) == source else source
+        used = resources(genes[j])
+        for k in members[other_side]:
+            if k not in chain and used & resources(genes[k]):
+                chain.add(k)
+                frontier.append(k)
+
+    return [
+        (j, *(target if _time_slot(genes[j]) == source else source))
+        for j in sorted(chain)
+    ]
+
+
+# Các bước lân cận dời nhiều gen: hàm(genes, vị trí, processed_data) -> [(vị trí, day, slot_id)]
+NEIGHBORHOOD_MOVES = {
+    "swap": swap_time_slots,
+    "kempe": kempe_chain_move
+}
+
+
+def resample_gene(gene, mutation_type, occupancy, processed_data):
+    """
+    Bản sao của gene với ngày/slot, phòng hoặc giảng viên được lấy mẫu lại (mutation_type là
+    "day_slot", "room" hoặc "lecturer"). occupancy không được chứa chính gene này.
+    """
+    gene = dict(gene)
+    domain = get_domains(processed_data)[gene['lesson_id']]
+    time_slot = (gene['day'], gene['slot_id'])
+    covered = occupancy.day_slots(gene)
+
+    if mutation_type == "day_slot":
+        # Tìm slot mới
+        new_day, new_slot, _, _ = find_available_time_slot_and_resources(
+            processed_data, gene, occupancy.lecturers, occupancy.rooms, occupancy.classes
+        )
+        gene['day'] = new_day
+        gene['slot_id'] = new_slot
+
+    elif mutation_type == "room":
+        # Tìm phòng mới
+        available_rooms = [r for r in domain.rooms if not any(t in occupancy.rooms[r] for t in covered)]
+        if available_rooms:
+            gene['room_id'] = random.choice(available_rooms)
+        else:
+            gene['room_id'] = None
+
+    elif mutation_type == "lecturer":
+        # Tìm giảng viên mới (miền đã loại giảng viên bận cố định tại slot này)
+        available_lecturers = [
+            l for l in domain.lecturers_for(time_slot) if not any(t in occupancy.lecturers[l] for t in covered)
+        ]
+        if available_lecturers:
+            gene['lecturer_id'] = random.choice(available_lecturers)
+        else:
+            gene['lecturer_id'] = None
+
+    return gene
+
+
+def propose_move(genes, occupancy, position, mutation_type, processed_data):
+    """
+    Một bước lân cận quanh gen tại position, chưa áp dụng: trả về danh sách (vị trí, gen mới).
+    occupancy là bảng chiếm dụng của genes; nó chỉ bị sửa tạm thời và được trả lại như cũ.
+    """
+    if mutation_type in NEIGHBORHOOD_MOVES:
+        return [
+            (j, dict(genes[j], day=day, slot_id=slot_id))
+            for j, day, slot_id in NEIGHBORHOOD_MOVES[mutation_type](genes, position, processed_data)
+        ]
+
+    # Xóa gen cũ khỏi bảng chiếm dụng để kiểm tra xung đột
+    old_gene = genes[position]
+    occupancy.remove_gene(old_gene)
+    gene = resample_gene(old_gene, mutation_type, occupancy, processed_data)
+    occupancy.add_gene(old_gene)
+    return [(position, gene)]
+
+
+def select_targeted_positions(num_genes, conflict_positions, mutation_rate, conflict_rate, background_scale):
+    """
+    Vị trí gen cho đột biến có định hướng: mỗi gen đang vi phạm ràng buộc cứng bị đột biến
+    với xác suất conflict_rate, các gen còn lại với mutation_rate * background_scale.
+    Khi không còn xung đột thì quay về tỷ lệ đột biến thông thường trên toàn bộ gen.
+    """
+    if not conflict_positions:
+        return select_mutation_positions(num_genes, mutation_rate)
+
+    conflicting = set(conflict_positions)
+    positions = [i for i in conflict_positions if random.random() < conflict_rate]
+    others = [i for i in range(num_genes) if i not in conflicting]
+    positions.extend(others[j] for j in select_mutation_positions(len(others), mutation_rate * background_scale))
+    return positions
+
+
+def targeted_mutation(chromosome, processed_data, mutation_rate, conflict_finder, conflict_rate,
+                      background_scale, operator_selector=None):
+    """
+    Đột biến ưu tiên các gen đang tham gia vi phạm ràng buộc cứng (trùng lịch giảng viên/phòng/lớp,
+    lịch bận, chưa gán, ...). conflict_finder(chromosome) trả về danh sách vị trí các gen đó,
+    thường là FitnessCalculator.conflicting_positions.
+    """
+    positions = select_targeted_positions(
+        len(chromosome.genes), conflict_finder(chromosome), mutation_rate, conflict_rate, background_scale
+    )
+    return mutate_chromosome(chromosome, processed_data, mutation_rate, operator_selector, positions=positions)
+
+
+def mutate_chromosome(chromosome, processed_data, mutation_rate, operator_selector=None, positions=None):
     """
     Đột biến một cá thể bằng cách thay đổi một gene.
+    Con dùng chung các gen không đổi với cha; gen bị đột biến được thay bằng bản
+    sao mới. Bảng chiếm dụng và trạng thái fitness được cập nhật theo gia số.
+    operator_selector (AdaptivePursuit) chọn kiểu đột biến; mặc định chọn đều ngẫu nhiên.
+    positions: các vị trí gen cần đột biến; mặc định mỗi gen bị chọn với xác suất mutation_rate.
+    Tên các kiểu đột biến đã dùng được lưu vào `operators` của cá thể con.
     """
-    mutated_genes = copy.deepcopy(chromosome.genes)
-    
-    # Tạo các từ điển để kiểm tra xung đột một cách hiệu quả
-    used_slots_per_lecturer = defaultdict(set)
-    used_slots_per_room = defaultdict(set)
-    used_slots_per_class = defaultdict(set)
-    
-    for gene in mutated_genes:
-        if all([gene['day'], gene['slot_id'], gene['lecturer_id'], gene['room_id']]):
-            used_slots_per_lecturer[gene['lecturer_id']].add((gene['day'], gene['slot_id']))
-            used_slots_per_room[gene['room_id']].add((gene['day'], gene['slot_id']))
-            used_slots_per_class[gene['class_id']].add((gene['day'], gene['slot_id']))
-
-    for i in range(len(mutated_genes)):
-        if random.random() < mutation_rate:
-            gene = mutated_genes[i]
-            
-            # Xóa gen cũ khỏi các set để kiểm tra xung đột
-            if all([gene.get('day'), gene.get('slot_id'), gene.get('lecturer_id'), gene.get('room_id')]):
-                used_slots_per_lecturer[gene['lecturer_id']].discard((gene['day'], gene['slot_id']))
-                used_slots_per_room[gene['room_id']].discard((gene['day'], gene['slot_id']))
-                used_slots_per_class[gene['class_id']].discard((gene['day'], gene['slot_id']))
-
-            mutation_type = random.choice(["day_slot", "room", "lecturer"])
-            
-            class_id = gene['class_id']
-            subject_id = gene['subject_id']
-            lesson_type = gene['lesson_type']
-            class_size = processed_data.class_map.get(class_id, {}).get('size', 0)
-            
-            if mutation_type == "day_slot":
-                # Tìm slot mới
-                new_day, new_slot, _, _ = find_available_time_slot_and_resources(
-                    processed_data, gene, used_slots_per_lecturer, used_slots_per_room, used_slots_per_class
-                )
-                gene['day'] = new_day
-                gene['slot_id'] = new_slot
-
-            elif mutation_type == "room":
-                # Tìm phòng mới
-                available_rooms = [
-                    r for r in processed_data.get_rooms_for_type_and_capacity(lesson_type, class_size)
-                    if (gene['day'], gene['slot_id']) not in used_slots_per_room[r]
-                ]
-                if available_rooms:
-                    gene['room_id'] = random.choice(available_rooms)
-                else:
-                    gene['room_id'] = None
-
-            elif mutation_type == "lecturer":
-                # Tìm giảng viên mới
-                available_lecturers = [
-                    l for l in processed_data.get_lecturers_for_subject(subject_id)
-                    if (gene['day'], gene['slot_id']) not in processed_data.lecturer_map.get(l, {}).get('busy_slots', set())
-                    and (gene['day'], gene['slot_id']) not in used_slots_per_lecturer[l]
-                ]
-                if available_lecturers:
-                    gene['lecturer_id'] = random.choice(available_lecturers)
-                else:
-                    gene['lecturer_id'] = None
-            
-            # Sau khi đột biến, cập nhật lại các set
-            if all([gene.get('day'), gene.get('slot_id'), gene.get('lecturer_id'), gene.get('room_id')]):
-                used_slots_per_lecturer[gene['lecturer_id']].add((gene['day'], gene['slot_id']))
-                used_slots_per_room[gene['room_id']].add((gene['day'], gene['slot_id']))
-                used_slots_per_class[class_id].add((gene['day'], gene['slot_id']))
-    
-    return Chromosome(mutated_genes)
\ No newline at end of file
+    if positions is None:
+        positions = select_mutation_positions(len(chromosome.genes), mutation_rate)
+
+    mutated_genes = list(chromosome.genes)
+    occupancy = get_occupancy(chromosome, processed_data).copy()
+    # Trạng thái fitness của con được cập nhật theo gia số từ trạng thái của cha
+    fitness_state = chromosome.fitness_state.copy() if chromosome.fitness_state is not None else None
+    used_operators = []
+
+    for i in positions:
+        if operator_selector is not None:
+            mutation_type = operator_selector.select()
+        else:
+            mutation_type = random.choice(MUTATION_OPERATORS)
+        started = time.perf_counter()
+
+        # Mỗi gen bị đổi được thay bằng bản sao mới
+        for j, gene in propose_move(mutated_genes, occupancy, i, mutation_type, processed_data):
+            old_gene = mutated_genes[j]
+            mutated_genes[j] = gene
+            occupancy.replace_gene(old_gene, gene)
+            if fitness_state is not None:
+                fitness_state.replace_gene(old_gene, gene)
+
+        if operator_selector is not None:
+            operator_selector.record_call(mutation_type, time.perf_counter() - started)
+        if mutation_type not in used_operators:
+            used_operators.append(mutation_type)
+
+    mutated = Chromosome(mutated_genes, fitness_state, occupancy)
+    mutated.operators = used_operators
+    return mutated
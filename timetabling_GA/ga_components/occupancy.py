@@ -0,0 +1,111 @@
+# timetable_ga/ga_components/occupancy.py
+
+_EMPTY = {}
+
+
+def gene_day_slots(gene, processed_data=None):
+    """
+    Các (day, slot_id) mà một gen đã xếp chiếm: khối `count` tiết chiếm các slot liên tiếp từ
+    slot_id (xem DataProcessor.covered_slots). Khối không nằm trọn trong buổi, hoặc khi không có
+    processed_data, chỉ được tính ở slot bắt đầu.
+    """
+    day, slot_id = gene['day'], gene['slot_id']
+    count = gene.get('count', 1)
+    if count > 1 and processed_data is not None:
+        slots = processed_data.covered_slots(slot_id, count)
+        if slots is not None:
+            return [(day, s) for s in slots]
+    return [(day, slot_id)]
+
+
+class SlotOccupancy:
+    """
+    Bảng (day, slot_id) -> số tiết đang chiếm cho từng tài nguyên.
+    Sao chép khi ghi: copy() chỉ sao chép dict ngoài, bảng của từng tài nguyên
+    được dùng chung cho đến khi một trong hai bản ghi vào nó.
+    """
+    def __init__(self, slots=None):
+        self._slots = slots if slots is not None else {}
+        self._owned = set()
+
+    def __getitem__(self, resource_id):
+        # Kết quả chỉ dùng để kiểm tra `(day, slot_id) in ...`, không được ghi vào
+        return self._slots.get(resource_id, _EMPTY)
+
+    def add(self, resource_id, day_slot):
+        slots = self._writable(resource_id)
+        slots[day_slot] = slots.get(day_slot, 0) + 1
+
+    def discard(self, resource_id, day_slot):
+        if day_slot not in self._slots.get(resource_id, _EMPTY):
+            return
+        slots = self._writable(resource_id)
+        if slots[day_slot] <= 1:
+            del slots[day_slot]
+        else:
+            slots[day_slot] -= 1
+
+    def copy(self):
+        # Cả bản gốc lẫn bản sao đều mất quyền ghi trực tiếp vào các bảng dùng chung
+        self._owned = set()
+        return SlotOccupancy(self._slots.copy())
+
+    def _writable(self, resource_id):
+        if resource_id not in self._owned:
+            self._slots[resource_id] = dict(self._slots.get(resource_id, _EMPTY))
+            self._owned.add(resource_id)
+        return self._slots[resource_id]
+
+
+class ResourceOccupancy:
+    """
+    Các slot đã dùng theo giảng viên, phòng và lớp của một nhiễm sắc thể. processed_data cho
+    biết các slot mà khối nhiều tiết chiếm (xem gene_day_slots).
+    """
+    def __init__(self, lecturers=None, rooms=None, classes=None, processed_data=None):
+        self.lecturers = lecturers if lecturers is not None else SlotOccupancy()
+        self.rooms = rooms if rooms is not None else SlotOccupancy()
+        self.classes = classes if classes is not None else SlotOccupancy()
+        self.processed_data = processed_data
+
+    @classmethod
+    def from_genes(cls, genes, processed_data=None):
+        occupancy = cls(processed_data=processed_data)
+        for gene in genes:
+            occupancy.add_gene(gene)
+        return occupancy
+
+    @staticmethod
+    def is_placed(gene):
+        return all([gene.get('day'), gene.get('slot_id'), gene.get('lecturer_id'), gene.get('room_id')])
+
+    def day_slots(self, gene):
+        return gene_day_slots(gene, self.processed_data)
+
+    def add_gene(self, gene):
+        if self.is_placed(gene):
+            for day_slot in self.day_slots(gene):
+                self.lecturers.add(gene['lecturer_id'], day_slot)
+                self.rooms.add(gene['room_id'], day_slot)
+                self.classes.add(gene['class_id'], day_slot)
+
+    def remove_gene(self, gene):
+        if self.is_placed(gene):
+            for day_slot in self.day_slots(gene):
+                self.lecturers.discard(gene['lecturer_id'], day_slot)
+                self.rooms.discard(gene['room_id'], day_slot)
+                self.classes.discard(gene['class_id'], day_slot)
+
+    def replace_gene(self, old_gene, new_gene):
+        self.remove_gene(old_gene)
+        self.add_gene(new_gene)
+
+    def copy(self):
+        return ResourceOccupancy(self.lecturers.copy(), self.rooms.copy(), self.classes.copy(), self.processed_data)
+
+
+def get_occupancy(chromosome, processed_data=None):
+    """Trả về bảng chiếm dụng của nhiễm sắc thể, tạo (một lần) nếu chưa có."""
+    if chromosome.occupancy is None:
+        chromosome.occupancy = ResourceOccupancy.from_genes(chromosome.genes, processed_data)
+    return chromosome.occupancy
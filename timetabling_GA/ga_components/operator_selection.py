@@ -0,0 +1,102 @@
+# timetable_ga/ga_components/operator_selection.py
+import random
+
+
+class AdaptivePursuit:
+    """
+    Chọn toán tử theo Adaptive Pursuit: mỗi toán tử có ước lượng chất lượng Q (trung bình
+    mũ của phần thưởng) và xác suất được chọn; toán tử có Q cao nhất được kéo dần xác suất
+    về p_max, các toán tử khác về p_min nên không toán tử nào bị loại hẳn.
+    Phần thưởng là mức cải thiện fitness tương đối của cá thể con so với cha/mẹ, chia cho
+    chi phí thời gian tương đối của toán tử (cải thiện trên một đơn vị CPU).
+    """
+    def __init__(self, operators, p_min=0.05, alpha=0.3, beta=0.3):
+        self.operators = list(operators)
+        count = len(self.operators)
+        self.p_min = min(p_min, 1.0 / count)
+        self.p_max = 1.0 - (count - 1) * self.p_min
+        self.alpha = alpha
+        self.beta = beta
+
+        self.probabilities = {name: 1.0 / count for name in self.operators}
+        self.quality = {name: 0.0 for name in self.operators}
+        self._stats = {
+            name: {"calls": 0, "time_seconds": 0.0, "children": 0, "improvements": 0, "gain": 0.0}
+            for name in self.operators
+        }
+
+    def __contains__(self, name):
+        return name in self.probabilities
+
+    def select(self):
+        if len(self.operators) == 1:
+            return self.operators[0]
+        return random.choices(self.operators, weights=[self.probabilities[name] for name in self.operators])[0]
+
+    def record_call(self, name, seconds):
+        """Ghi nhận một lần gọi toán tử và thời gian chạy của nó."""
+        stats = self._stats[name]
+        stats["calls"] += 1
+        stats["time_seconds"] += seconds
+
+    def _cost_ratio(self, name):
+        # Thời gian trung bình mỗi lần gọi của toán tử so với trung bình của cả nhóm
+        stats = self._stats[name]
+        total_calls = sum(s["calls"] for s in self._stats.values())
+        total_time = sum(s["time_seconds"] for s in self._stats.values())
+        if not stats["calls"] or not total_time:
+            return 1.0
+        return max((stats["time_seconds"] / stats["calls"]) / (total_time / total_calls), 1e-3)
+
+    def credit(self, name, gain):
+        """Cập nhật Q và xác suất sau khi biết fitness của một cá thể con mà toán tử đã tạo ra."""
+        stats = self._stats[name]
+        stats["children"] += 1
+        if gain > 0:
+            stats["improvements"] += 1
+            stats["gain"] += gain
+
+        reward = max(gain, 0.0) / self._cost_ratio(name)
+        self.quality[name] += self.alpha * (reward - self.quality[name])
+
+        # Khi mọi Q bằng nhau (vd. đều 0 vì chưa có cá thể con nào cải thiện) thì chưa có
+        # bằng chứng để dồn xác suất; các toán tử cùng Q cao nhất được chọn ngẫu nhiên
+        best_quality = max(self.quality.values())
+        leaders = [op for op in self.operators if self.quality[op] == best_quality]
+        if len(self.operators) > 1 and len(leaders) < len(self.operators):
+            leader = leaders[0] if len(leaders) == 1 else random.choice(leaders)
+            for op in self.operators:
+                target = self.p_max if op == leader else self.p_min
+                self.probabilities[op] += self.beta * (target - self.probabilities[op])
+
+    def stats(self):
+        """Thống kê theo toán tử cho ga_log_data và sự kiện GA_PROGRESS."""
+        return {
+            name: {
+                "probability": round(self.probabilities[name], 4),
+                "calls": stats["calls"],
+                "time_seconds": round(stats["time_seconds"], 4),
+                "children": stats["children"],
+                "improvements": stats["improvements"],
+                "improvement_rate": round(stats["improvements"] / stats["children"], 4) if stats["children"] else 0.0,
+                "gain": round(stats["gain"], 6)
+            }
+            for name, stats in self._stats.items()
+        }
+
+
+def credit_offspring(offspring, selectors):
+    """
+    Chia phần thưởng cho các toán tử đã tạo ra mỗi cá thể con (đã có fitness).
+    gain là mức cải thiện tương đối so với cha/mẹ; mỗi cá thể chỉ được tính một lần.
+    """
+    for child in offspring:
+        parent_fitness = getattr(child, 'parent_fitness', None)
+        if parent_fitness is None:
+            continue
+        gain = (child.fitness - parent_fitness) / max(abs(parent_fitness), 1.0)
+        for name in child.operators:
+            for selector in selectors:
+                if name in selector:
+                    selector.credit(name, gain)
+        child.parent_fitness = None
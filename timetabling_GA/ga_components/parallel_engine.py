@@ -0,0 +1,177 @@
+# timetable_ga/ga_components/parallel_engine.py
+import random
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+from config import TARGETED_MUTATION
+from .array_chromosome import GeneEncoder, ArrayChromosome
+from .chromosome import create_initial_chromosome
+from .evolution import breed_offspring
+from .fitness import FitnessCalculator
+from .selection import tournament_selection
+
+# Ngữ cảnh của từng tiến trình con, được tạo một lần bởi _init_worker
+_worker = {}
+
+
+def _init_worker(processed_data):
+    """Dữ liệu bài toán chỉ đọc: dựng một lần cho mỗi tiến trình con."""
+    # Ctrl+C do tiến trình chính xử lý (dừng sau thế hệ hiện tại), worker không bị ngắt giữa chừng
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker['processed_data'] = processed_data
+    _worker['encoder'] = GeneEncoder(processed_data)
+    _worker['fitness_calculator'] = FitnessCalculator(processed_data)
+    _worker['blocks'] = {}
+
+
+def _attach(name):
+    """Mở (và giữ lại) một khối bộ nhớ dùng chung theo tên; tiến trình chính sở hữu và giải phóng khối."""
+    blocks = _worker['blocks']
+    if name not in blocks:
+        try:
+            blocks[name] = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13 không có tham số track; worker dùng chung resource_tracker với tiến trình chính
+            blocks[name] = shared_memory.SharedMemory(name=name)
+    return blocks[name]
+
+
+def _array_view(name, shape, dtype):
+    return np.ndarray(shape, dtype=dtype, buffer=_attach(name).buf)
+
+
+def _write_chunk(task, children):
+    """Chấm điểm các con theo lô và ghi ma trận gán + fitness vào vùng đầu ra."""
+    encoder = _worker['encoder']
+    fitness_values = _worker['fitness_calculator'].calculate_population_fitness(children)
+    out_genes = _array_view(task['out_genes'], (task['out_capacity'], 4, encoder.num_lessons), np.int16)
+    out_fitness = _array_view(task['out_fitness'], (task['out_capacity'],), np.float64)
+    start = task['start']
+    for offset, child in enumerate(children):
+        out_genes[start + offset] = (
+            child.assignment if isinstance(child, ArrayChromosome) else encoder.encode_genes(child.genes)
+        )
+    out_fitness[start:start + len(children)] = fitness_values
+
+
+def _seed_task(task):
+    # Dòng số ngẫu nhiên xác định theo (seed, thế hệ, chỉ số khối)
+    random.seed(f"{task['seed']}:{task['generation']}:{task['chunk']}")
+
+
+def _initialize_chunk(task):
+    _seed_task(task)
+    processed_data = _worker['processed_data']
+    children = [create_initial_chromosome(processed_data) for _ in range(task['count'])]
+    _write_chunk(task, children)
+    return task['chunk']
+
+
+def _breed_chunk(task):
+    _seed_task(task)
+    encoder = _worker['encoder']
+    parent_genes = _array_view(task['in_genes'], (task['in_size'], 4, encoder.num_lessons), np.int16)
+    parent_fitness = _array_view(task['in_fitness'], (task['in_size'],), np.float64)
+
+    # Chỉ giải mã các cha mẹ thực sự được chọn
+    candidates = [ArrayChromosome(encoder, parent_genes[i], parent_fitness[i]) for i in range(task['in_size'])]
+    decoded = {}
+
+    def select_parent():
+        winner = tournament_selection(candidates)
+        if id(winner) not in decoded:
+            decoded[id(winner)] = winner.to_chromosome()
+        return decoded[id(winner)]
+
+    children = breed_offspring(
+        candidates, task['count'], _worker['processed_data'],
+        task['mutation_rate'], task['crossover_rate'], select_parent=select_parent,
+        conflict_finder=_worker['fitness_calculator'].conflicting_positions if TARGETED_MUTATION else None
+    )
+    _write_chunk(task, children)
+    return task['chunk']
+
+
+class ParallelGenerationEngine:
+    """
+    Chạy khởi tạo, chọn lọc, lai ghép, đột biến và tính fitness của mỗi thế hệ
+    trên nhiều tiến trình. Quần thể được trao đổi qua multiprocessing.shared_memory
+    dưới dạng ma trận int16 (xem ArrayChromosome) thay vì pickle các gen dạng dict.
+    Kết quả tái lập được với cùng seed và cùng số worker.
+    """
+    def __init__(self, processed_data, num_workers, capacity, seed=None, generation=0):
+        self.processed_data = processed_data
+        self.encoder = GeneEncoder(processed_data)
+        self.num_workers = num_workers
+        self.capacity = capacity
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        # Số lần tạo quần thể đã thực hiện (lưu vào checkpoint để tiếp tục cùng dòng số ngẫu nhiên)
+        self.generation = generation
+
+        num_lessons = self.encoder.num_lessons
+        genes_bytes = max(1, capacity * 4 * num_lessons * np.dtype(np.int16).itemsize)
+        fitness_bytes = max(1, capacity * np.dtype(np.float64).itemsize)
+        # Vùng 0: quần thể cha mẹ (và quần thể ban đầu), vùng 1: các con được tạo ra
+        self._blocks = [
+            (shared_memory.SharedMemory(create=True, size=genes_bytes),
+             shared_memory.SharedMemory(create=True, size=fitness_bytes))
+            for _ in range(2)
+        ]
+        self._executor = ProcessPoolExecutor(
+            max_workers=num_workers, initializer=_init_worker, initargs=(processed_data,)
+        )
+
+    def _views(self, index):
+        genes_block, fitness_block = self._blocks[index]
+        genes = np.ndarray((self.capacity, 4, self.encoder.num_lessons), dtype=np.int16, buffer=genes_block.buf)
+        fitness = np.ndarray((self.capacity,), dtype=np.float64, buffer=fitness_block.buf)
+        return genes, fitness
+
+    def _run(self, function, count, out_index, extra):
+        # Chia đều số cá thể cần tạo thành num_workers khối cố định
+        chunk_sizes = [count // self.num_workers + (1 if i < count % self.num_workers else 0)
+                       for i in range(self.num_workers)]
+        genes_block, fitness_block = self._blocks[out_index]
+        tasks, start = [], 0
+        for chunk, size in enumerate(chunk_sizes):
+            if size == 0:
+                continue
+            task = {
+                'chunk': chunk, 'start': start, 'count': size, 'seed': self.seed,
+                'generation': self.generation, 'out_capacity': self.capacity,
+                'out_genes': genes_block.name, 'out_fitness': fitness_block.name
+            }
+            task.update(extra)
+            tasks.append(task)
+            start += size
+        list(self._executor.map(function, tasks))
+        self.generation += 1
+
+        genes, fitness = self._views(out_index)
+        # Sao chép ra khỏi vùng dùng chung vì vùng này sẽ bị ghi đè ở thế hệ sau
+        return [ArrayChromosome(self.encoder, genes[i].copy(), float(fitness[i])) for i in range(count)]
+
+    def initialize(self, count):
+        """Tạo và chấm điểm quần thể ban đầu song song."""
+        return self._run(_initialize_chunk, count, 0, {})
+
+    def breed(self, population, count, mutation_rate, crossover_rate):
+        """Tạo `count` cá thể con (đã có fitness) từ quần thể hiện tại."""
+        in_genes, in_fitness = self._views(0)
+        for i, chrom in enumerate(population):
+            in_genes[i] = chrom.assignment if isinstance(chrom, ArrayChromosome) else self.encoder.encode_genes(chrom.genes)
+            in_fitness[i] = chrom.fitness
+        in_genes_block, in_fitness_block = self._blocks[0]
+        return self._run(_breed_chunk, count, 1, {
+            'in_genes': in_genes_block.name, 'in_fitness': in_fitness_block.name, 'in_size': len(population),
+            'mutation_rate': mutation_rate, 'crossover_rate': crossover_rate
+        })
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        for genes_block, fitness_block in self._blocks:
+            for block in (genes_block, fitness_block):
+                block.close()
+                block.unlink()
@@ -1,6 +1,24 @@
 # timetable_ga/ga_components/population.py
-from .chromosome import create_random_chromosome
+from .chromosome import create_initial_chromosome
+from .fitness_cache import chromosome_key
 
 def initialize_population(size, processed_data):
-    """Initializes a population of random chromosomes."""
-    return [create_random_chromosome(processed_data) for _ in range(size)]
\ No newline at end of file
+    """Initializes a population of new chromosomes (greedy or random, see GREEDY_INIT_RATE)."""
+    return [create_initial_chromosome(processed_data) for _ in range(size)]
+
+def deduplicate_population(population, processed_data):
+    """
+    Thay các cá thể trùng lặp hoàn toàn (cùng khóa cấu trúc) bằng cá thể mới.
+    Cá thể xuất hiện đầu tiên được giữ lại, nên các cá thể ưu tú ở đầu danh sách không bị thay.
+    Trả về số cá thể đã bị thay.
+    """
+    seen_keys = set()
+    replaced = 0
+    for i, chromosome in enumerate(population):
+        key = chromosome_key(chromosome)
+        if key in seen_keys:
+            population[i] = create_initial_chromosome(processed_data)
+            replaced += 1
+        else:
+            seen_keys.add(key)
+    return replaced
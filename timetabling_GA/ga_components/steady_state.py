@@ -0,0 +1,73 @@
+# timetable_ga/ga_components/steady_state.py
+import bisect
+import random
+from collections import Counter
+
+from .fitness_cache import chromosome_key
+
+
+class SteadyStatePopulation:
+    """
+    Quần thể cho GA trạng thái ổn định: các cá thể luôn được giữ theo thứ tự fitness tăng dần
+    (vị trí 0 là cá thể kém nhất) nên không cần sắp xếp lại cả quần thể. Mỗi cá thể con chỉ
+    thay cá thể kém nhất nếu tốt hơn và chưa có trong quần thể (theo khóa cấu trúc).
+    """
+    def __init__(self, chromosomes):
+        ordered = sorted(chromosomes, key=lambda c: c.fitness)
+        self.chromosomes = ordered
+        self._fitness = [c.fitness for c in ordered]
+        # Đếm số bản sao của mỗi khóa: quần thể ban đầu (hoặc cá thể khởi động lại) có thể trùng nhau
+        self._keys = Counter(chromosome_key(c) for c in ordered)
+
+    def __len__(self):
+        return len(self.chromosomes)
+
+    @property
+    def best(self):
+        return self.chromosomes[-1]
+
+    @property
+    def worst(self):
+        return self.chromosomes[0]
+
+    def tournament_selection(self, k=3):
+        """Chọn lọc giải đấu: danh sách đã sắp xếp nên cá thể thắng là chỉ số lớn nhất được rút."""
+        n = len(self.chromosomes)
+        return self.chromosomes[max(random.randrange(n) for _ in range(k))]
+
+    def _remove_key(self, key):
+        self._keys[key] -= 1
+        if self._keys[key] <= 0:
+            del self._keys[key]
+
+    def replace_worst(self, chromosome):
+        """
+        Thay cá thể kém nhất bằng chromosome nếu nó tốt hơn và không trùng lặp.
+        Trả về True nếu cá thể được nhận vào quần thể.
+        """
+        if chromosome.fitness <= self._fitness[0]:
+            return False
+        key = chromosome_key(chromosome)
+        if key in self._keys:
+            return False
+
+        removed = self.chromosomes.pop(0)
+        self._fitness.pop(0)
+        self._remove_key(chromosome_key(removed))
+
+        position = bisect.bisect_right(self._fitness, chromosome.fitness)
+        self._fitness.insert(position, chromosome.fitness)
+        self.chromosomes.insert(position, chromosome)
+        self._keys[key] += 1
+        return True
+
+    def replace_worst_many(self, chromosomes):
+        """Thay len(chromosomes) cá thể kém nhất, kể cả khi cá thể mới kém hơn (khởi động lại một phần)."""
+        for _ in range(min(len(chromosomes), len(self.chromosomes) - 1)):
+            self._remove_key(chromosome_key(self.chromosomes.pop(0)))
+            self._fitness.pop(0)
+        for chromosome in chromosomes:
+            position = bisect.bisect_right(self._fitness, chromosome.fitness)
+            self._fitness.insert(position, chromosome.fitness)
+            self.chromosomes.insert(position, chromosome)
+            self._keys[chromosome_key(chromosome)] += 1
@@ -0,0 +1,71 @@
+# timetable_ga/ga_components/symmetry.py
+from config import CANONICAL_GROUP_ORDER
+
+
+class InterchangeableGroups:
+    """
+    Các nhóm tiết học hoán đổi được cho nhau: các tiết cùng group_id (cùng lớp, môn, loại tiết,
+    học kỳ) và cùng độ dài khối (count) chỉ khác nhau ở lesson_id, nên hoán vị các phép gán
+    (day, slot, phòng, giảng viên) giữa chúng vẫn là cùng một thời khóa biểu. positions[k] là
+    các vị trí (theo thứ tự required_lessons_weekly) của nhóm thứ k; chỉ giữ các nhóm có từ
+    hai tiết trở lên.
+    """
+    def __init__(self, processed_data):
+        by_group = {}
+        for position, lesson in enumerate(processed_data.required_lessons_weekly):
+            by_group.setdefault((lesson['group_id'], lesson.get('count', 1)), []).append(position)
+        self.positions = [positions for positions in by_group.values() if len(positions) > 1]
+
+        # Thứ tự thời gian trong tuần: slot chưa gán (None) đứng cuối
+        days = processed_data.data['days_of_week']
+        slots = processed_data.data['time_slots']
+        self._day_order = {day: i for i, day in enumerate(days)}
+        self._slot_order = {slot['slot_id']: i for i, slot in enumerate(slots)}
+        self._unassigned = (len(days), len(slots))
+
+    def sort_key(self, gene):
+        day = self._day_order.get(gene.get('day'), self._unassigned[0])
+        slot = self._slot_order.get(gene.get('slot_id'), self._unassigned[1])
+        return day, slot, gene.get('room_id') or '', gene.get('lecturer_id') or ''
+
+
+def get_interchangeable_groups(processed_data):
+    """InterchangeableGroups của học kỳ, tạo ở lần gọi đầu và lưu lại trên processed_data."""
+    groups = getattr(processed_data, '_interchangeable_groups', None)
+    if groups is None:
+        groups = InterchangeableGroups(processed_data)
+        processed_data._interchangeable_groups = groups
+    return groups
+
+
+def canonicalize(chromosome, processed_data):
+    """
+    Đưa nhiễm sắc thể về dạng chuẩn: trong mỗi nhóm tiết hoán đổi được, các phép gán được sắp
+    theo (day, slot) rồi gán lại cho các vị trí của nhóm theo thứ tự. Các hoán vị của cùng một
+    thời khóa biểu vì vậy trở thành một cá thể duy nhất, và lai ghép theo vị trí ghép đúng các
+    tiết tương ứng của hai cha mẹ.
+
+    Sửa trực tiếp danh sách gen (gen thay đổi được thay bằng bản sao, gen cũ có thể đang dùng
+    chung). Tập các tiết đã xếp không đổi nên fitness, FitnessState, bảng chiếm dụng và khóa cấu
+    trúc (xem chromosome_key) vẫn đúng. Trả về chính chromosome.
+    """
+    if not CANONICAL_GROUP_ORDER:
+        return chromosome
+    genes = chromosome.genes
+    groups = get_interchangeable_groups(processed_data)
+    if len(genes) != len(processed_data.required_lessons_weekly):
+        return chromosome
+
+    sort_key = groups.sort_key
+    for positions in groups.positions:
+        members = [genes[position] for position in positions]
+        ordered = sorted(members, key=sort_key)
+        if all(gene is member for gene, member in zip(ordered, members)):
+            continue
+        for position, member, gene in zip(positions, members, ordered):
+            if gene is not member:
+                genes[position] = dict(
+                    member, day=gene.get('day'), slot_id=gene.get('slot_id'),
+                    room_id=gene.get('room_id'), lecturer_id=gene.get('lecturer_id')
+                )
+    return chromosome
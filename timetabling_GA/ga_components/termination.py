@@ -0,0 +1,99 @@
+# timetable_ga/ga_components/termination.py
+import time
+
+# Lý do dừng được báo trong sự kiện GA_PROGRESS
+REASON_MAX_GENERATIONS = "max_generations"
+REASON_TIME_BUDGET = "time_budget"
+REASON_STAGNATION = "stagnation"
+REASON_FEASIBLE = "feasible_solution"
+REASON_STOP_REQUESTED = "stop_requested"
+
+
+class TerminationPolicy:
+    """
+    Quyết định khi nào dừng vòng lặp tiến hóa: hết số thế hệ, hết thời gian cho
+    học kỳ, không cải thiện sau N thế hệ (hoặc cải thiện tương đối dưới epsilon),
+    hoặc đã tìm được lời giải không vi phạm ràng buộc cứng.
+    stop_requested là hàm không tham số trả về True khi người dùng yêu cầu dừng
+    (tín hiệu, file dừng, lệnh "stop" từ stdin).
+    progress_listener(generation, best_fitness, is_feasible) được gọi ở mỗi lần check(),
+    ví dụ để bộ chạy portfolio so sánh các lượt chạy song song.
+    """
+    def __init__(self, max_generations, time_budget_seconds=None, stagnation_generations=None,
+                 stagnation_epsilon=0.0, stop_on_feasible=False, stop_requested=None, progress_listener=None):
+        self.max_generations = max_generations
+        self.time_budget_seconds = time_budget_seconds
+        self.stagnation_generations = stagnation_generations
+        self.stagnation_epsilon = stagnation_epsilon
+        self.stop_on_feasible = stop_on_feasible
+        self.stop_requested = stop_requested
+        self.progress_listener = progress_listener
+
+        self.start_time = time.time()
+        self.reason = None
+        self._reference_fitness = None
+        self._last_improvement_generation = 0
+
+    @property
+    def elapsed_seconds(self):
+        return time.time() - self.start_time
+
+    def interrupted(self):
+        """Kiểm tra nhanh (không cập nhật trạng thái) giữa các bước nhỏ: có yêu cầu dừng hoặc đã hết thời gian."""
+        if self.stop_requested is not None and self.stop_requested():
+            return True
+        return self.time_budget_seconds is not None and self.elapsed_seconds >= self.time_budget_seconds
+
+    def check(self, generation, best_fitness, is_feasible=False):
+        """
+        Gọi một lần mỗi thế hệ (generation bắt đầu từ 0) với fitness tốt nhất từ trước đến nay.
+        Trả về lý do dừng, hoặc None nếu tiếp tục.
+        """
+        if self.progress_listener is not None:
+            self.progress_listener(generation, best_fitness, is_feasible)
+
+        # Chỉ tính là cải thiện khi tăng vượt epsilon (tương đối so với fitness tham chiếu)
+        if self._reference_fitness is None:
+            self._reference_fitness = best_fitness
+        else:
+            threshold = self.stagnation_epsilon * max(abs(self._reference_fitness), 1.0)
+            if best_fitness - self._reference_fitness > threshold:
+                self._reference_fitness = best_fitness
+                self._last_improvement_generation = generation
+
+        if self.stop_requested is not None and self.stop_requested():
+            self.reason = REASON_STOP_REQUESTED
+        elif self.stop_on_feasible and is_feasible:
+            self.reason = REASON_FEASIBLE
+        elif self.time_budget_seconds is not None and self.elapsed_seconds >= self.time_budget_seconds:
+            self.reason = REASON_TIME_BUDGET
+        elif (self.stagnation_generations is not None
+              and generation - self._last_improvement_generation >= self.stagnation_generations):
+            self.reason = REASON_STAGNATION
+        elif generation >= self.max_generations - 1:
+            self.reason = REASON_MAX_GENERATIONS
+        return self.reason
+
+    def state(self):
+        """Trạng thái cần lưu vào checkpoint để tiếp tục đếm trì trệ và thời gian đã dùng."""
+        return {
+            "elapsed_seconds": self.elapsed_seconds,
+            "reference_fitness": self._reference_fitness,
+            "last_improvement_generation": self._last_improvement_generation
+        }
+
+    def restore(self, state):
+        """Khôi phục từ state(); các khóa thiếu giữ giá trị hiện tại."""
+        self.start_time = time.time() - state.get("elapsed_seconds", self.elapsed_seconds)
+        self._reference_fitness = state.get("reference_fitness", self._reference_fitness)
+        self._last_improvement_generation = state.get("last_improvement_generation", self._last_improvement_generation)
+
+    def summary(self):
+        """Thông tin dừng được đưa vào sự kiện GA_PROGRESS và ga_log_data."""
+        return {
+            "reason": self.reason,
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+            "time_budget_seconds": self.time_budget_seconds,
+            "stagnation_generations": self.stagnation_generations,
+            "last_improvement_generation": self._last_improvement_generation
+        }
@@ -1,22 +1,32 @@
 import sys
 import os
+import argparse
 import json
 from typing import Dict, Any
 
 # Import main components
 from data_processing.loader import load_data
 from data_processing.processor import DataProcessor
-from utils.run_ga_for_semester import run_ga_for_semester
+from utils.solve_semester import solve_semester
+from utils.run_portfolio import run_portfolio
 from utils.export_combined_results import export_combined_results
+from utils.stop_controller import StopController
+from config import STOP_FILE_NAME, WATCH_STDIN_FOR_STOP, PORTFOLIO
 
 
-def genetic_algorithm():
+def genetic_algorithm(resume: bool = False, portfolio: bool = PORTFOLIO):
     """
     Main function to run the genetic algorithm for creating semester schedules.
     The process includes:
     1. Loading and processing input data.
-    2. Running the GA separately for each semester.
+    2. Running the configured solver (SOLVER, the GA by default) separately for each semester.
     3. Consolidating and exporting the final results.
+    A stop request (SIGTERM/SIGINT, the stop file in the results folder or "stop" on stdin)
+    ends the current semester after its current generation; semesters not started yet are
+    skipped and the schedules found so far are still exported.
+    With resume=True each semester continues from its latest checkpoint, if any.
+    With portfolio=True each semester races the PORTFOLIO_CONFIGS configurations in parallel
+    processes and keeps the best schedule (checkpoints are not used in this mode).
     """
     print("Loading data...")
     # Load data from a JSON file
@@ -34,14 +44,26 @@ def genetic_algorithm():
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
 
+    stop_controller = StopController(
+        stop_file=os.path.join(output_folder, STOP_FILE_NAME), watch_stdin=WATCH_STDIN_FOR_STOP
+    ).install()
+
     all_semester_results = {}
     
     # Run GA for each semester
     for semester_id, semester_info in processed_data.semester_map.items():
+        if stop_controller.requested:
+            print(f"\nStop requested: skipping semester {semester_id}.")
+            continue
+
         print(f"\n--- Starting to generate schedule for Semester: {semester_id} ---")
         
-        # Run the genetic algorithm and get the best chromosome and log
-        best_chromosome, ga_log = run_ga_for_semester(semester_id, processed_data)
+        # Run the configured solver (GA by default), or race several configurations,
+        # and get the best chromosome and log
+        if portfolio:
+            best_chromosome, ga_log = run_portfolio(semester_id, processed_data, stop_controller)
+        else:
+            best_chromosome, ga_log = solve_semester(semester_id, processed_data, stop_controller, resume=resume)
         
         if best_chromosome:
             # Save the best result and log for each semester
@@ -58,6 +80,10 @@ def genetic_algorithm():
     if all_semester_results:
         print("\n--- Consolidating and exporting results ---")
         export_combined_results(all_semester_results, processed_data, output_folder)
+
+    stop_controller.uninstall()
+    if stop_controller.requested:
+        print(f"\nGA_STOPPED:{stop_controller.reason}")
         
     print("\nGA_PROGRESS_DONE")
     # Ensure all output is flushed to the console
@@ -67,4 +93,12 @@ if __name__ == "__main__":
     # Ensure the results folder exists before running
     if not os.path.exists("results"):
         os.makedirs("results")
-    genetic_algorithm()
\ No newline at end of file
+
+    # The backend passes positional directories that are not used here; only known flags are parsed
+    parser = argparse.ArgumentParser(description="Generate semester timetables with a genetic algorithm.")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue each semester from its latest checkpoint in the results folder")
+    parser.add_argument("--portfolio", action="store_true",
+                        help="race the PORTFOLIO_CONFIGS configurations in parallel for each semester")
+    args, _ = parser.parse_known_args()
+    genetic_algorithm(resume=args.resume, portfolio=args.portfolio or PORTFOLIO)
\ No newline at end of file
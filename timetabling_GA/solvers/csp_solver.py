@@ -0,0 +1,80 @@
+from typing import Dict, Any, List, Optional, Tuple
+
+from config import CSP_TIME_LIMIT, CSP_SOFT_SOLVER
+from ga_components.chromosome import Chromosome
+from ga_components.csp import BacktrackingSolver, CSP_FEASIBLE
+from ga_components.fitness import FitnessCalculator
+from solvers.simulated_annealing import run_simulated_annealing
+from solvers.tabu_search import run_tabu_search
+from utils.run_generational_ga import run_generational_ga
+from utils.stop_controller import StopController
+from data_processing.processor import DataProcessor
+
+# Engines that can continue from the CSP schedule to optimize the soft constraints
+SOFT_SOLVERS = {
+    "ga": run_generational_ga,
+    "simulated_annealing": run_simulated_annealing,
+    "tabu_search": run_tabu_search
+}
+
+
+def run_csp(processed_data: DataProcessor, semester_id: str, semester_info: Dict[str, Any],
+            stop_controller: Optional[StopController] = None
+            ) -> Tuple[Optional[Chromosome], List[Dict[str, Any]]]:
+    """
+    Two-phase solver: BacktrackingSolver first looks for a schedule with no hard violations
+    (or proves there is none) within CSP_TIME_LIMIT seconds, then CSP_SOFT_SOLVER improves the
+    soft constraints starting from that schedule ("ga" seeds the initial population of the
+    generational GA with it, whatever GA_MODE is). When the CSP search proves infeasibility, runs
+    out of time or cannot decide (CSP_UNKNOWN, with bundled lesson blocks), the soft solver
+    starts from its usual initial schedule or population instead.
+    The CSP outcome is stored under "csp" in the first ga_log_data entry.
+
+    Args:
+        processed_data (DataProcessor): Semester-filtered data processor.
+        semester_id (str): The ID of the semester being scheduled.
+        semester_info (Dict[str, Any]): Semester summary passed to display_ga_progress.
+        stop_controller (Optional[StopController]): Ends either phase early.
+
+    Returns:
+        Tuple[Optional[Chromosome], List[Dict[str, Any]]]: The best chromosome and the log data.
+    """
+    if CSP_SOFT_SOLVER is not None and CSP_SOFT_SOLVER not in SOFT_SOLVERS:
+        raise ValueError(f"Unknown CSP_SOFT_SOLVER '{CSP_SOFT_SOLVER}', expected None or one of {sorted(SOFT_SOLVERS)}.")
+
+    csp_solver = BacktrackingSolver(
+        processed_data, CSP_TIME_LIMIT,
+        should_stop=(lambda: stop_controller.requested) if stop_controller is not None else None
+    )
+    status, schedule = csp_solver.solve()
+    csp_stats = {
+        "status": status,
+        "seconds": round(csp_solver.elapsed_seconds, 3),
+        "nodes": csp_solver.nodes,
+        "backjumps": csp_solver.backjumps
+    }
+    print(f"CSP for semester {semester_id}: {status} after {csp_stats['seconds']}s "
+          f"({csp_stats['nodes']} nodes, {csp_stats['backjumps']} backjumps)")
+
+    if CSP_SOFT_SOLVER is None or (stop_controller is not None and stop_controller.requested):
+        if schedule is not None:
+            fitness, violations = FitnessCalculator(processed_data).calculate_fitness(schedule)
+            return schedule, [{
+                "generation": 1,
+                "best_fitness_gen": fitness,
+                "best_overall_fitness": fitness,
+                "current_violations": violations,
+                "csp": csp_stats
+            }]
+        if CSP_SOFT_SOLVER is None:
+            return None, [{"generation": 0, "csp": csp_stats}]
+
+    best, ga_log_data = SOFT_SOLVERS[CSP_SOFT_SOLVER](
+        processed_data, semester_id, semester_info, stop_controller,
+        initial=schedule if status == CSP_FEASIBLE else None
+    )
+    if ga_log_data:
+        ga_log_data[0]["csp"] = csp_stats
+    else:
+        ga_log_data.append({"generation": 0, "csp": csp_stats})
+    return best, ga_log_data
@@ -0,0 +1,205 @@
+import math
+import random
+from typing import Dict, Any, List, Optional, Tuple
+
+from config import (
+    SA_MAX_ITERATIONS, SA_ITERATIONS_PER_TEMPERATURE, SA_INITIAL_TEMPERATURE, SA_FINAL_TEMPERATURE,
+    SA_COOLING_SCHEDULE, SA_CONFLICT_BIAS, TIME_BUDGET_SECONDS, STAGNATION_GENERATIONS, STAGNATION_EPSILON,
+    STOP_ON_FEASIBLE
+)
+from ga_components.chromosome import Chromosome, create_initial_chromosome
+from ga_components.fitness import FitnessCalculator
+from ga_components.mutation import MUTATION_OPERATORS
+from ga_components.termination import TerminationPolicy
+from solvers.solution_state import SolutionState
+from utils.display_ga_progress import display_ga_progress
+from utils.stop_controller import StopController
+from data_processing.processor import DataProcessor
+
+COOLING_SCHEDULES = ("geometric", "linear", "lundy_mees")
+
+# Stop requests and the time budget are checked every this many moves
+_INTERRUPT_CHECK_INTERVAL = 100
+
+
+def temperature_at(schedule: str, initial: float, final: float, step: int, steps: int) -> float:
+    """
+    Temperature of a cooling schedule at a given step; every schedule starts at `initial`
+    and reaches `final` at the last step.
+
+    Args:
+        schedule (str): "geometric" (constant ratio), "linear" or "lundy_mees"
+                        (T / (1 + beta * T) per step: fast at first, slow near the end).
+        initial (float): Temperature at step 0.
+        final (float): Temperature at step steps - 1.
+        step (int): Current temperature step.
+        steps (int): Number of temperature steps.
+
+    Returns:
+        float: The temperature for this step.
+    """
+    if steps <= 1:
+        return initial
+    progress = step / (steps - 1)
+    if schedule == "geometric":
+        return initial * (final / initial) ** progress
+    if schedule == "linear":
+        return initial + (final - initial) * progress
+    if schedule == "lundy_mees":
+        beta = (initial - final) / ((steps - 1) * initial * final)
+        return initial / (1 + beta * step * initial)
+    raise ValueError(f"Unknown cooling schedule '{schedule}', expected one of {COOLING_SCHEDULES}.")
+
+
+def estimate_initial_temperature(state: SolutionState, samples: int = 100, acceptance: float = 0.5,
+                                 soft_only: bool = False) -> float:
+    """
+    Picks a starting temperature at which an average worsening move is accepted with
+    probability `acceptance`, from a sample of random moves that are applied and undone.
+
+    Args:
+        state (SolutionState): The starting solution (left unchanged).
+        samples (int): Number of random moves to try.
+        acceptance (float): Target acceptance probability of an average worsening move.
+        soft_only (bool): Only sample moves that leave the hard penalty unchanged, so a
+                          feasible start is not shaken loose by hard-constraint-sized jumps.
+
+    Returns:
+        float: The estimated initial temperature.
+    """
+    worsening = []
+    num_genes = len(state.genes)
+    for _ in range(samples):
+        move = state.propose(random.randrange(num_genes), random.choice(MUTATION_OPERATORS))
+        if not move:
+            continue
+        before, hard_before = state.fitness, state.fitness_state.hard_penalty
+        undo = state.apply(move)
+        delta = state.fitness - before
+        changes_hard = state.fitness_state.hard_penalty != hard_before
+        state.apply(undo)
+        if delta < 0 and not (soft_only and changes_hard):
+            worsening.append(-delta)
+    if not worsening:
+        return 1.0
+    return (sum(worsening) / len(worsening)) / -math.log(acceptance)
+
+
+def run_simulated_annealing(processed_data: DataProcessor, semester_id: str, semester_info: Dict[str, Any],
+                            stop_controller: Optional[StopController] = None,
+                            initial: Optional[Chromosome] = None
+                            ) -> Tuple[Optional[Chromosome], List[Dict[str, Any]]]:
+    """
+    Simulated annealing for one semester: a single schedule is changed in place with the
+    GA's mutation moves (day/slot, room, lecturer, swap, Kempe chain), scored incrementally
+    through FitnessState, and worsening moves are accepted with probability exp(delta / T).
+    The temperature is lowered every SA_ITERATIONS_PER_TEMPERATURE moves following
+    SA_COOLING_SCHEDULE; each temperature step is one "generation" in the progress events
+    and ga_log_data.
+
+    Args:
+        processed_data (DataProcessor): Semester-filtered data processor.
+        semester_id (str): The ID of the semester being scheduled.
+        semester_info (Dict[str, Any]): Semester summary passed to display_ga_progress.
+        stop_controller (Optional[StopController]): Ends the run within a few moves.
+        initial (Optional[Chromosome]): Starting schedule (e.g. a feasible one from the CSP
+                                        solver); create_initial_chromosome when omitted.
+                                        When it has no hard violations the initial temperature
+                                        is estimated from soft-constraint moves only.
+
+    Returns:
+        Tuple[Optional[Chromosome], List[Dict[str, Any]]]: The best chromosome and the log data.
+    """
+    steps = max(1, SA_MAX_ITERATIONS // SA_ITERATIONS_PER_TEMPERATURE)
+    termination = TerminationPolicy(
+        steps, TIME_BUDGET_SECONDS, STAGNATION_GENERATIONS, STAGNATION_EPSILON, STOP_ON_FEASIBLE,
+        stop_requested=(lambda: stop_controller.requested) if stop_controller is not None else None,
+        progress_listener=stop_controller.report_progress if stop_controller is not None else None
+    )
+    fitness_calculator = FitnessCalculator(processed_data)
+    seeded = initial is not None
+    if not seeded:
+        initial = create_initial_chromosome(processed_data)
+    state = SolutionState(initial, fitness_calculator, processed_data)
+    num_genes = len(state.genes)
+
+    initial_temperature = SA_INITIAL_TEMPERATURE or estimate_initial_temperature(
+        state, soft_only=seeded and state.fitness_state.hard_penalty == 0
+    )
+    final_temperature = min(SA_FINAL_TEMPERATURE, initial_temperature)
+
+    best_genes, best_fitness, best_violations = list(state.genes), state.fitness, state.violations()
+    ga_log_data = []
+    iterations = 0
+
+    for step in range(steps):
+        temperature = temperature_at(SA_COOLING_SCHEDULE, initial_temperature, final_temperature, step, steps)
+        # Conflicting genes are refreshed once per temperature step; a stale entry only biases the choice
+        conflicts = state.conflicting_positions()
+        accepted = 0
+        tried = 0
+
+        for move_index in range(SA_ITERATIONS_PER_TEMPERATURE):
+            if move_index % _INTERRUPT_CHECK_INTERVAL == 0 and termination.interrupted():
+                break
+            if conflicts and random.random() < SA_CONFLICT_BIAS:
+                position = random.choice(conflicts)
+            else:
+                position = random.randrange(num_genes)
+            move = state.propose(position, random.choice(MUTATION_OPERATORS))
+            if not move:
+                continue
+
+            tried += 1
+            before = state.fitness
+            undo = state.apply(move)
+            delta = state.fitness - before
+            if delta >= 0 or random.random() < math.exp(delta / temperature):
+                accepted += 1
+                if state.fitness > best_fitness:
+                    best_genes, best_fitness, best_violations = list(state.genes), state.fitness, state.violations()
+            else:
+                state.apply(undo)
+        iterations += tried
+
+        current_violations = state.violations()
+        termination_reason = termination.check(step, best_fitness, sum(best_violations.values()) == 0)
+        acceptance_rate = round(accepted / tried, 4) if tried else 0.0
+
+        display_ga_progress(
+            generation=step,
+            max_generations=steps,
+            current_best_fitness=state.fitness,
+            overall_best_fitness=best_fitness,
+            current_best_violations=current_violations,
+            overall_best_violations=best_violations,
+            semester_info=semester_info,
+            population_stats={
+                "solver": "simulated_annealing",
+                "temperature": round(temperature, 4),
+                "acceptance_rate": acceptance_rate,
+                "iterations": iterations
+            },
+            execution_time=termination.elapsed_seconds,
+            log_interval=1,
+            termination_reason=termination_reason
+        )
+
+        ga_log_data.append({
+            "generation": step + 1,
+            "best_fitness_gen": state.fitness,
+            "best_overall_fitness": best_fitness,
+            "current_violations": current_violations,
+            "temperature": temperature,
+            "acceptance_rate": acceptance_rate,
+            "iterations": iterations
+        })
+
+        if termination_reason is not None:
+            ga_log_data[-1]["termination"] = termination.summary()
+            break
+
+    # Re-score the best schedule in one pass so its fitness carries no incremental rounding
+    best = state.to_chromosome(best_genes)
+    fitness_calculator.calculate_fitness(best)
+    return best, ga_log_data
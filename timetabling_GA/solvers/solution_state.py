@@ -0,0 +1,50 @@
+# timetable_ga/solvers/solution_state.py
+from ga_components.chromosome import Chromosome
+from ga_components.incremental_fitness import FitnessState
+from ga_components.mutation import propose_move
+from ga_components.occupancy import ResourceOccupancy
+
+
+class SolutionState:
+    """
+    Một lời giải duy nhất được sửa tại chỗ cho các bộ giải một lời giải (SA, tabu): gen,
+    bảng chiếm dụng và FitnessState được cập nhật theo gia số ở mỗi bước đi, và mỗi bước
+    đi có thể được hoàn tác. Bước đi là danh sách (vị trí, gen mới) như propose_move trả về.
+    """
+    def __init__(self, chromosome, fitness_calculator, processed_data):
+        self.processed_data = processed_data
+        self.fitness_calculator = fitness_calculator
+        self.genes = list(chromosome.genes)
+        self.occupancy = ResourceOccupancy.from_genes(self.genes, processed_data)
+        self.fitness_state = FitnessState.from_genes(fitness_calculator, self.genes)
+
+    @property
+    def fitness(self):
+        return self.fitness_state.fitness
+
+    def violations(self):
+        """Số vi phạm cứng theo loại (bỏ các loại đã về 0)."""
+        return {key: count for key, count in self.fitness_state.violations.items() if count}
+
+    def conflicting_positions(self):
+        return self.fitness_calculator.conflicting_positions(Chromosome(self.genes, None, self.occupancy))
+
+    def propose(self, position, move_type):
+        """Bước đi quanh gen tại position (xem propose_move), chưa áp dụng."""
+        return propose_move(self.genes, self.occupancy, position, move_type, self.processed_data)
+
+    def apply(self, move):
+        """Áp dụng bước đi; trả về bước đi ngược để hoàn tác bằng apply()."""
+        undo = []
+        for position, gene in move:
+            old_gene = self.genes[position]
+            undo.append((position, old_gene))
+            self.genes[position] = gene
+            self.occupancy.replace_gene(old_gene, gene)
+            self.fitness_state.replace_gene(old_gene, gene)
+        undo.reverse()
+        return undo
+
+    def to_chromosome(self, genes=None):
+        """Chromosome dạng gen dict (cho export) từ gen hiện tại hoặc một bản chụp genes (chưa có fitness)."""
+        return Chromosome(list(genes if genes is not None else self.genes))
@@ -0,0 +1,155 @@
+import random
+from typing import Dict, Any, List, Optional, Tuple
+
+from config import (
+    TABU_MAX_ITERATIONS, TABU_ITERATIONS_PER_REPORT, TABU_CANDIDATES, TABU_TENURE, TABU_CONFLICT_BIAS,
+    TIME_BUDGET_SECONDS, STAGNATION_GENERATIONS, STAGNATION_EPSILON, STOP_ON_FEASIBLE
+)
+from ga_components.chromosome import Chromosome, create_initial_chromosome
+from ga_components.fitness import FitnessCalculator
+from ga_components.mutation import MUTATION_OPERATORS
+from ga_components.termination import TerminationPolicy
+from solvers.solution_state import SolutionState
+from utils.display_ga_progress import display_ga_progress
+from utils.stop_controller import StopController
+from data_processing.processor import DataProcessor
+
+
+def _assignment(gene: Dict[str, Any]) -> Tuple[Any, Any, Any, Any]:
+    return gene.get('day'), gene.get('slot_id'), gene.get('room_id'), gene.get('lecturer_id')
+
+
+def run_tabu_search(processed_data: DataProcessor, semester_id: str, semester_info: Dict[str, Any],
+                    stop_controller: Optional[StopController] = None,
+                    initial: Optional[Chromosome] = None
+                    ) -> Tuple[Optional[Chromosome], List[Dict[str, Any]]]:
+    """
+    Tabu search for one semester. Each iteration samples TABU_CANDIDATES moves of the GA's
+    move set (mostly around lessons that violate hard constraints), scores each one
+    incrementally by applying and undoing it on a FitnessState, and applies the best
+    non-tabu move even if it is worse than the current schedule. Moving a lesson away from
+    an assignment (day, slot, room, lecturer) makes (lesson, that assignment) tabu for a
+    random tenure in TABU_TENURE; a tabu move is still allowed when it beats the best
+    schedule found so far (aspiration). Every TABU_ITERATIONS_PER_REPORT iterations form one
+    "generation" in the progress events and ga_log_data.
+
+    Args:
+        processed_data (DataProcessor): Semester-filtered data processor.
+        semester_id (str): The ID of the semester being scheduled.
+        semester_info (Dict[str, Any]): Semester summary passed to display_ga_progress.
+        stop_controller (Optional[StopController]): Ends the run after the current iteration.
+        initial (Optional[Chromosome]): Starting schedule (e.g. a feasible one from the CSP
+                                        solver); create_initial_chromosome when omitted.
+
+    Returns:
+        Tuple[Optional[Chromosome], List[Dict[str, Any]]]: The best chromosome and the log data.
+    """
+    reports = max(1, TABU_MAX_ITERATIONS // TABU_ITERATIONS_PER_REPORT)
+    termination = TerminationPolicy(
+        reports, TIME_BUDGET_SECONDS, STAGNATION_GENERATIONS, STAGNATION_EPSILON, STOP_ON_FEASIBLE,
+        stop_requested=(lambda: stop_controller.requested) if stop_controller is not None else None,
+        progress_listener=stop_controller.report_progress if stop_controller is not None else None
+    )
+    fitness_calculator = FitnessCalculator(processed_data)
+    if initial is None:
+        initial = create_initial_chromosome(processed_data)
+    state = SolutionState(initial, fitness_calculator, processed_data)
+    num_genes = len(state.genes)
+
+    # (lesson_id, assignment) -> first iteration at which the assignment is allowed again
+    tabu_until = {}
+    best_genes, best_fitness, best_violations = list(state.genes), state.fitness, state.violations()
+    ga_log_data = []
+    iteration = 0
+    aspirations = 0
+
+    for report in range(reports):
+        conflicts = state.conflicting_positions()
+        moves_made = 0
+
+        for _ in range(TABU_ITERATIONS_PER_REPORT):
+            if termination.interrupted():
+                break
+            iteration += 1
+
+            best_move, best_move_fitness, best_move_aspirated = None, None, False
+            for _ in range(TABU_CANDIDATES):
+                if conflicts and random.random() < TABU_CONFLICT_BIAS:
+                    position = random.choice(conflicts)
+                else:
+                    position = random.randrange(num_genes)
+                move = state.propose(position, random.choice(MUTATION_OPERATORS))
+                if not move:
+                    continue
+
+                undo = state.apply(move)
+                fitness = state.fitness
+                state.apply(undo)
+
+                is_tabu = any(
+                    tabu_until.get((gene['lesson_id'], _assignment(gene)), 0) > iteration for _, gene in move
+                )
+                aspirated = is_tabu and fitness > best_fitness
+                if is_tabu and not aspirated:
+                    continue
+                if best_move is None or fitness > best_move_fitness:
+                    best_move, best_move_fitness, best_move_aspirated = move, fitness, aspirated
+
+            if best_move is None:
+                continue
+
+            # Leaving an assignment makes returning to it tabu for a while
+            for position, _ in best_move:
+                old_gene = state.genes[position]
+                tabu_until[(old_gene['lesson_id'], _assignment(old_gene))] = iteration + random.randint(*TABU_TENURE)
+            state.apply(best_move)
+            moves_made += 1
+            aspirations += best_move_aspirated
+
+            if best_move_fitness > best_fitness:
+                best_genes, best_fitness, best_violations = list(state.genes), state.fitness, state.violations()
+
+        # Forget expired entries so the tabu list stays small
+        tabu_until = {key: until for key, until in tabu_until.items() if until > iteration}
+
+        current_violations = state.violations()
+        termination_reason = termination.check(report, best_fitness, sum(best_violations.values()) == 0)
+
+        display_ga_progress(
+            generation=report,
+            max_generations=reports,
+            current_best_fitness=state.fitness,
+            overall_best_fitness=best_fitness,
+            current_best_violations=current_violations,
+            overall_best_violations=best_violations,
+            semester_info=semester_info,
+            population_stats={
+                "solver": "tabu_search",
+                "iterations": iteration,
+                "moves_made": moves_made,
+                "tabu_list_size": len(tabu_until),
+                "aspirations": aspirations
+            },
+            execution_time=termination.elapsed_seconds,
+            log_interval=1,
+            termination_reason=termination_reason
+        )
+
+        ga_log_data.append({
+            "generation": report + 1,
+            "best_fitness_gen": state.fitness,
+            "best_overall_fitness": best_fitness,
+            "current_violations": current_violations,
+            "iterations": iteration,
+            "tabu_list_size": len(tabu_until),
+            "aspirations": aspirations
+        })
+
+        if termination_reason is not None:
+            ga_log_data[-1]["termination"] = termination.summary()
+            break
+
+    # Re-score the best schedule in one pass so its fitness carries no incremental rounding
+    best = state.to_chromosome(best_genes)
+    fitness_calculator.calculate_fitness(best)
+    return best, ga_log_data
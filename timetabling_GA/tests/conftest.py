@@ -0,0 +1,51 @@
+import os
+import sys
+
+import pytest
+
+# The package modules import each other from the timetabling_GA directory (e.g. `from config import ...`)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from data_processing.loader import load_data  # noqa: E402
+from data_processing.processor import DataProcessor  # noqa: E402
+
+INPUT_FILE = os.path.join(ROOT, "input_data.json")
+
+
+@pytest.fixture(scope="session")
+def raw_data():
+    return load_data(INPUT_FILE)
+
+
+@pytest.fixture
+def make_processed_data(raw_data, monkeypatch):
+    """Builds the semester-filtered DataProcessor of the first semester, optionally with lesson bundling."""
+    def make(bundle_lessons=False):
+        monkeypatch.setattr("data_processing.processor.BUNDLE_LESSONS", bundle_lessons)
+        full = DataProcessor(raw_data)
+        semester_id = next(iter(full.semester_map))
+        return full, semester_id, full.filter_for_semester(semester_id)
+    return make
+
+
+@pytest.fixture
+def perturbed_genes():
+    """Returns a function that builds a random chromosome's genes with a few lessons moved to random
+    (day, slot) pairs, so that clashes, lecturer busy slots and split lesson blocks occur."""
+    from ga_components.chromosome import create_random_chromosome
+
+    def make(processed_data, rng, moves=5):
+        genes = list(create_random_chromosome(processed_data).genes)
+        days = processed_data.data['days_of_week']
+        slots = [slot['slot_id'] for slot in processed_data.data['time_slots']]
+        for position in rng.sample(range(len(genes)), min(moves, len(genes))):
+            genes[position] = dict(genes[position], day=rng.choice(days), slot_id=rng.choice(slots))
+        return genes
+    return make
+
+
+def nonzero(violations):
+    """Violation counts without the zero entries that some fitness paths keep."""
+    return {key: value for key, value in dict(violations).items() if value}
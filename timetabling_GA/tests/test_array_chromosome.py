@@ -0,0 +1,47 @@
+import random
+
+import numpy as np
+
+from ga_components.array_chromosome import GeneEncoder, ArrayChromosome, UNASSIGNED
+from ga_components.chromosome import create_random_chromosome
+
+
+def test_gene_encoder_round_trip(make_processed_data):
+    _, _, processed_data = make_processed_data()
+    encoder = GeneEncoder(processed_data)
+    random.seed(0)
+
+    for _ in range(20):
+        genes = create_random_chromosome(processed_data).genes
+        assignment = encoder.encode_genes(genes)
+        assert assignment.shape == (4, encoder.num_lessons)
+        assert assignment.dtype == np.int16
+        assert encoder.decode_genes(assignment) == genes
+        np.testing.assert_array_equal(encoder.encode_genes(encoder.decode_genes(assignment)), assignment)
+
+
+def test_unassigned_values_round_trip_as_none(make_processed_data):
+    _, _, processed_data = make_processed_data()
+    encoder = GeneEncoder(processed_data)
+    random.seed(1)
+    genes = list(create_random_chromosome(processed_data).genes)
+    genes[0] = dict(genes[0], day=None, slot_id=None, room_id='no-such-room', lecturer_id=None)
+
+    assignment = encoder.encode_genes(genes)
+    assert (assignment[:, 0] == UNASSIGNED).all()
+    decoded = encoder.decode_gene(assignment, 0)
+    assert (decoded['day'], decoded['slot_id'], decoded['room_id'], decoded['lecturer_id']) == (None, None, None, None)
+    assert encoder.decode_genes(assignment)[1:] == genes[1:]
+
+
+def test_array_chromosome_conversion_keeps_fitness(make_processed_data):
+    _, _, processed_data = make_processed_data()
+    encoder = GeneEncoder(processed_data)
+    random.seed(2)
+    chromosome = create_random_chromosome(processed_data)
+    chromosome.fitness = -12.5
+
+    array_chromosome = ArrayChromosome.from_chromosome(chromosome, encoder)
+    restored = array_chromosome.to_chromosome()
+    assert array_chromosome.fitness == restored.fitness == -12.5
+    assert restored.genes == chromosome.genes
@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+import utils.run_generational_ga as generational
+from ga_components.checkpoint import checkpoint_path, save_checkpoint, load_checkpoint
+from ga_components.chromosome import create_random_chromosome
+from ga_components.fitness import FitnessCalculator
+from utils.prepare_semester import prepare_semester
+from utils.stop_controller import StopController
+
+
+class GenerationLimitedStop(StopController):
+    """Requests a stop once `generations` generations have been reported."""
+    def __init__(self, generations=None):
+        super().__init__()
+        self.generations = generations
+        self.reported = 0
+
+    def report_progress(self, generation, best_fitness, is_feasible):
+        self.reported += 1
+        if self.generations is not None and self.reported >= self.generations:
+            self.request("test")
+
+
+@pytest.fixture
+def small_ga(monkeypatch, tmp_path):
+    for name, value in {
+        "POPULATION_SIZE": 12, "ELITISM_COUNT": 2, "MAX_GENERATIONS": 40, "GA_WORKERS": 1,
+        "CHECKPOINT_INTERVAL": 1, "CHECKPOINT_DIR": str(tmp_path), "TIME_BUDGET_SECONDS": None,
+        "STAGNATION_GENERATIONS": 6, "STOP_ON_FEASIBLE": False, "LOCAL_SEARCH": False
+    }.items():
+        monkeypatch.setattr(generational, name, value)
+    return tmp_path
+
+
+def test_checkpoint_round_trip(make_processed_data, tmp_path):
+    _, semester_id, processed_data = make_processed_data()
+    fitness_calculator = FitnessCalculator(processed_data)
+    random.seed(0)
+    population = [create_random_chromosome(processed_data) for _ in range(4)]
+    fitness_calculator.calculate_population_fitness(population)
+    rng_state = random.getstate()
+
+    path = checkpoint_path(str(tmp_path), semester_id)
+    save_checkpoint(path, fitness_calculator.encoder, population, 7, population[0], [{"generation": 8}],
+                    rng_state, extra={"termination": {"last_improvement_generation": 5}})
+    checkpoint = load_checkpoint(path, fitness_calculator.encoder)
+
+    assert checkpoint["generation"] == 7
+    assert not checkpoint["completed"]
+    assert checkpoint["rng_state"] == rng_state
+    assert checkpoint["extra"] == {"termination": {"last_improvement_generation": 5}}
+    for original, restored in zip(population, checkpoint["population"]):
+        assert restored.fitness == original.fitness
+        assert [
+            (gene['lesson_id'], gene['day'], gene['slot_id'], gene['room_id'], gene['lecturer_id'])
+            for gene in restored.to_chromosome().genes
+        ] == [
+            (gene['lesson_id'], gene['day'], gene['slot_id'], gene['room_id'], gene['lecturer_id'])
+            for gene in original.genes
+        ]
+
+
+def test_resume_continues_generations_and_termination_state(make_processed_data, small_ga):
+    full, semester_id, _ = make_processed_data()
+    processed_data, semester_info = prepare_semester(semester_id, full)
+    random.seed(0)
+    best, first_log = generational.run_generational_ga(
+        processed_data, semester_id, semester_info, GenerationLimitedStop(5)
+    )
+    assert first_log[-1]["termination"]["reason"] == "stop_requested"
+    stopped_at = first_log[-1]["generation"]
+    checkpoint = load_checkpoint(checkpoint_path(str(small_ga), semester_id), FitnessCalculator(processed_data).encoder)
+    assert not checkpoint["completed"]
+    saved_state = checkpoint["extra"]["termination"]
+
+    resumed_best, log = generational.run_generational_ga(
+        processed_data, semester_id, semester_info, GenerationLimitedStop(), resume=True
+    )
+
+    # One log entry per generation, continuing where the first run stopped
+    assert [entry["generation"] for entry in log] == list(range(1, len(log) + 1))
+    assert log[:stopped_at] == first_log
+    assert resumed_best.fitness >= best.fitness
+
+    # Stagnation is counted from the saved last improvement, not from the resumed generation
+    termination = log[-1]["termination"]
+    assert termination["elapsed_seconds"] >= saved_state["elapsed_seconds"]
+    if termination["reason"] == "stagnation":
+        assert len(log) - 1 - termination["last_improvement_generation"] == generational.STAGNATION_GENERATIONS
+        assert termination["last_improvement_generation"] >= saved_state["last_improvement_generation"]
+    else:
+        assert termination["reason"] == "max_generations"
+        assert len(log) == generational.MAX_GENERATIONS
+
+    checkpoint = load_checkpoint(checkpoint_path(str(small_ga), semester_id), FitnessCalculator(processed_data).encoder)
+    assert checkpoint["completed"]
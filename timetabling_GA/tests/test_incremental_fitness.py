@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from conftest import nonzero
+from ga_components.chromosome import Chromosome
+from ga_components.crossover import lesson_based_crossover
+from ga_components.fitness import FitnessCalculator
+from ga_components.incremental_fitness import FitnessState
+from ga_components.mutation import mutate_chromosome
+from ga_components.occupancy import ResourceOccupancy
+
+NUM_CHROMOSOMES = 200
+
+
+def _tracked(fitness_calculator, processed_data, genes):
+    return Chromosome(
+        genes, FitnessState.from_genes(fitness_calculator, genes), ResourceOccupancy.from_genes(genes, processed_data)
+    )
+
+
+def _assert_matches_full_calculation(fitness_calculator, chromosome):
+    expected_fitness, expected_violations = fitness_calculator.calculate_fitness(Chromosome(list(chromosome.genes)))
+    assert chromosome.fitness_state.fitness == pytest.approx(expected_fitness, abs=1e-6)
+    assert nonzero(chromosome.fitness_state.violations) == nonzero(expected_violations)
+
+
+@pytest.mark.parametrize("bundle_lessons", [False, True])
+def test_fitness_state_matches_full_calculation(make_processed_data, perturbed_genes, bundle_lessons):
+    _, _, processed_data = make_processed_data(bundle_lessons)
+    fitness_calculator = FitnessCalculator(processed_data)
+    rng = random.Random(0)
+    random.seed(0)
+
+    for _ in range(NUM_CHROMOSOMES):
+        genes = perturbed_genes(processed_data, rng)
+        chromosome = Chromosome(genes, FitnessState.from_genes(fitness_calculator, genes))
+        _assert_matches_full_calculation(fitness_calculator, chromosome)
+
+
+@pytest.mark.parametrize("bundle_lessons", [False, True])
+def test_fitness_state_follows_mutation_and_crossover(make_processed_data, perturbed_genes, bundle_lessons):
+    _, _, processed_data = make_processed_data(bundle_lessons)
+    fitness_calculator = FitnessCalculator(processed_data)
+    rng = random.Random(1)
+    random.seed(1)
+
+    for _ in range(NUM_CHROMOSOMES // 4):
+        parent1 = _tracked(fitness_calculator, processed_data, perturbed_genes(processed_data, rng))
+        parent2 = _tracked(fitness_calculator, processed_data, perturbed_genes(processed_data, rng))
+
+        _assert_matches_full_calculation(fitness_calculator, mutate_chromosome(parent1, processed_data, 0.2))
+        for child in lesson_based_crossover(parent1, parent2, processed_data):
+            _assert_matches_full_calculation(fitness_calculator, child)
+            _assert_matches_full_calculation(fitness_calculator, mutate_chromosome(child, processed_data, 0.2))
@@ -0,0 +1,99 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT, INPUT_FILE
+from ga_components.migration import make_transport
+from utils.run_island_model import run_island_model
+
+NUM_ISLANDS = 2
+
+# Runs one island of a multi-host setup; config overrides are applied before the GA modules are imported
+ISLAND_SCRIPT = """
+import contextlib, io, json, sys
+import config
+for name, value in json.loads(sys.argv[1]).items():
+    setattr(config, name, value)
+from data_processing.loader import load_data
+from data_processing.processor import DataProcessor
+from utils.run_ga_for_semester import run_ga_for_semester
+full = DataProcessor(load_data(sys.argv[2]))
+with contextlib.redirect_stdout(io.StringIO()):
+    best, log = run_ga_for_semester(next(iter(full.semester_map)), full)
+print(json.dumps({
+    "best_fitness": best.fitness if best is not None else None,
+    "generations": [entry["generation"] for entry in log],
+    "best_overall_fitness": log[-1]["best_overall_fitness"],
+    "migrants_received": log[-1]["migrants_received"]
+}))
+"""
+
+
+def _free_base_port(count):
+    for _ in range(20):
+        sockets = []
+        try:
+            first = socket.socket()
+            first.bind(('127.0.0.1', 0))
+            sockets.append(first)
+            base = first.getsockname()[1]
+            for offset in range(1, count):
+                other = socket.socket()
+                sockets.append(other)
+                other.bind(('127.0.0.1', base + offset))
+            return base
+        except OSError:
+            continue
+        finally:
+            for sock in sockets:
+                sock.close()
+    pytest.skip("no consecutive free ports on localhost")
+
+
+def test_queue_transport_requires_inboxes():
+    with pytest.raises(ValueError):
+        make_transport("queue", 0, NUM_ISLANDS)
+
+
+def test_island_id_requires_tcp_transport(make_processed_data, monkeypatch):
+    monkeypatch.setattr("utils.run_island_model.ISLAND_ID", 0)
+    monkeypatch.setattr("utils.run_island_model.ISLAND_TRANSPORT", "queue")
+    _, semester_id, processed_data = make_processed_data()
+    with pytest.raises(ValueError, match="tcp"):
+        run_island_model(processed_data, semester_id, {})
+
+
+def test_islands_exchange_migrants_over_tcp_on_localhost():
+    base_port = _free_base_port(NUM_ISLANDS)
+    settings = {
+        "GA_MODE": "islands", "ISLAND_TRANSPORT": "tcp", "NUM_ISLANDS": NUM_ISLANDS, "ISLAND_HOSTS": [],
+        "ISLAND_BASE_PORT": base_port, "ISLAND_FINAL_TIMEOUT": 60, "POPULATION_SIZE": 24, "ELITISM_COUNT": 2,
+        "MAX_GENERATIONS": 8, "MIGRATION_INTERVAL": 1, "MIGRATION_SIZE": 2, "STAGNATION_GENERATIONS": None,
+        "TIME_BUDGET_SECONDS": None, "STOP_ON_FEASIBLE": False, "CHECKPOINT_INTERVAL": 0, "GA_RANDOM_SEED": 1
+    }
+    islands = [
+        subprocess.Popen(
+            [sys.executable, "-c", ISLAND_SCRIPT, json.dumps(dict(settings, ISLAND_ID=island_id)), INPUT_FILE],
+            cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=dict(os.environ)
+        )
+        for island_id in range(NUM_ISLANDS)
+    ]
+    results = []
+    for island in islands:
+        stdout, stderr = island.communicate(timeout=300)
+        assert island.returncode == 0, stderr
+        results.append(json.loads(stdout.strip().splitlines()[-1]))
+
+    collector, *others = results
+    for result in results:
+        assert result["generations"] == list(range(1, settings["MAX_GENERATIONS"] + 1))
+        assert result["migrants_received"] > 0
+    # Only island 0 returns (and exports) a schedule, at least as good as every other island's best
+    assert collector["best_fitness"] is not None
+    for other in others:
+        assert other["best_fitness"] is None
+        assert collector["best_fitness"] >= other["best_overall_fitness"]
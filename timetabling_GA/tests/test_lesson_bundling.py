@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from conftest import nonzero
+from ga_components.chromosome import Chromosome, create_greedy_chromosome
+from ga_components.fitness import FitnessCalculator
+from ga_components.incremental_fitness import FitnessState
+from utils.expand_lesson_blocks import expand_lesson_blocks
+
+
+def _block_positions(processed_data):
+    return [i for i, lesson in enumerate(processed_data.required_lessons_weekly) if lesson.get('count', 1) > 1]
+
+
+def test_bundling_groups_weekly_slots_into_blocks(make_processed_data):
+    _, _, plain = make_processed_data(False)
+    _, _, bundled = make_processed_data(True)
+
+    assert not _block_positions(plain)
+    assert _block_positions(bundled), "the sample input should produce lesson blocks when bundling is on"
+    assert (sum(lesson['count'] for lesson in bundled.required_lessons_weekly) ==
+            sum(lesson.get('count', 1) for lesson in plain.required_lessons_weekly))
+
+
+def test_split_blocks_are_scored_the_same_by_every_path(make_processed_data):
+    _, _, processed_data = make_processed_data(True)
+    blocks = _block_positions(processed_data)
+    fitness_calculator = FitnessCalculator(processed_data)
+    random.seed(0)
+
+    # The last slot of the week cannot start a block that stays within its session
+    last_slot = processed_data.data['time_slots'][-1]['slot_id']
+    genes = list(create_greedy_chromosome(processed_data).genes)
+    for position in blocks:
+        genes[position] = dict(genes[position], slot_id=last_slot)
+
+    fitness, violations = fitness_calculator.calculate_fitness(Chromosome(list(genes)))
+    state = FitnessState.from_genes(fitness_calculator, list(genes))
+    batch_fitness, batch_violations = fitness_calculator.calculate_population_fitness(
+        [Chromosome(list(genes))], return_violations=True
+    )
+    assert state.fitness == pytest.approx(fitness, abs=1e-6)
+    assert batch_fitness[0] == pytest.approx(fitness, abs=1e-6)
+    assert nonzero(state.violations) == nonzero(batch_violations[0]) == nonzero(violations)
+    assert violations['Lesson block split across sessions'] == len(blocks)
+
+
+def test_expand_lesson_blocks_yields_consecutive_single_slots(make_processed_data):
+    _, _, processed_data = make_processed_data(True)
+    random.seed(1)
+    genes = create_greedy_chromosome(processed_data).genes
+
+    expanded = expand_lesson_blocks(genes, processed_data)
+    assert len(expanded) == sum(gene.get('count', 1) for gene in genes)
+    assert all(gene.get('count', 1) == 1 for gene in expanded)
+
+    for gene in genes:
+        parts = [part for part in expanded if part['lesson_id'] == gene['lesson_id']]
+        assert len(parts) == gene.get('count', 1)
+        covered = processed_data.covered_slots(gene['slot_id'], gene.get('count', 1))
+        if covered is not None:
+            assert tuple(part['slot_id'] for part in parts) == tuple(covered)
+        assert all((part['day'], part['room_id'], part['lecturer_id']) ==
+                   (gene['day'], gene['room_id'], gene['lecturer_id']) for part in parts)
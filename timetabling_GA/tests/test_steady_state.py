@@ -0,0 +1,44 @@
+import random
+
+from ga_components.array_chromosome import GeneEncoder, ArrayChromosome
+from ga_components.chromosome import create_random_chromosome
+from ga_components.fitness_cache import chromosome_key
+from ga_components.steady_state import SteadyStatePopulation
+
+
+def test_duplicate_key_stays_blocked_while_a_copy_remains(make_processed_data):
+    _, _, processed_data = make_processed_data()
+    encoder = GeneEncoder(processed_data)
+    random.seed(0)
+    genes = [create_random_chromosome(processed_data).genes for _ in range(3)]
+
+    # Two copies of the same schedule in the initial population, the worst ones
+    duplicate = encoder.encode_genes(genes[0])
+    population = SteadyStatePopulation([
+        ArrayChromosome(encoder, duplicate.copy(), -10.0),
+        ArrayChromosome(encoder, duplicate.copy(), -9.0),
+        ArrayChromosome(encoder, encoder.encode_genes(genes[1]), -1.0),
+    ])
+
+    assert population.replace_worst(ArrayChromosome(encoder, encoder.encode_genes(genes[2]), -5.0))
+    # One copy of the duplicate is still in the population, so it must not be admitted again
+    assert not population.replace_worst(ArrayChromosome(encoder, duplicate.copy(), -2.0))
+
+    keys = [chromosome_key(c) for c in population.chromosomes]
+    assert keys.count(chromosome_key(ArrayChromosome(encoder, duplicate))) == 1
+
+
+def test_restart_individuals_keep_key_counts(make_processed_data):
+    _, _, processed_data = make_processed_data()
+    encoder = GeneEncoder(processed_data)
+    random.seed(1)
+    assignments = [encoder.encode_genes(create_random_chromosome(processed_data).genes) for _ in range(3)]
+
+    population = SteadyStatePopulation([ArrayChromosome(encoder, a, -float(i)) for i, a in enumerate(assignments)])
+    restart = encoder.encode_genes(create_random_chromosome(processed_data).genes)
+    population.replace_worst_many([ArrayChromosome(encoder, restart.copy(), -20.0),
+                                   ArrayChromosome(encoder, restart.copy(), -21.0)])
+
+    # Replacing one restart copy keeps the other, and its key still blocks a new duplicate
+    assert population.replace_worst(ArrayChromosome(encoder, assignments[2].copy(), -3.0))
+    assert not population.replace_worst(ArrayChromosome(encoder, restart.copy(), -1.5))
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from conftest import nonzero
+from ga_components.chromosome import Chromosome
+from ga_components.fitness import FitnessCalculator
+from ga_components.fitness_cache import chromosome_key
+from ga_components.incremental_fitness import FitnessState
+from ga_components.symmetry import canonicalize, get_interchangeable_groups
+
+NUM_CHROMOSOMES = 50
+
+ASSIGNMENT_FIELDS = ('day', 'slot_id', 'room_id', 'lecturer_id')
+
+
+@pytest.fixture
+def canonical_order(monkeypatch):
+    monkeypatch.setattr("ga_components.symmetry.CANONICAL_GROUP_ORDER", True)
+    monkeypatch.setattr("ga_components.fitness_cache.CANONICAL_GROUP_ORDER", True)
+
+
+def _permuted_within_groups(genes, processed_data, rng):
+    """Shuffles the assignments among the lessons of each interchangeable group."""
+    genes = list(genes)
+    for positions in get_interchangeable_groups(processed_data).positions:
+        assignments = [{field: genes[p].get(field) for field in ASSIGNMENT_FIELDS} for p in positions]
+        rng.shuffle(assignments)
+        for position, assignment in zip(positions, assignments):
+            genes[position] = dict(genes[position], **assignment)
+    return genes
+
+
+@pytest.mark.parametrize("bundle_lessons", [False, True])
+def test_canonicalization_keeps_fitness(make_processed_data, perturbed_genes, canonical_order, bundle_lessons):
+    _, _, processed_data = make_processed_data(bundle_lessons)
+    fitness_calculator = FitnessCalculator(processed_data)
+    rng = random.Random(0)
+    random.seed(0)
+
+    for _ in range(NUM_CHROMOSOMES):
+        chromosome = Chromosome(perturbed_genes(processed_data, rng))
+        expected_fitness, expected_violations = fitness_calculator.calculate_fitness(Chromosome(list(chromosome.genes)))
+        canonicalize(chromosome, processed_data)
+
+        fitness, violations = fitness_calculator.calculate_fitness(Chromosome(list(chromosome.genes)))
+        state = FitnessState.from_genes(fitness_calculator, list(chromosome.genes))
+        batch_fitness, batch_violations = fitness_calculator.calculate_population_fitness(
+            [Chromosome(list(chromosome.genes))], return_violations=True
+        )
+        for value in (fitness, state.fitness, batch_fitness[0]):
+            assert value == pytest.approx(expected_fitness, abs=1e-6)
+        for counts in (violations, state.violations, batch_violations[0]):
+            assert nonzero(counts) == nonzero(expected_violations)
+
+
+def test_permutations_share_one_canonical_form_and_key(make_processed_data, perturbed_genes, canonical_order):
+    _, _, processed_data = make_processed_data()
+    assert get_interchangeable_groups(processed_data).positions, "the sample input should have interchangeable lessons"
+    encoder = FitnessCalculator(processed_data).encoder
+    rng = random.Random(1)
+    random.seed(1)
+
+    for _ in range(NUM_CHROMOSOMES):
+        genes = perturbed_genes(processed_data, rng)
+        permuted = _permuted_within_groups(genes, processed_data, rng)
+        assert chromosome_key(Chromosome(list(genes))) == chromosome_key(Chromosome(list(permuted)))
+        assert (encoder.canonical_assignment(encoder.encode_genes(genes)) ==
+                encoder.canonical_assignment(encoder.encode_genes(permuted))).all()
+
+        canonical = canonicalize(Chromosome(list(genes)), processed_data).genes
+        assert canonicalize(Chromosome(list(permuted)), processed_data).genes == canonical
+        assert canonicalize(Chromosome(list(canonical)), processed_data).genes == canonical
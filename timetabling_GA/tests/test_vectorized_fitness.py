@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from conftest import nonzero
+from ga_components.array_chromosome import ArrayChromosome
+from ga_components.chromosome import Chromosome
+from ga_components.fitness import FitnessCalculator
+
+NUM_CHROMOSOMES = 200
+
+
+@pytest.mark.parametrize("bundle_lessons", [False, True])
+def test_batched_fitness_matches_scalar_fitness(make_processed_data, perturbed_genes, bundle_lessons):
+    _, _, processed_data = make_processed_data(bundle_lessons)
+    fitness_calculator = FitnessCalculator(processed_data)
+    rng = random.Random(0)
+    random.seed(0)
+
+    population = [Chromosome(perturbed_genes(processed_data, rng)) for _ in range(NUM_CHROMOSOMES)]
+    expected = [fitness_calculator.calculate_fitness(Chromosome(list(c.genes))) for c in population]
+    fitness, violations = fitness_calculator.calculate_population_fitness(population, return_violations=True)
+
+    for chromosome, batch_fitness, batch_violations, (scalar_fitness, scalar_violations) in zip(
+            population, fitness, violations, expected):
+        assert batch_fitness == pytest.approx(scalar_fitness, abs=1e-6)
+        assert chromosome.fitness == pytest.approx(scalar_fitness, abs=1e-6)
+        assert nonzero(batch_violations) == nonzero(scalar_violations)
+
+
+@pytest.mark.parametrize("bundle_lessons", [False, True])
+def test_batched_fitness_scores_array_chromosomes(make_processed_data, perturbed_genes, bundle_lessons):
+    _, _, processed_data = make_processed_data(bundle_lessons)
+    fitness_calculator = FitnessCalculator(processed_data)
+    rng = random.Random(1)
+    random.seed(1)
+
+    genes = [perturbed_genes(processed_data, rng) for _ in range(20)]
+    dict_population = [Chromosome(g) for g in genes]
+    array_population = [ArrayChromosome.from_chromosome(c, fitness_calculator.encoder) for c in dict_population]
+    fitness_calculator.calculate_population_fitness(dict_population)
+    fitness_calculator.calculate_population_fitness(array_population)
+
+    assert [c.fitness for c in array_population] == pytest.approx([c.fitness for c in dict_population], abs=1e-6)
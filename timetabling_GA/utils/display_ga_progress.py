@@ -14,10 +14,12 @@ def display_ga_progress(
     population_stats: Optional[Dict[str, Any]] = None,
     execution_time: Optional[float] = None,
     log_interval: int = 10,
-    return_json: bool = False
+    return_json: bool = False,
+    termination_reason: Optional[str] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Displays comprehensive GA progress information with detailed metrics for FE processing.
+    When termination_reason is given, this generation is the last one of the run.
     """
     # Ensure violations are not None
     current_best_violations = current_best_violations or {}
@@ -27,6 +29,7 @@ def display_ga_progress(
     # Calculate metrics
     progress_percentage = round((generation / max_generations) * 100, 2)
     has_improvement = current_best_fitness >= overall_best_fitness
+    is_last = generation == max_generations - 1 or termination_reason is not None
     estimated_time_remaining = None
     
     if execution_time and generation > 0:
@@ -59,7 +62,11 @@ def display_ga_progress(
             "max": max_generations,
             "progress_percentage": progress_percentage,
             "is_first": str(generation == 0),  # Convert to string
-            "is_last": str(generation == max_generations - 1)  # Convert to string
+            "is_last": str(is_last)  # Convert to string
+        },
+        "termination": {
+            "is_stopping": str(termination_reason is not None),
+            "reason": termination_reason
         },
         "fitness_metrics": {
             "current_best": round(current_best_fitness, 4),
@@ -108,7 +115,7 @@ def display_ga_progress(
     should_display_console = (
         log_interval > 0 and (generation % log_interval == 0) or
         generation == 0 or
-        generation == max_generations - 1 or
+        is_last or
         has_improvement
     )
     
@@ -155,6 +162,10 @@ def display_ga_progress(
                 f"Violations: {violation_status} {sum(current_best_violations.values()):3d}"
             )
             
+            cache_stats = population_stats.get('fitness_cache')
+            if cache_stats:
+                progress_text += f" Cache: {cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']} hits"
+
             if execution_time and generation > 0:
                 progress_text += f" Time: {execution_time:.1f}s"
                 if estimated_time_remaining:
@@ -186,16 +197,18 @@ def display_ga_progress(
         print("="*80)
     
     # Final generation summary
-    if generation == max_generations - 1:
+    if is_last:
         print("\n\n" + "="*80)
         print(f"=== GA Optimization Completed ===")
+        if termination_reason:
+            print(f"Stopped: {termination_reason.replace('_', ' ')} (generation {generation + 1})")
         print(f"Final Best Fitness: {overall_best_fitness:.4f}")
         print(f"Total Violations: {sum(overall_best_violations.values())}")
         print(f"Feasible Solution: {'Yes' if sum(overall_best_violations.values()) == 0 else 'No'}")
         
         if execution_time:
             print(f"Total Execution Time: {execution_time:.2f} seconds")
-            print(f"Generations per Second: {max_generations/execution_time:.2f}")
+            print(f"Generations per Second: {(generation + 1)/execution_time:.2f}")
         
         print("="*80)
     
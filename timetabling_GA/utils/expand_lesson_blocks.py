@@ -0,0 +1,28 @@
+from typing import Dict, Any, List
+
+from data_processing.processor import DataProcessor
+
+
+def expand_lesson_blocks(genes: List[Dict[str, Any]], processed_data: DataProcessor) -> List[Dict[str, Any]]:
+    """
+    Splits bundled lesson blocks (genes with "count" > 1, see BUNDLE_LESSONS) into one gene
+    per time slot, so the semester expansion and the exports see single-slot lessons only.
+
+    Args:
+        genes (List[Dict[str, Any]]): The genes of the best weekly chromosome.
+        processed_data (DataProcessor): The data processor used to resolve the slots of a block.
+
+    Returns:
+        List[Dict[str, Any]]: The genes with every block replaced by its consecutive slots.
+        A block that does not fit within its session keeps all its slots at the start slot,
+        so the semester scheduler treats the extra ones as clashes and moves them.
+    """
+    expanded = []
+    for gene in genes:
+        count = gene.get('count', 1)
+        if count <= 1:
+            expanded.append(gene)
+            continue
+        slots = processed_data.covered_slots(gene.get('slot_id'), count) or [gene.get('slot_id')] * count
+        expanded.extend(dict(gene, slot_id=slot_id, count=1) for slot_id in slots)
+    return expanded
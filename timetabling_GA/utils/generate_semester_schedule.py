@@ -10,6 +10,7 @@ from utils.is_lecturer_weekly_busy_on_day_and_slot import is_lecturer_weekly_bus
 from utils.get_weekly_lesson_counts import get_weekly_lesson_counts
 from utils.get_date_from_week_day import get_date_from_week_day
 from utils.check_hard_constraints import check_hard_constraints
+from utils.expand_lesson_blocks import expand_lesson_blocks
 
 def generate_semester_schedule(best_weekly_chromosome: Any, processed_data: Any) -> tuple:
     """
@@ -37,7 +38,8 @@ def generate_semester_schedule(best_weekly_chromosome: Any, processed_data: Any)
     all_semester_lessons_to_distribute = []
     
     # PHASE 1: Expand weekly timetable into a full semester list
-    for gene in best_weekly_chromosome.genes:
+    # (bundled lesson blocks are first split into their single slots)
+    for gene in expand_lesson_blocks(best_weekly_chromosome.genes, processed_data):
         cls_id = gene['class_id']
         semester_id_for_class = gene.get('semester_id')
         
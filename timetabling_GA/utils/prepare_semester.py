@@ -0,0 +1,50 @@
+from typing import Dict, Any, Optional, Tuple
+
+from data_processing.processor import DataProcessor
+
+
+def prepare_semester(semester_id: str,
+                     full_data_processor: DataProcessor) -> Tuple[Optional[DataProcessor], Optional[Dict[str, Any]]]:
+    """
+    Filters the input data to one semester and checks that it can be scheduled.
+
+    Args:
+        semester_id (str): The ID of the semester to schedule.
+        full_data_processor (DataProcessor): The data processor object containing all
+                                             input information.
+
+    Returns:
+        Tuple[Optional[DataProcessor], Optional[Dict[str, Any]]]:
+        - The semester-filtered data processor, or None if the semester cannot be scheduled.
+        - The semester summary passed to display_ga_progress, or None.
+    """
+    # Filter data to only include the current semester's information
+    semester_specific_data_processor = full_data_processor.filter_for_semester(semester_id)
+
+    # Check the validity of the filtered data
+    if not semester_specific_data_processor:
+        print(f"Error: No information found for semester {semester_id}.")
+        return None, None
+
+    if not semester_specific_data_processor.lecturer_map:
+        print(f"Error: Semester {semester_id} has no suitable lecturers.")
+        return None, None
+
+    if not semester_specific_data_processor.room_map:
+        print(f"Error: Semester {semester_id} has no suitable classrooms.")
+        return None, None
+
+    if not semester_specific_data_processor.required_lessons_weekly:
+        print(f"Warning: Semester {semester_id} has no lessons created after filtering.")
+        return None, None
+
+    # Tạo thông tin học kỳ để truyền vào display_ga_progress
+    semester_info = {
+        'semester_id': semester_id,
+        'semester_name': f"Học kỳ {semester_id.split('_')[0]}",
+        'academic_year': semester_id.split('_')[-1],
+        'total_lessons': len(semester_specific_data_processor.required_lessons_weekly),
+        'total_lecturers': len(semester_specific_data_processor.lecturer_map),
+        'total_rooms': len(semester_specific_data_processor.room_map)
+    }
+    return semester_specific_data_processor, semester_info
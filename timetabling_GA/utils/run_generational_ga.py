@@ -0,0 +1,306 @@
+import random
+from typing import Dict, Any, List, Optional, Tuple
+
+# Import GA configurations and components
+from config import (
+    POPULATION_SIZE, MAX_GENERATIONS, MUTATION_RATE, CROSSOVER_RATE, ELITISM_COUNT,
+    INCREMENTAL_FITNESS, FITNESS_CACHE_SIZE, DEDUPLICATE_POPULATION, GA_WORKERS, GA_RANDOM_SEED,
+    TIME_BUDGET_SECONDS, STAGNATION_GENERATIONS, STAGNATION_EPSILON, STOP_ON_FEASIBLE,
+    CHECKPOINT_INTERVAL, CHECKPOINT_DIR, ADAPTIVE_RATES, MUTATION_RATE_BOUNDS, CROSSOVER_RATE_BOUNDS,
+    DIVERSITY_LOW, DIVERSITY_HIGH, PARTIAL_RESTART_GENERATIONS, PARTIAL_RESTART_FRACTION,
+    RATE_STALL_GENERATIONS, ADAPTIVE_OPERATORS, OPERATOR_MIN_PROBABILITY, OPERATOR_ADAPTATION_RATE,
+    TARGETED_MUTATION, LOCAL_SEARCH, LOCAL_SEARCH_ELITES, LOCAL_SEARCH_PROBABILITY, LOCAL_SEARCH_MAX_EVALUATIONS,
+    LOCAL_SEARCH_CANDIDATES
+)
+from ga_components.adaptive import AdaptiveRateController
+from ga_components.chromosome import Chromosome
+from ga_components.array_chromosome import ArrayChromosome
+from ga_components.checkpoint import checkpoint_path, save_checkpoint, load_checkpoint
+from ga_components.local_search import apply_local_search
+from ga_components.population import initialize_population, deduplicate_population
+from ga_components.fitness import FitnessCalculator
+from ga_components.evaluator import PopulationEvaluator
+from ga_components.evolution import breed_offspring, create_operator_selectors
+from ga_components.operator_selection import AdaptivePursuit, credit_offspring
+from ga_components.parallel_engine import ParallelGenerationEngine
+from ga_components.termination import (
+    TerminationPolicy, REASON_MAX_GENERATIONS, REASON_STAGNATION, REASON_FEASIBLE
+)
+from utils.display_ga_progress import display_ga_progress
+from utils.stop_controller import StopController
+from data_processing.processor import DataProcessor
+
+
+# A run that ended for one of these reasons is finished; other reasons (stop request,
+# time budget) leave a checkpoint that a resumed run continues from
+COMPLETED_REASONS = (REASON_MAX_GENERATIONS, REASON_STAGNATION, REASON_FEASIBLE)
+
+
+def _next_population(population: List[Any], processed_data: DataProcessor, evaluator: PopulationEvaluator,
+                     engine: Optional[ParallelGenerationEngine], mutation_rate: float,
+                     crossover_rate: float, num_fresh: int = 0,
+                     operator_selectors: Optional[Dict[str, AdaptivePursuit]] = None) -> Tuple[List[Any], int]:
+    """
+    Builds and evaluates the next generation (elitism, then selection, crossover and mutation).
+
+    Args:
+        population (List[Any]): The current population, sorted by fitness (best first).
+        processed_data (DataProcessor): Semester-filtered data processor.
+        evaluator (PopulationEvaluator): Scores the new individuals.
+        engine (Optional[ParallelGenerationEngine]): Process pool used for breeding, if any.
+        mutation_rate (float): Per-gene mutation probability for this generation.
+        crossover_rate (float): Crossover probability for this generation.
+        num_fresh (int): Number of offspring replaced by new random individuals (partial restart).
+        operator_selectors (Optional[Dict[str, AdaptivePursuit]]): "mutation" and "crossover"
+            selectors; they are credited once the offspring have been evaluated.
+
+    Returns:
+        Tuple[List[Any], int]: The new population and the number of duplicates replaced.
+    """
+    # Apply elitism: preserve the best individuals
+    new_population = list(population[:ELITISM_COUNT])
+
+    # Create new individuals through selection, crossover and mutation
+    num_offspring = POPULATION_SIZE - len(new_population)
+    if engine is not None:
+        new_population.extend(engine.breed(population, num_offspring, mutation_rate, crossover_rate))
+    else:
+        operator_selectors = operator_selectors or {}
+        new_population.extend(breed_offspring(
+            population, num_offspring, processed_data, mutation_rate, crossover_rate,
+            mutation_selector=operator_selectors.get("mutation"),
+            crossover_selector=operator_selectors.get("crossover"),
+            conflict_finder=evaluator.fitness_calculator.conflicting_positions if TARGETED_MUTATION else None
+        ))
+
+    # Partial restart: fresh random individuals take the place of some offspring
+    num_fresh = min(num_fresh, num_offspring)
+    if num_fresh > 0:
+        if engine is not None:
+            new_population[-num_fresh:] = engine.initialize(num_fresh)
+        else:
+            new_population[-num_fresh:] = initialize_population(num_fresh, processed_data)
+
+    # Replace exact duplicates with fresh individuals before evaluation
+    duplicates_replaced = 0
+    if DEDUPLICATE_POPULATION:
+        duplicates_replaced = deduplicate_population(new_population, processed_data)
+
+    # Calculate and assign new fitness for the new population
+    evaluator.evaluate(new_population)
+    if operator_selectors:
+        credit_offspring(new_population, operator_selectors.values())
+    return new_population, duplicates_replaced
+
+
+def run_generational_ga(processed_data: DataProcessor, semester_id: str, semester_info: Dict[str, Any],
+                        stop_controller: Optional[StopController] = None, initial: Optional[Chromosome] = None,
+                        resume: bool = False) -> Tuple[Optional[Chromosome], List[Dict[str, Any]]]:
+    """
+    Runs the generational GA for one semester: elitism, selection, crossover and mutation
+    each generation, with the optional process pool, adaptive rates, adaptive operators,
+    memetic local search and checkpoints configured in config.py.
+
+    Args:
+        processed_data (DataProcessor): Semester-filtered data processor.
+        semester_id (str): The ID of the semester being scheduled.
+        semester_info (Dict[str, Any]): Semester summary passed to display_ga_progress.
+        stop_controller (Optional[StopController]): When a stop is requested, the current
+            generation is finished and the best chromosome found so far is returned.
+        initial (Optional[Chromosome]): A schedule to seed the initial population with,
+            e.g. the feasible schedule found by the CSP solver. Ignored when resuming.
+        resume (bool): Continue from the semester's latest checkpoint in CHECKPOINT_DIR,
+            if there is one for the same input data.
+
+    Returns:
+        Tuple[Optional[Chromosome], List[Dict[str, Any]]]: The chromosome with the best fitness
+        throughout the evolutionary process and the log data across generations.
+    """
+    # The time budget covers initialization as well as the evolutionary loop
+    termination = TerminationPolicy(
+        MAX_GENERATIONS, TIME_BUDGET_SECONDS, STAGNATION_GENERATIONS, STAGNATION_EPSILON, STOP_ON_FEASIBLE,
+        stop_requested=(lambda: stop_controller.requested) if stop_controller is not None else None,
+        progress_listener=stop_controller.report_progress if stop_controller is not None else None
+    )
+
+    # Initialize necessary objects and data for the GA
+    fitness_calculator = FitnessCalculator(processed_data)
+    evaluator = PopulationEvaluator(fitness_calculator, FITNESS_CACHE_SIZE, INCREMENTAL_FITNESS)
+    checkpoint_file = checkpoint_path(CHECKPOINT_DIR, semester_id)
+
+    checkpoint = load_checkpoint(checkpoint_file, fitness_calculator.encoder) if resume else None
+    if checkpoint is not None and checkpoint["completed"]:
+        print(f"Semester {semester_id} was already completed in the checkpoint; reusing its best schedule.")
+        return checkpoint["best"].to_chromosome(), checkpoint["ga_log_data"]
+
+    # With several workers, breeding and evaluation run in a process pool and the
+    # population is exchanged through shared memory as integer arrays
+    engine = None
+    if GA_WORKERS > 1:
+        engine_state = checkpoint["extra"].get("engine", {}) if checkpoint is not None else {}
+        engine = ParallelGenerationEngine(
+            processed_data, GA_WORKERS, POPULATION_SIZE,
+            seed=engine_state.get("seed", f"{GA_RANDOM_SEED}:{semester_id}" if GA_RANDOM_SEED is not None else None),
+            generation=engine_state.get("generation", 0)
+        )
+
+    # The worker pool and the shared-memory blocks must be released even if a generation fails
+    try:
+        # Mutation/crossover rates follow population diversity and the improvement rate
+        adaptive = None
+        if ADAPTIVE_RATES:
+            adaptive = AdaptiveRateController(
+                MUTATION_RATE, CROSSOVER_RATE, MUTATION_RATE_BOUNDS, CROSSOVER_RATE_BOUNDS,
+                DIVERSITY_LOW, DIVERSITY_HIGH, PARTIAL_RESTART_GENERATIONS, PARTIAL_RESTART_FRACTION,
+                RATE_STALL_GENERATIONS
+            )
+            if checkpoint is not None and "adaptive" in checkpoint["extra"]:
+                adaptive.restore(checkpoint["extra"]["adaptive"])
+
+        # Operator probabilities follow each operator's improvement per unit of CPU time
+        # (the process-pool engine breeds with uniform operator choice)
+        operator_selectors = None
+        if ADAPTIVE_OPERATORS and engine is None:
+            operator_selectors = create_operator_selectors(OPERATOR_MIN_PROBABILITY, OPERATOR_ADAPTATION_RATE)
+
+        best_overall_chromosome = None
+        best_overall_violations = {}
+        duplicates_replaced = 0
+        local_search_stats = None
+        ga_log_data = []
+        start_generation = 0
+
+        if checkpoint is not None:
+            # The checkpointed generation was already logged: restore the state right after it
+            # and breed the next generation from there
+            print(f"Resuming semester {semester_id} from generation {checkpoint['generation'] + 1}.")
+            random.setstate(checkpoint["rng_state"])
+            population = checkpoint["population"][:POPULATION_SIZE]
+            best_overall_chromosome = checkpoint["best"]
+            if engine is None:
+                population = [chrom.to_chromosome() for chrom in population]
+                best_overall_chromosome = best_overall_chromosome.to_chromosome()
+            best_overall_violations = evaluator.violations(best_overall_chromosome)
+            ga_log_data = checkpoint["ga_log_data"]
+            start_generation = checkpoint["generation"] + 1
+            # Stagnation and the time budget continue from the saved state; older checkpoints
+            # without it count the resumed generation as the last improvement
+            termination.restore(
+                checkpoint["extra"].get("termination", {"last_improvement_generation": start_generation})
+            )
+        elif engine is not None:
+            population = engine.initialize(POPULATION_SIZE)
+        else:
+            population = initialize_population(POPULATION_SIZE, processed_data)
+
+        # The seed schedule takes the place of one random individual; elitism keeps it
+        # until something better is found
+        if checkpoint is None and initial is not None:
+            if engine is not None:
+                population[-1] = ArrayChromosome.from_chromosome(initial, fitness_calculator.encoder)
+                population[-1].fitness = float('-inf')
+            else:
+                population[-1] = Chromosome(list(initial.genes))
+
+        # Calculate initial fitness for the entire population
+        evaluator.evaluate(population)
+
+        # Start the evolutionary loop
+        for generation in range(start_generation, MAX_GENERATIONS):
+            if generation > start_generation or checkpoint is not None:
+                mutation_rate, crossover_rate, num_fresh = MUTATION_RATE, CROSSOVER_RATE, 0
+                if adaptive is not None:
+                    num_fresh = adaptive.update(population, best_overall_chromosome.fitness)
+                    mutation_rate, crossover_rate = adaptive.mutation_rate, adaptive.crossover_rate
+                population, duplicates_replaced = _next_population(
+                    population, processed_data, evaluator, engine,
+                    mutation_rate, crossover_rate, num_fresh, operator_selectors
+                )
+                # Memetic stage: min-conflicts repair of the elites (and, optionally, random offspring)
+                if LOCAL_SEARCH:
+                    local_search_stats = apply_local_search(
+                        population, processed_data, evaluator, LOCAL_SEARCH_ELITES,
+                        LOCAL_SEARCH_PROBABILITY, LOCAL_SEARCH_MAX_EVALUATIONS, LOCAL_SEARCH_CANDIDATES
+                    )
+
+            # Sort the population to identify the best chromosome
+            population.sort(key=lambda c: c.fitness, reverse=True)
+            current_best_chromosome = population[0]
+
+            # Update the overall best chromosome if a new one is found
+            if best_overall_chromosome is None or current_best_chromosome.fitness > best_overall_chromosome.fitness:
+                best_overall_chromosome = current_best_chromosome
+                # Get detailed violations for the best chromosome
+                best_overall_violations = evaluator.violations(best_overall_chromosome)
+        
+            # Get detailed violations for the current generation's best to display progress
+            current_violations = evaluator.violations(current_best_chromosome)
+
+            # Decide whether this is the last generation (budget, stagnation, feasibility)
+            termination_reason = termination.check(
+                generation, best_overall_chromosome.fitness, sum(best_overall_violations.values()) == 0
+            )
+
+            # Display the algorithm's progress - THÊM semester_info
+            display_ga_progress(
+                generation=generation,
+                max_generations=MAX_GENERATIONS,
+                current_best_fitness=current_best_chromosome.fitness,
+                overall_best_fitness=best_overall_chromosome.fitness,
+                current_best_violations=current_violations,
+                overall_best_violations=best_overall_violations,
+                semester_info=semester_info,  # THÊM THÔNG TIN HỌC KỲ
+                population_stats={
+                    "fitness_cache": evaluator.cache.stats(),
+                    "duplicates_replaced": duplicates_replaced,
+                    "adaptive": adaptive.stats() if adaptive is not None else None,
+                    "operators": {group: selector.stats() for group, selector in operator_selectors.items()}
+                    if operator_selectors else None,
+                    "local_search": local_search_stats
+                },
+                execution_time=termination.elapsed_seconds,
+                log_interval=1,
+                termination_reason=termination_reason
+            )
+        
+            # Log data for the current generation
+            ga_log_data.append({
+                "generation": generation + 1,
+                "best_fitness_gen": current_best_chromosome.fitness,
+                "best_overall_fitness": best_overall_chromosome.fitness,
+                "current_violations": current_violations
+            })
+            if adaptive is not None:
+                ga_log_data[-1].update(adaptive.stats())
+            if operator_selectors:
+                ga_log_data[-1]["operators"] = {group: selector.stats() for group, selector in operator_selectors.items()}
+            if local_search_stats is not None:
+                ga_log_data[-1]["local_search"] = local_search_stats
+
+            if termination_reason is not None:
+                ga_log_data[-1]["termination"] = termination.summary()
+
+            # Save the state after this generation (population, RNG, best, log) for --resume
+            if CHECKPOINT_INTERVAL > 0 and (termination_reason is not None or (generation + 1) % CHECKPOINT_INTERVAL == 0):
+                save_checkpoint(
+                    checkpoint_file, fitness_calculator.encoder, population, generation,
+                    best_overall_chromosome, ga_log_data, random.getstate(),
+                    extra={
+                        "engine": {"seed": engine.seed, "generation": engine.generation} if engine is not None else {},
+                        "adaptive": adaptive.state() if adaptive is not None else {},
+                        "termination": termination.state()
+                    },
+                    completed=termination_reason in COMPLETED_REASONS
+                )
+
+            if termination_reason is not None:
+                break
+    finally:
+        if engine is not None:
+            engine.close()
+
+    # Return the usual dict-gene chromosome so the exporters work unchanged
+    if isinstance(best_overall_chromosome, ArrayChromosome):
+        best_overall_chromosome = best_overall_chromosome.to_chromosome()
+
+    return best_overall_chromosome, ga_log_data
\ No newline at end of file
@@ -0,0 +1,283 @@
+import random
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_EXCEPTION
+from multiprocessing.managers import SyncManager
+from typing import Dict, Any, Callable, List, Optional, Tuple
+import numpy as np
+
+from config import (
+    POPULATION_SIZE, MAX_GENERATIONS, MUTATION_RATE, CROSSOVER_RATE, ELITISM_COUNT,
+    INCREMENTAL_FITNESS, FITNESS_CACHE_SIZE, DEDUPLICATE_POPULATION, GA_RANDOM_SEED,
+    NUM_ISLANDS, MIGRATION_INTERVAL, MIGRATION_SIZE, ISLAND_TRANSPORT, ISLAND_ID, ISLAND_FINAL_TIMEOUT,
+    TIME_BUDGET_SECONDS, STAGNATION_GENERATIONS, STAGNATION_EPSILON, STOP_ON_FEASIBLE,
+    ADAPTIVE_OPERATORS, OPERATOR_MIN_PROBABILITY, OPERATOR_ADAPTATION_RATE, TARGETED_MUTATION
+)
+from ga_components.chromosome import Chromosome
+from ga_components.array_chromosome import GeneEncoder, ArrayChromosome
+from ga_components.evaluator import PopulationEvaluator
+from ga_components.evolution import breed_offspring, create_operator_selectors
+from ga_components.operator_selection import credit_offspring
+from ga_components.fitness import FitnessCalculator
+from ga_components.migration import migration_targets, make_transport
+from ga_components.population import initialize_population, deduplicate_population
+from ga_components.termination import TerminationPolicy
+from utils.display_ga_progress import display_ga_progress
+from utils.stop_controller import StopController, ignore_interrupts
+from data_processing.processor import DataProcessor
+
+
+def run_island(island_index: int, num_islands: int, processed_data: DataProcessor, semester_info: Dict[str, Any],
+               inboxes: Optional[List[Any]] = None, seed: Optional[str] = None,
+               stop_requested: Optional[Callable[[], bool]] = None) -> Tuple[np.ndarray, float, List[Dict[str, Any]]]:
+    """
+    Evolves one independent sub-population. Every MIGRATION_INTERVAL generations the
+    MIGRATION_SIZE best individuals are sent to the neighbouring islands, and incoming
+    migrants replace the worst individuals.
+
+    Args:
+        island_index (int): Index of this island.
+        num_islands (int): Total number of islands.
+        processed_data (DataProcessor): Semester-filtered data processor.
+        semester_info (Dict[str, Any]): Semester summary passed to display_ga_progress.
+        inboxes (Optional[List[Any]]): One queue per island for the "queue" transport.
+        seed (Optional[str]): Base seed for a reproducible run.
+        stop_requested (Optional[Callable[[], bool]]): Returns True once the run should stop
+            after the current generation.
+
+    Returns:
+        Tuple[np.ndarray, float, List[Dict[str, Any]]]: The encoded best assignment,
+        its fitness and the island's log data.
+    """
+    if seed is not None:
+        random.seed(f"{seed}:island{island_index}")
+
+    termination = TerminationPolicy(
+        MAX_GENERATIONS, TIME_BUDGET_SECONDS, STAGNATION_GENERATIONS, STAGNATION_EPSILON, STOP_ON_FEASIBLE,
+        stop_requested=stop_requested
+    )
+    island_population_size = max(ELITISM_COUNT + 2, POPULATION_SIZE // num_islands)
+    encoder = GeneEncoder(processed_data)
+    evaluator = PopulationEvaluator(FitnessCalculator(processed_data), FITNESS_CACHE_SIZE, INCREMENTAL_FITNESS)
+    transport = make_transport(ISLAND_TRANSPORT, island_index, num_islands, inboxes)
+    targets = migration_targets(island_index, num_islands)
+
+    operator_selectors = (
+        create_operator_selectors(OPERATOR_MIN_PROBABILITY, OPERATOR_ADAPTATION_RATE) if ADAPTIVE_OPERATORS else {}
+    )
+
+    population = initialize_population(island_population_size, processed_data)
+    evaluator.evaluate(population)
+
+    best = None
+    ga_log_data = []
+    migrants_received = 0
+    finals = []
+    try:
+        for generation in range(MAX_GENERATIONS):
+            population.sort(key=lambda c: c.fitness, reverse=True)
+            if best is None or population[0].fitness > best.fitness:
+                best = population[0]
+
+            # Di cư: gửi các cá thể tốt nhất, nhận cá thể từ đảo khác thay cho cá thể kém nhất
+            if generation > 0 and generation % MIGRATION_INTERVAL == 0:
+                emigrants = population[:MIGRATION_SIZE]
+                message = {
+                    'source': island_index, 'kind': 'migrants',
+                    'fitness': [c.fitness for c in emigrants],
+                    'genes': np.stack([encoder.encode_genes(c.genes) for c in emigrants])
+                }
+                for target in targets:
+                    transport.send(target, message)
+
+            immigrants = []
+            for message in transport.receive():
+                if message['kind'] == 'final':
+                    # Một đảo khác đã xong trước: giữ kết quả cuối của nó cho bước gom kết quả
+                    finals.append(message)
+                if message['kind'] != 'migrants':
+                    continue
+                for genes, fitness in zip(message['genes'], message['fitness']):
+                    immigrants.append(ArrayChromosome(encoder, np.array(genes, dtype=np.int16), fitness).to_chromosome())
+            if immigrants:
+                immigrants = immigrants[:len(population) - ELITISM_COUNT]
+                population[len(population) - len(immigrants):] = immigrants
+                migrants_received += len(immigrants)
+                population.sort(key=lambda c: c.fitness, reverse=True)
+
+            current_best = population[0]
+            current_violations = evaluator.violations(current_best)
+            # Mỗi đảo tự áp dụng điều kiện dừng (thời gian, trì trệ, lời giải khả thi)
+            termination_reason = termination.check(
+                generation, best.fitness, sum(evaluator.violations(best).values()) == 0
+            )
+            ga_log_data.append({
+                "generation": generation + 1,
+                "island": island_index,
+                "best_fitness_gen": current_best.fitness,
+                "best_overall_fitness": best.fitness,
+                "current_violations": current_violations,
+                "migrants_received": migrants_received
+            })
+            if operator_selectors:
+                ga_log_data[-1]["operators"] = {group: selector.stats() for group, selector in operator_selectors.items()}
+
+            # Chỉ đảo 0 in tiến trình để không làm nhiễu luồng GA_EVENT của backend
+            if island_index == 0:
+                display_ga_progress(
+                    generation=generation,
+                    max_generations=MAX_GENERATIONS,
+                    current_best_fitness=current_best.fitness,
+                    overall_best_fitness=best.fitness,
+                    current_best_violations=current_violations,
+                    overall_best_violations=evaluator.violations(best),
+                    semester_info=semester_info,
+                    population_stats={
+                        "fitness_cache": evaluator.cache.stats(),
+                        "island": island_index,
+                        "num_islands": num_islands,
+                        "migrants_received": migrants_received
+                    },
+                    execution_time=termination.elapsed_seconds,
+                    log_interval=1,
+                    termination_reason=termination_reason
+                )
+
+            if termination_reason is not None:
+                ga_log_data[-1]["termination"] = termination.summary()
+                break
+
+            new_population = population[:ELITISM_COUNT]
+            new_population.extend(breed_offspring(
+                population, island_population_size - len(new_population), processed_data,
+                MUTATION_RATE, CROSSOVER_RATE,
+                mutation_selector=operator_selectors.get("mutation"),
+                crossover_selector=operator_selectors.get("crossover"),
+                conflict_finder=evaluator.fitness_calculator.conflicting_positions if TARGETED_MUTATION else None
+            ))
+            if DEDUPLICATE_POPULATION:
+                deduplicate_population(new_population, processed_data)
+            evaluator.evaluate(new_population)
+            credit_offspring(new_population, operator_selectors.values())
+            population = new_population
+
+        population.sort(key=lambda c: c.fitness, reverse=True)
+        if population[0].fitness > best.fitness:
+            best = population[0]
+
+        best_genes = encoder.encode_genes(best.genes)
+        best_fitness = best.fitness
+
+        # Nhiều máy: các đảo gửi kết quả cuối cùng về đảo 0 để chọn lời giải tốt nhất
+        if ISLAND_ID is not None and num_islands > 1:
+            if island_index == 0:
+                finals += transport.wait_for('final', num_islands - 1 - len(finals), ISLAND_FINAL_TIMEOUT)
+                for message in finals:
+                    if message['fitness'][0] > best_fitness:
+                        best_genes, best_fitness = np.array(message['genes'][0], dtype=np.int16), message['fitness'][0]
+            else:
+                transport.send(0, {'source': island_index, 'kind': 'final',
+                                   'fitness': [best_fitness], 'genes': best_genes[None]})
+    finally:
+        transport.close()
+
+    return best_genes, best_fitness, ga_log_data
+
+
+def _merge_island_logs(island_logs: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Merges the per-island logs into one entry per generation, as the progress display and
+    the exports expect. The generation's best fitness and violations come from the island
+    with the best individual; best_overall_fitness also counts islands that already stopped.
+    Each island's own entry for the generation is kept under "islands".
+
+    Args:
+        island_logs (List[List[Dict[str, Any]]]): The log data of every island, in island order.
+
+    Returns:
+        List[Dict[str, Any]]: One log entry per generation.
+    """
+    by_generation = {}
+    for island_log in island_logs:
+        for entry in island_log:
+            by_generation.setdefault(entry["generation"], []).append(entry)
+
+    merged = []
+    overall_by_island = {}
+    for generation in sorted(by_generation):
+        entries = by_generation[generation]
+        for entry in entries:
+            overall_by_island[entry["island"]] = entry["best_overall_fitness"]
+        best_entry = max(entries, key=lambda entry: entry["best_fitness_gen"])
+        merged.append({
+            "generation": generation,
+            "best_fitness_gen": best_entry["best_fitness_gen"],
+            "best_overall_fitness": max(overall_by_island.values()),
+            "current_violations": best_entry["current_violations"],
+            "migrants_received": sum(entry["migrants_received"] for entry in entries),
+            "islands": entries
+        })
+    return merged
+
+
+def run_island_model(processed_data: DataProcessor, semester_id: str, semester_info: Dict[str, Any],
+                     stop_controller: Optional[StopController] = None) -> Tuple[Optional[Chromosome], List[Dict[str, Any]]]:
+    """
+    Runs the island-model GA for one semester: NUM_ISLANDS sub-populations evolve in
+    separate processes and exchange migrants along MIGRATION_TOPOLOGY.
+    When ISLAND_ID is set, this process runs only that island and talks to the other
+    hosts over TCP (ISLAND_TRANSPORT must be "tcp", see ISLAND_HOSTS); island 0 collects the
+    final results.
+
+    Args:
+        processed_data (DataProcessor): Semester-filtered data processor.
+        semester_id (str): The ID of the semester being scheduled.
+        semester_info (Dict[str, Any]): Semester summary passed to display_ga_progress.
+        stop_controller (Optional[StopController]): Stop requests are forwarded to every island,
+            which then finishes its current generation.
+
+    Returns:
+        Tuple[Optional[Chromosome], List[Dict[str, Any]]]: The best chromosome over all
+        islands and the log data merged per generation. A host running an island other
+        than 0 returns None as the chromosome, so only island 0 exports a schedule.
+    """
+    if ISLAND_ID is not None and ISLAND_TRANSPORT != "tcp":
+        raise ValueError(f"ISLAND_ID is set, so the islands run as separate processes or hosts and need "
+                         f"ISLAND_TRANSPORT = \"tcp\" (got '{ISLAND_TRANSPORT}').")
+
+    seed = f"{GA_RANDOM_SEED}:{semester_id}" if GA_RANDOM_SEED is not None else None
+    encoder = GeneEncoder(processed_data)
+
+    if ISLAND_ID is not None:
+        best_genes, best_fitness, ga_log_data = run_island(
+            ISLAND_ID, NUM_ISLANDS, processed_data, semester_info, seed=seed,
+            stop_requested=(lambda: stop_controller.requested) if stop_controller is not None else None
+        )
+        if ISLAND_ID != 0:
+            print(f"Island {ISLAND_ID} sent its best schedule to island 0, which exports the result.")
+            return None, ga_log_data
+    else:
+        # Child processes ignore Ctrl+C; the main process forwards stop requests through stop_event
+        manager = SyncManager()
+        manager.start(ignore_interrupts)
+        try:
+            inboxes = [manager.Queue() for _ in range(NUM_ISLANDS)] if ISLAND_TRANSPORT != "tcp" else None
+            stop_event = manager.Event()
+            with ProcessPoolExecutor(max_workers=NUM_ISLANDS, initializer=ignore_interrupts) as pool:
+                futures = [
+                    pool.submit(run_island, i, NUM_ISLANDS, processed_data, semester_info, inboxes, seed,
+                                stop_event.is_set)
+                    for i in range(NUM_ISLANDS)
+                ]
+                pending = futures
+                while pending:
+                    if stop_controller is not None and stop_controller.requested:
+                        stop_event.set()
+                    _, pending = wait(pending, timeout=0.5, return_when=FIRST_EXCEPTION)
+                results = [future.result() for future in futures]
+        finally:
+            manager.shutdown()
+
+        best_genes, best_fitness, _ = max(results, key=lambda result: result[1])
+        ga_log_data = _merge_island_logs([island_log for _, _, island_log in results])
+
+    best = ArrayChromosome(encoder, best_genes, best_fitness).to_chromosome()
+    return best, ga_log_data
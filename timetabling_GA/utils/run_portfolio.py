@@ -0,0 +1,215 @@
+import contextlib
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing.managers import SyncManager
+from typing import Dict, Any, List, Optional, Tuple
+
+import config
+from config import (
+    PORTFOLIO_CONFIGS, PORTFOLIO_WORKERS, PORTFOLIO_TIME_BUDGET, PORTFOLIO_GRACE_SECONDS,
+    PORTFOLIO_DOMINANCE_MARGIN
+)
+from ga_components.chromosome import Chromosome
+from ga_components.fitness import FitnessCalculator
+from utils.solve_semester import solve_semester
+from utils.stop_controller import StopController, ignore_interrupts
+from data_processing.processor import DataProcessor
+
+_MISSING = object()
+
+# Config values replaced in this process by _apply_overrides, to restore before the next run
+_overridden: Dict[str, Any] = {}
+
+
+class PortfolioRunControl:
+    """
+    Stands in for the StopController inside one portfolio run: the run stops when the whole
+    portfolio stops (stop request or shared deadline) or when this run alone is cancelled,
+    and every progress report updates the shared best-so-far table.
+    """
+
+    def __init__(self, index: int, progress: Any, stop_all: Any, cancel: Any):
+        self.index = index
+        self._progress = progress
+        self._stop_all = stop_all
+        self._cancel = cancel
+
+    @property
+    def requested(self) -> bool:
+        return self._stop_all.is_set() or self._cancel.is_set()
+
+    def report_progress(self, generation: int, best_fitness: float, is_feasible: bool) -> None:
+        self._progress[self.index] = (best_fitness, is_feasible)
+
+
+def _set_config_value(name: str, value: Any) -> None:
+    # Modules bind config constants at import time ("from config import X"), so the value is
+    # replaced in every loaded module that still holds the config value
+    if not hasattr(config, name):
+        raise ValueError(f"Unknown config setting '{name}' in PORTFOLIO_CONFIGS.")
+    old_value = getattr(config, name)
+    setattr(config, name, value)
+    for module in list(sys.modules.values()):
+        if module is not None and module is not config and getattr(module, name, _MISSING) is old_value:
+            setattr(module, name, value)
+
+
+def _apply_overrides(overrides: Dict[str, Any]) -> None:
+    """Restores the previous run's overrides in this worker process, then applies `overrides`."""
+    for name, value in list(_overridden.items()):
+        _set_config_value(name, value)
+    _overridden.clear()
+    for name, value in overrides.items():
+        original = getattr(config, name, _MISSING)
+        _set_config_value(name, value)
+        _overridden.setdefault(name, original)
+
+
+def describe_configuration(overrides: Dict[str, Any]) -> str:
+    """Short label of a portfolio configuration for progress messages and the log."""
+    return ", ".join(f"{name}={value}" for name, value in overrides.items()) or "default"
+
+
+def _run_configuration(index: int, overrides: Dict[str, Any], semester_id: str,
+                       full_data_processor: DataProcessor, progress: Any, stop_all: Any, cancel: Any,
+                       deadline: Optional[float]) -> Tuple[Optional[List[Dict[str, Any]]], List[Dict[str, Any]], float]:
+    """
+    Runs solve_semester with one configuration in a worker process.
+
+    Returns:
+        Tuple[Optional[List[Dict[str, Any]]], List[Dict[str, Any]], float]: The genes of the
+        best schedule (or None), the run's log data and its running time in seconds.
+    """
+    started = time.time()
+    overrides = dict(overrides)
+    # Runs share the semester's checkpoint path, so portfolio runs never write checkpoints
+    overrides["CHECKPOINT_INTERVAL"] = 0
+    if deadline is not None:
+        remaining = max(0.0, deadline - started)
+        time_budget = overrides.get("TIME_BUDGET_SECONDS", config.TIME_BUDGET_SECONDS)
+        overrides["TIME_BUDGET_SECONDS"] = remaining if time_budget is None else min(time_budget, remaining)
+    _apply_overrides(overrides)
+
+    # Forked workers inherit the parent's random state; without a seed each run gets a fresh one
+    seed = overrides.get("GA_RANDOM_SEED")
+    random.seed(f"{seed}:portfolio{index}" if seed is not None else None)
+
+    control = PortfolioRunControl(index, progress, stop_all, cancel)
+    # Only the first run prints its progress so the backend still sees a single GA_EVENT stream
+    with open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(sys.stdout if index == 0 else devnull):
+        best, ga_log_data = solve_semester(semester_id, full_data_processor, control)
+    genes = best.genes if best is not None else None
+    return genes, ga_log_data or [], time.time() - started
+
+
+def run_portfolio(semester_id: str, full_data_processor: DataProcessor,
+                  stop_controller: Optional[StopController] = None
+                  ) -> Tuple[Optional[Chromosome], Optional[List[Dict[str, Any]]]]:
+    """
+    Races the configurations in PORTFOLIO_CONFIGS on one semester, each in its own process.
+    A configuration overrides settings of config.py (seed, operators, GA_MODE, SOLVER, ...).
+    All runs share the PORTFOLIO_TIME_BUDGET deadline and report their best fitness to a
+    shared table; after PORTFOLIO_GRACE_SECONDS, a run whose best fitness trails the leader's
+    by more than PORTFOLIO_DOMINANCE_MARGIN (relative to the leader) is cancelled. Island-model
+    runs do not report progress and are never cancelled early.
+
+    Args:
+        semester_id (str): The ID of the semester to schedule.
+        full_data_processor (DataProcessor): The data processor object containing all
+                                             input information.
+        stop_controller (Optional[StopController]): Stop requests are forwarded to every run,
+                                             which then returns its best schedule so far.
+
+    Returns:
+        Tuple[Optional[Chromosome], Optional[List[Dict[str, Any]]]]: The best chromosome over
+        all runs and that run's log data, with a "portfolio" summary of every run in its last
+        entry, or (None, None) if no run produced a schedule.
+    """
+    semester_specific_data_processor = full_data_processor.filter_for_semester(semester_id)
+    if not semester_specific_data_processor:
+        print(f"Error: No information found for semester {semester_id}.")
+        return None, None
+    fitness_calculator = FitnessCalculator(semester_specific_data_processor)
+
+    labels = [describe_configuration(overrides) for overrides in PORTFOLIO_CONFIGS]
+    # All runs start together by default; cancelled runs free their CPU time for the leaders
+    workers = PORTFOLIO_WORKERS or len(PORTFOLIO_CONFIGS)
+    start = time.time()
+    deadline = start + PORTFOLIO_TIME_BUDGET if PORTFOLIO_TIME_BUDGET is not None else None
+
+    # Child processes ignore Ctrl+C; the main process forwards stop requests through stop_all
+    manager = SyncManager()
+    manager.start(ignore_interrupts)
+    try:
+        progress = manager.dict()
+        stop_all = manager.Event()
+        cancel_events = [manager.Event() for _ in PORTFOLIO_CONFIGS]
+        outcomes = {}
+        leader = None
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=ignore_interrupts) as pool:
+            futures = {
+                pool.submit(_run_configuration, index, overrides, semester_id, full_data_processor,
+                            progress, stop_all, cancel_events[index], deadline): index
+                for index, overrides in enumerate(PORTFOLIO_CONFIGS)
+            }
+            pending = set(futures)
+            while pending:
+                if stop_controller is not None and stop_controller.requested:
+                    stop_all.set()
+                if deadline is not None and time.time() >= deadline:
+                    stop_all.set()
+
+                standings = dict(progress)
+                if standings:
+                    best_index = max(standings, key=lambda index: standings[index][0])
+                    best_fitness = standings[best_index][0]
+                    if best_index != leader:
+                        leader = best_index
+                        print(f"Portfolio {semester_id}: run {best_index} ({labels[best_index]}) "
+                              f"leads with fitness {best_fitness:.2f}")
+
+                    # Cancel runs that are clearly dominated once every run had a fair start
+                    if time.time() - start >= PORTFOLIO_GRACE_SECONDS:
+                        margin = PORTFOLIO_DOMINANCE_MARGIN * max(abs(best_fitness), 1.0)
+                        for index, (fitness, _) in standings.items():
+                            if best_fitness - fitness > margin and not cancel_events[index].is_set():
+                                cancel_events[index].set()
+                                print(f"Portfolio {semester_id}: cancelling run {index} ({labels[index]}), "
+                                      f"fitness {fitness:.2f} vs {best_fitness:.2f}")
+
+                done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = futures[future]
+                    try:
+                        outcomes[index] = future.result()
+                    except Exception as exc:
+                        print(f"Portfolio {semester_id}: run {index} ({labels[index]}) failed: {exc}")
+            cancelled = [event.is_set() for event in cancel_events]
+    finally:
+        manager.shutdown()
+
+    # Every schedule is re-scored the same way so the runs compare fairly
+    summary = []
+    best, best_log = None, None
+    for index in sorted(outcomes):
+        genes, ga_log_data, seconds = outcomes[index]
+        entry = {"run": index, "config": labels[index], "cancelled": cancelled[index], "seconds": round(seconds, 2)}
+        if genes is not None:
+            chromosome = Chromosome(genes)
+            _, violations = fitness_calculator.calculate_fitness(chromosome)
+            entry.update(fitness=float(chromosome.fitness), violations=sum(violations.values()))
+            if best is None or chromosome.fitness > best.fitness:
+                best, best_log = chromosome, ga_log_data
+        summary.append(entry)
+
+    if best is None:
+        return None, None
+    if not best_log:
+        best_log.append({"generation": 0})
+    best_log[-1]["portfolio"] = summary
+    return best, best_log
@@ -0,0 +1,141 @@
+from typing import Dict, Any, List, Optional, Tuple
+
+from config import (
+    POPULATION_SIZE, MAX_GENERATIONS, MUTATION_RATE, CROSSOVER_RATE, INCREMENTAL_FITNESS, FITNESS_CACHE_SIZE,
+    TIME_BUDGET_SECONDS, STAGNATION_GENERATIONS, STAGNATION_EPSILON, STOP_ON_FEASIBLE, STEADY_STATE_BATCH_SIZE,
+    ADAPTIVE_RATES, MUTATION_RATE_BOUNDS, CROSSOVER_RATE_BOUNDS, DIVERSITY_LOW, DIVERSITY_HIGH,
+    PARTIAL_RESTART_GENERATIONS, PARTIAL_RESTART_FRACTION, RATE_STALL_GENERATIONS, ADAPTIVE_OPERATORS,
+    OPERATOR_MIN_PROBABILITY, OPERATOR_ADAPTATION_RATE, TARGETED_MUTATION
+)
+from ga_components.adaptive import AdaptiveRateController
+from ga_components.chromosome import Chromosome
+from ga_components.evaluator import PopulationEvaluator
+from ga_components.evolution import breed_offspring, create_operator_selectors
+from ga_components.operator_selection import credit_offspring
+from ga_components.fitness import FitnessCalculator
+from ga_components.population import initialize_population
+from ga_components.steady_state import SteadyStatePopulation
+from ga_components.termination import TerminationPolicy
+from utils.display_ga_progress import display_ga_progress
+from utils.stop_controller import StopController
+from data_processing.processor import DataProcessor
+
+
+def run_steady_state(processed_data: DataProcessor, semester_id: str, semester_info: Dict[str, Any],
+                     stop_controller: Optional[StopController] = None) -> Tuple[Optional[Chromosome], List[Dict[str, Any]]]:
+    """
+    Runs a steady-state GA for one semester: STEADY_STATE_BATCH_SIZE offspring are bred at a
+    time and each one replaces the current worst individual if it is better and not a duplicate.
+    The population stays sorted, so no generation-wide list is rebuilt or re-sorted.
+    One "generation" in the progress events and ga_log_data is POPULATION_SIZE offspring;
+    stop requests and the time budget are checked after every batch.
+
+    Args:
+        processed_data (DataProcessor): Semester-filtered data processor.
+        semester_id (str): The ID of the semester being scheduled.
+        semester_info (Dict[str, Any]): Semester summary passed to display_ga_progress.
+        stop_controller (Optional[StopController]): Ends the run after the current batch.
+
+    Returns:
+        Tuple[Optional[Chromosome], List[Dict[str, Any]]]: The best chromosome and the log data.
+    """
+    termination = TerminationPolicy(
+        MAX_GENERATIONS, TIME_BUDGET_SECONDS, STAGNATION_GENERATIONS, STAGNATION_EPSILON, STOP_ON_FEASIBLE,
+        stop_requested=(lambda: stop_controller.requested) if stop_controller is not None else None,
+        progress_listener=stop_controller.report_progress if stop_controller is not None else None
+    )
+    evaluator = PopulationEvaluator(FitnessCalculator(processed_data), FITNESS_CACHE_SIZE, INCREMENTAL_FITNESS)
+    adaptive = None
+    if ADAPTIVE_RATES:
+        adaptive = AdaptiveRateController(
+            MUTATION_RATE, CROSSOVER_RATE, MUTATION_RATE_BOUNDS, CROSSOVER_RATE_BOUNDS,
+            DIVERSITY_LOW, DIVERSITY_HIGH, PARTIAL_RESTART_GENERATIONS, PARTIAL_RESTART_FRACTION,
+            RATE_STALL_GENERATIONS
+        )
+
+    operator_selectors = (
+        create_operator_selectors(OPERATOR_MIN_PROBABILITY, OPERATOR_ADAPTATION_RATE) if ADAPTIVE_OPERATORS else {}
+    )
+    conflict_finder = evaluator.fitness_calculator.conflicting_positions if TARGETED_MUTATION else None
+
+    initial = initialize_population(POPULATION_SIZE, processed_data)
+    evaluator.evaluate(initial)
+    population = SteadyStatePopulation(initial)
+
+    mutation_rate, crossover_rate = MUTATION_RATE, CROSSOVER_RATE
+    offspring_evaluated = 0
+    replacements = 0
+    ga_log_data = []
+
+    for generation in range(MAX_GENERATIONS):
+        if generation > 0:
+            if adaptive is not None:
+                num_fresh = adaptive.update(population.chromosomes, population.best.fitness)
+                mutation_rate, crossover_rate = adaptive.mutation_rate, adaptive.crossover_rate
+                if num_fresh > 0:
+                    fresh = initialize_population(num_fresh, processed_data)
+                    evaluator.evaluate(fresh)
+                    population.replace_worst_many(fresh)
+
+            # Breed in small batches; each child competes with the current worst individual
+            bred = 0
+            while bred < POPULATION_SIZE and not termination.interrupted():
+                children = breed_offspring(
+                    population.chromosomes, STEADY_STATE_BATCH_SIZE, processed_data,
+                    mutation_rate, crossover_rate, select_parent=population.tournament_selection,
+                    mutation_selector=operator_selectors.get("mutation"),
+                    crossover_selector=operator_selectors.get("crossover"),
+                    conflict_finder=conflict_finder
+                )
+                evaluator.evaluate(children)
+                credit_offspring(children, operator_selectors.values())
+                for child in children:
+                    if population.replace_worst(child):
+                        replacements += 1
+                bred += len(children)
+            offspring_evaluated += bred
+
+        best = population.best
+        best_violations = evaluator.violations(best)
+        termination_reason = termination.check(generation, best.fitness, sum(best_violations.values()) == 0)
+
+        # The population only ever keeps its best individual, so current and overall best coincide
+        display_ga_progress(
+            generation=generation,
+            max_generations=MAX_GENERATIONS,
+            current_best_fitness=best.fitness,
+            overall_best_fitness=best.fitness,
+            current_best_violations=best_violations,
+            overall_best_violations=best_violations,
+            semester_info=semester_info,
+            population_stats={
+                "fitness_cache": evaluator.cache.stats(),
+                "offspring_evaluated": offspring_evaluated,
+                "replacements": replacements,
+                "worst_fitness": population.worst.fitness,
+                "adaptive": adaptive.stats() if adaptive is not None else None,
+                "operators": {group: selector.stats() for group, selector in operator_selectors.items()} or None
+            },
+            execution_time=termination.elapsed_seconds,
+            log_interval=1,
+            termination_reason=termination_reason
+        )
+
+        ga_log_data.append({
+            "generation": generation + 1,
+            "best_fitness_gen": best.fitness,
+            "best_overall_fitness": best.fitness,
+            "current_violations": best_violations,
+            "offspring_evaluated": offspring_evaluated,
+            "replacements": replacements
+        })
+        if adaptive is not None:
+            ga_log_data[-1].update(adaptive.stats())
+        if operator_selectors:
+            ga_log_data[-1]["operators"] = {group: selector.stats() for group, selector in operator_selectors.items()}
+
+        if termination_reason is not None:
+            ga_log_data[-1]["termination"] = termination.summary()
+            break
+
+    return population.best, ga_log_data
@@ -0,0 +1,51 @@
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from config import SOLVER
+from ga_components.chromosome import Chromosome
+from solvers.csp_solver import run_csp
+from solvers.simulated_annealing import run_simulated_annealing
+from solvers.tabu_search import run_tabu_search
+from utils.prepare_semester import prepare_semester
+from utils.run_ga_for_semester import run_ga_for_semester
+from utils.stop_controller import StopController
+from data_processing.processor import DataProcessor
+
+# Alternative engines by name. Each one takes a semester-filtered DataProcessor, the semester ID,
+# the semester summary for display_ga_progress and an optional StopController, and returns the
+# best Chromosome (or None) with its log data. "ga" runs run_ga_for_semester (see GA_MODE).
+SOLVERS: Dict[str, Callable[..., Tuple[Optional[Chromosome], List[Dict[str, Any]]]]] = {
+    "simulated_annealing": run_simulated_annealing,
+    "tabu_search": run_tabu_search,
+    "csp": run_csp
+}
+
+
+def solve_semester(semester_id: str, full_data_processor: DataProcessor,
+                   stop_controller: Optional[StopController] = None, resume: bool = False,
+                   solver: Optional[str] = None) -> Tuple[Optional[Chromosome], Optional[List[Dict[str, Any]]]]:
+    """
+    Schedules one semester with the configured solver.
+
+    Args:
+        semester_id (str): The ID of the semester to schedule.
+        full_data_processor (DataProcessor): The data processor object containing all
+                                             input information.
+        stop_controller (Optional[StopController]): Ends the run early with the best
+                                             schedule found so far.
+        resume (bool): Continue from the latest checkpoint (GA only).
+        solver (Optional[str]): "ga" or a key of SOLVERS; defaults to SOLVER from config.
+
+    Returns:
+        Tuple[Optional[Chromosome], Optional[List[Dict[str, Any]]]]: The best chromosome
+        and the log data, or (None, None) if the semester cannot be scheduled.
+    """
+    solver = solver or SOLVER
+    if solver == "ga":
+        return run_ga_for_semester(semester_id, full_data_processor, stop_controller, resume=resume)
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver '{solver}', expected 'ga' or one of {sorted(SOLVERS)}.")
+
+    semester_specific_data_processor, semester_info = prepare_semester(semester_id, full_data_processor)
+    if semester_specific_data_processor is None:
+        return None, None
+    return SOLVERS[solver](semester_specific_data_processor, semester_id, semester_info, stop_controller)
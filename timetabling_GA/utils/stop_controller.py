@@ -0,0 +1,98 @@
+import os
+import signal
+import sys
+import threading
+from typing import Optional
+
+
+class StopController:
+    """
+    Collects cooperative stop requests for a GA run. A request can come from SIGTERM/SIGINT,
+    from a stop file appearing on disk, or from a "stop" line on stdin (the backend keeps
+    stdin as a pipe). The GA loop polls `requested` once per generation, finishes the
+    current generation and returns its best chromosome so the results can still be exported.
+    A second signal falls back to the default behaviour and ends the process immediately.
+    """
+
+    def __init__(self, stop_file: Optional[str] = None, watch_stdin: bool = False):
+        """
+        Args:
+            stop_file (Optional[str]): Path whose existence means "stop"; a stale file is removed.
+            watch_stdin (bool): Whether to read stop commands from stdin in a background thread.
+        """
+        self.stop_file = stop_file
+        self.watch_stdin = watch_stdin
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._announced = False
+        self._previous_handlers = {}
+
+        if stop_file and os.path.exists(stop_file):
+            os.remove(stop_file)
+
+    def install(self) -> "StopController":
+        """Registers the signal handlers and starts the stdin watcher."""
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            self._previous_handlers[signum] = signal.signal(signum, self._handle_signal)
+
+        if self.watch_stdin and sys.stdin is not None and not sys.stdin.isatty():
+            threading.Thread(target=self._watch_stdin, name="ga-stop-stdin", daemon=True).start()
+        return self
+
+    def uninstall(self) -> None:
+        """Restores the signal handlers that were active before install()."""
+        for signum, handler in self._previous_handlers.items():
+            signal.signal(signum, handler)
+        self._previous_handlers = {}
+
+    def request(self, reason: str) -> None:
+        """
+        Marks the run as stopping; the first reason is kept. Safe to call from a signal
+        handler: it only sets the event, and the stop is announced by the next `requested` poll.
+        """
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def requested(self) -> bool:
+        """True once any stop request has been received."""
+        if not self._event.is_set() and self.stop_file and os.path.exists(self.stop_file):
+            self.request("stop_file")
+        if self._event.is_set() and not self._announced:
+            self._announced = True
+            print(f"\nGA_STOP_REQUESTED:{self.reason}")
+            sys.stdout.flush()
+        return self._event.is_set()
+
+    def report_progress(self, generation: int, best_fitness: float, is_feasible: bool) -> None:
+        """Progress hook passed to TerminationPolicy; a plain run has no one to report to."""
+
+    def _handle_signal(self, signum, frame) -> None:
+        # A second signal means the caller does not want to wait any longer
+        signal.signal(signum, signal.SIG_DFL)
+        self.request(signal.Signals(signum).name)
+
+    def _watch_stdin(self) -> None:
+        # Read the raw descriptor: a thread blocked inside sys.stdin would hold its buffer
+        # lock, and forked worker processes deadlock when multiprocessing closes sys.stdin
+        try:
+            fd = sys.stdin.fileno()
+            pending = b""
+            while True:
+                chunk = os.read(fd, 1024)
+                if not chunk:
+                    return
+                pending += chunk
+                *lines, pending = pending.split(b"\n")
+                if any(line.strip().lower() == b"stop" for line in lines):
+                    self.request("stdin")
+                    return
+        except (OSError, ValueError):
+            # stdin closed or not readable: only signals and the stop file remain
+            return
+
+
+def ignore_interrupts() -> None:
+    """Pool/manager initializer: child processes leave Ctrl+C handling to the main process."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)